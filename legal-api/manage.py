@@ -19,9 +19,12 @@ import logging
 from flask import url_for
 from flask_script import Manager  # class for handling a set of commands
 from flask_migrate import Migrate, MigrateCommand
+from sqlalchemy import or_
 
 from legal_api import create_app
-from legal_api.models import db
+from legal_api.core import Filing as FilingCore
+from legal_api.models import Filing, db
+from legal_api.services import VersionedBusinessDetailsService
 # models included so that migrate can build the database migrations
 from legal_api import models  # pylint: disable=unused-import
 
@@ -50,6 +53,36 @@ def list_routes():
         print(line)
 
 
+@MANAGER.option('-b', '--batch-size', dest='batch_size', type=int, default=100)
+def backfill_revision_snapshots(batch_size=100):
+    """Store the rendered revision, and correction diff, of every completed filing that does not have one yet."""
+    failed_ids = []
+    while True:
+        query = Filing.query \
+            .filter(Filing._status == Filing.Status.COMPLETED.value) \
+            .filter(Filing.business_id != None) \
+            .filter(or_(Filing.revision_json == None,  # pylint: disable=singleton-comparison # noqa: E711;
+                        ~Filing.revision_json.has_key('filing')))
+        if failed_ids:
+            query = query.filter(Filing.id.notin_(failed_ids))
+        filings = query.order_by(Filing.id).limit(batch_size).all()
+        if not filings:
+            break
+        for filing in filings:
+            try:
+                VersionedBusinessDetailsService.save_revision_snapshot(filing)
+                if filing.filing_type == 'correction':
+                    FilingCore.find_by_id(filing.id).save_correction_diff()
+            except Exception as err:  # pylint: disable=broad-except; keep going, the failed ones are listed below
+                db.session.rollback()
+                failed_ids.append(filing.id)
+                logging.error('Unable to save the revision snapshot of filing %s: %s', filing.id, err)
+        logging.info('Saved revision snapshots up to filing %s', filings[-1].id)
+
+    if failed_ids:
+        logging.error('Filings without a revision snapshot: %s', failed_ids)
+
+
 if __name__ == '__main__':
     logging.log(logging.INFO, 'Running the Manager')
     MANAGER.run()
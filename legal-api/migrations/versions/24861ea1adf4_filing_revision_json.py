@@ -0,0 +1,24 @@
+"""filing-revision-json
+
+Revision ID: 24861ea1adf4
+Revises: 8c74427a6c0e
+Create Date: 2026-10-15 09:12:44.512306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '24861ea1adf4'
+down_revision = '8c74427a6c0e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('filings', sa.Column('revision_json', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade():
+    op.drop_column('filings', 'revision_json')
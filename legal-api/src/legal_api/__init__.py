@@ -31,7 +31,7 @@ from legal_api import config, errorhandlers, models
 from legal_api.models import db
 from legal_api.resources import API_BLUEPRINT, OPS_BLUEPRINT
 from legal_api.schemas import rsbc_schemas
-from legal_api.services import flags, queue
+from legal_api.services import flags, queue, response_cache
 from legal_api.translations import babel
 from legal_api.utils.auth import jwt
 from legal_api.utils.logging import setup_logging
@@ -61,6 +61,7 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
     rsbc_schemas.init_app(app)
     flags.init_app(app)
     queue.init_app(app)
+    response_cache.init_app(app)
     babel.init_app(app)
 
     app.register_blueprint(API_BLUEPRINT)
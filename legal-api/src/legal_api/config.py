@@ -64,6 +64,12 @@ class _Config():  # pylint: disable=too-few-public-methods
     AUTH_SVC_URL = os.getenv('AUTH_SVC_URL', 'http://')
     REPORT_SVC_URL = os.getenv('REPORT_SVC_URL', 'http://')
     REPORT_TEMPLATE_PATH = os.getenv('REPORT_PATH', 'report-templates')
+    # assemble a report template again when its files change
+    REPORT_TEMPLATE_RELOAD = os.getenv('REPORT_TEMPLATE_RELOAD', 'false').lower() == 'true'
+    # keep the rendered pdfs of the completed filings in Minio
+    REPORT_PDF_STORE_ENABLED = os.getenv('REPORT_PDF_STORE_ENABLED', 'false').lower() == 'true'
+    # the most reports of a filing rendered at once
+    REPORT_MAX_WORKERS = int(os.getenv('REPORT_MAX_WORKERS', '4'))
 
     GO_LIVE_DATE = os.getenv('GO_LIVE_DATE')
 
@@ -108,12 +114,17 @@ class _Config():  # pylint: disable=too-few-public-methods
     NATS_CLUSTER_ID = os.getenv('NATS_CLUSTER_ID', 'test-cluster')
     NATS_FILER_SUBJECT = os.getenv('NATS_FILER_SUBJECT', 'entity.filing.filer')
     NATS_QUEUE = os.getenv('NATS_QUEUE', 'entity-filer-worker')
+    NATS_PUBLISH_TIMEOUT = float(os.getenv('NATS_PUBLISH_TIMEOUT', '10'))
 
     # NAMEX PROXY Settings
     NAMEX_AUTH_SVC_URL = os.getenv('NAMEX_AUTH_SVC_URL', 'http://')
     NAMEX_SERVICE_CLIENT_USERNAME = os.getenv('NAMEX_SERVICE_CLIENT_USERNAME')
     NAMEX_SERVICE_CLIENT_SECRET = os.getenv('NAMEX_SERVICE_CLIENT_SECRET')
     NAMEX_SVC_URL = os.getenv('NAMEX_SVC_URL', 'http://')
+    # seconds the name requests are cached, longer once they are consumed, expired, cancelled or rejected
+    NAMEX_CACHE_TIMEOUT = int(os.getenv('NAMEX_CACHE_TIMEOUT', '60'))
+    NAMEX_CACHE_FINAL_TIMEOUT = int(os.getenv('NAMEX_CACHE_FINAL_TIMEOUT', '3600'))
+    NAMEX_CACHE_SIZE = int(os.getenv('NAMEX_CACHE_SIZE', '500'))
 
     # service accounts
     ACCOUNT_SVC_AUTH_URL = os.getenv('ACCOUNT_SVC_AUTH_URL')
@@ -133,6 +144,34 @@ class _Config():  # pylint: disable=too-few-public-methods
     MINIO_BUCKET_LEAR = os.getenv('MINIO_BUCKET_LEAR', 'lear')
     MINIO_SECURE = True
 
+    # Pooled HTTP client of the upstream services, <UPSTREAM>_SVC_TIMEOUT overrides HTTP_TIMEOUT
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '20'))
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.1'))
+    REPORT_SVC_TIMEOUT = os.getenv('REPORT_SVC_TIMEOUT', '60')
+    PAY_SVC_TIMEOUT = os.getenv('PAY_SVC_TIMEOUT', '10')
+
+    # Response cache of the rendered completed filings: memory, redis or none
+    # memory holds at most RESPONSE_CACHE_SIZE responses of up to RESPONSE_CACHE_MAX_ITEM_SIZE bytes, and no PDFs
+    RESPONSE_CACHE_TYPE = os.getenv('RESPONSE_CACHE_TYPE', 'memory')
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '500'))
+    RESPONSE_CACHE_MAX_ITEM_SIZE = int(os.getenv('RESPONSE_CACHE_MAX_ITEM_SIZE', str(64 * 1024)))
+    RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '86400'))
+    RESPONSE_CACHE_REDIS_HOST = os.getenv('RESPONSE_CACHE_REDIS_HOST', 'localhost')
+    RESPONSE_CACHE_REDIS_PORT = int(os.getenv('RESPONSE_CACHE_REDIS_PORT', '6379'))
+
+    # Payment details of the filings, fetched concurrently and kept until the filing is paid or times out
+    PAYMENT_DETAILS_MAX_WORKERS = int(os.getenv('PAYMENT_DETAILS_MAX_WORKERS', '5'))
+    PAYMENT_DETAILS_CACHE_TIMEOUT = int(os.getenv('PAYMENT_DETAILS_CACHE_TIMEOUT', '30'))
+    PAYMENT_DETAILS_CACHE_SIZE = int(os.getenv('PAYMENT_DETAILS_CACHE_SIZE', '1000'))
+
+    # Cache of the roles granted by the auth service, a timeout of 0 turns it off
+    AUTHZ_CACHE_TIMEOUT = int(os.getenv('AUTHZ_CACHE_TIMEOUT', '60'))
+    AUTHZ_CACHE_NEGATIVE_TIMEOUT = int(os.getenv('AUTHZ_CACHE_NEGATIVE_TIMEOUT', '15'))
+    AUTHZ_CACHE_SIZE = int(os.getenv('AUTHZ_CACHE_SIZE', '2000'))
+
     TESTING = False
     DEBUG = False
 
@@ -142,6 +181,7 @@ class DevConfig(_Config):  # pylint: disable=too-few-public-methods
 
     TESTING = False
     DEBUG = True
+    REPORT_TEMPLATE_RELOAD = True
 
 
 class TestConfig(_Config):  # pylint: disable=too-few-public-methods
@@ -166,6 +206,10 @@ class TestConfig(_Config):  # pylint: disable=too-few-public-methods
         name=DB_NAME,
     )
 
+    # the test tokens all share a subject
+    AUTHZ_CACHE_TIMEOUT = 0
+    REPORT_PDF_STORE_ENABLED = False
+
     # JWT OIDC settings
     # JWT_OIDC_TEST_MODE will set jwt_manager to use
     JWT_OIDC_TEST_MODE = True
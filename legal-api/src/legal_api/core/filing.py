@@ -194,19 +194,55 @@ class Filing:
             self._storage.payment_account = self._payment_account
             self.storage.save()
 
+    def save_correction_diff(self):
+        """Store the diff of a completed correction with the correction.
+
+        Once the correction is completed neither side of the diff can change, so the entity-filer stores it with
+        the revision snapshot, keyed by the corrected filing and the correction's transaction.
+        """
+        if not self._storage or self.status != Filing.Status.COMPLETED.value or \
+                self.filing_type != Filing.FilingTypes.CORRECTION.value:
+            return
+        filing_json = VersionedBusinessDetailsService.get_revision(self.id, self._storage.business_id)
+        correction_id = filing_json.get('filing', {}).get('correction', {}).get('correctedFilingId')
+        if not str(correction_id or '').isdigit():
+            return
+        self._storage.revision_json = {
+            **(self._storage.revision_json or {}),
+            'correctionDiff': {'correctedFilingId': int(correction_id),
+                               'transactionId': self._storage.transaction_id,
+                               'diff': self._compute_diff(filing_json, correction_id)}
+        }
+        self._storage.save()
+
     def _diff(self, filing_json, correction_id):
-        """Return the diff block for the filing this one corrects, if any."""
-        if filing_json and correction_id and self._storage and self.status in [Filing.Status.COMPLETED.value,
-                                                                               Filing.Status.PAID.value,
-                                                                               Filing.Status.PENDING.value,
-                                                                               ]:
-            if corrected_filing := Filing.find_by_id(correction_id):
-                if diff_nodes := diff_dict(filing_json,
-                                           corrected_filing.json,
-                                           ignore_keys=['header', 'business', 'correction'],
-                                           diff_list_callback=diff_list):
-                    diff_json = [d.json for d in diff_nodes]
-                    return diff_json
+        """Return the diff block for the filing this one corrects, if any.
+
+        The diff stored with a completed correction is used when it is for the same corrected filing and
+        transaction, otherwise the diff is computed, and not stored, as this is the read path.
+        """
+        if filing_json and str(correction_id or '').isdigit() and self._storage and \
+                self.status in [Filing.Status.COMPLETED.value,
+                                Filing.Status.PAID.value,
+                                Filing.Status.PENDING.value,
+                                ]:
+            stored_diff = (self._storage.revision_json or {}).get('correctionDiff')
+            if self.status == Filing.Status.COMPLETED.value and stored_diff and \
+                    str(stored_diff.get('correctedFilingId')) == str(correction_id) and \
+                    stored_diff.get('transactionId') == self._storage.transaction_id:
+                return copy.deepcopy(stored_diff['diff'])
+            return self._compute_diff(filing_json, correction_id)
+        return None
+
+    @staticmethod
+    def _compute_diff(filing_json, correction_id) -> Optional[List[dict]]:
+        """Return the diff of a correction against the filing it corrects, or None if there is no difference."""
+        if corrected_filing := Filing.find_by_id(correction_id):
+            if diff_nodes := diff_dict(filing_json,
+                                       corrected_filing.json,
+                                       ignore_keys=['header', 'business', 'correction'],
+                                       diff_list_callback=diff_list):
+                return [d.json for d in diff_nodes]
         return None
 
     @staticmethod
@@ -251,6 +287,19 @@ class Filing:
 
         return filings
 
+    @staticmethod
+    def get_ledger(business_id: int,  # pylint: disable=too-many-arguments
+                   status: [],
+                   limit: int = None,
+                   before_id: int = None,
+                   with_comments: bool = True) -> List[Dict]:
+        """Return the json of a page of the filings with statuses in the status array input, newest first.
+
+        The related records of the whole page are batch loaded, see FilingStorage.get_ledger_json.
+        """
+        storages = FilingStorage.get_ledger_filings(business_id, status, limit, before_id)
+        return FilingStorage.get_ledger_json(storages, with_comments)
+
     def legal_filings(self, with_diff: bool = True) -> Optional[List]:
         """Return a list of the filings extracted from this filing submission.
 
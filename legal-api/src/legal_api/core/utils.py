@@ -15,7 +15,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, MutableMapping, MutableSequence, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, MutableMapping, MutableSequence, Optional, Tuple
 
 
 @dataclass
@@ -36,6 +36,29 @@ class Node:
         }
 
 
+# A path is held as a linked list of (parent, key) tuples while walking the documents,
+# and is only built into a List when a Node is created for it.
+_Path = Optional[Tuple[Any, str]]
+
+
+def _path_from_list(path: Optional[List[str]]) -> _Path:
+    """Return the linked path for a list of keys."""
+    linked_path = None
+    for key in path or []:
+        linked_path = (linked_path, key)
+    return linked_path
+
+
+def _path_to_list(path: _Path) -> List[str]:
+    """Return the list of keys for a linked path."""
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    keys.reverse()
+    return keys
+
+
 def diff_dict(json1,
               json2,
               path: List[str] = None,
@@ -44,43 +67,44 @@ def diff_dict(json1,
         -> Optional[List[Node]]:
     """Recursively create a diff record for a dict, based on the corrections JSONSchema definition."""
     diff = []
-    path = path or []
+    _diff_dict(json1, json2, _path_from_list(path), frozenset(ignore_keys or ()), diff_list_callback, diff)
+    return diff
+
+
+def _diff_dict(json1, json2, path: _Path, ignore_keys: FrozenSet[str], diff_list_callback, diff: List[Node]):
+    """Append the diff nodes of the dicts json1 & json2 to diff."""
     for key, value in json1.items():
-        if ignore_keys and key in ignore_keys:
+        if key in ignore_keys:
             continue
 
-        if json2.get(key) is None and value is not None:
+        old_value = json2.get(key)
+        if old_value is None and value is not None:
             diff.append(Node(old_value=None,
                              new_value=value,
-                             path=path + [key]))
+                             path=_path_to_list((path, key))))
 
         elif isinstance(value, MutableMapping):
-            if d := diff_dict(json1=json1[key],
-                              json2=json2[key],
-                              path=path + [key],
-                              ignore_keys=ignore_keys,
-                              diff_list_callback=diff_list):
-                diff.extend(d)
+            _diff_dict(value, old_value, (path, key), ignore_keys, diff_list, diff)
 
         elif isinstance(value, MutableSequence):
-            if diff_list_callback:
-                if d := diff_list_callback(json1[key], json2[key], path + [key], ignore_keys):
+            if diff_list_callback is diff_list:
+                _diff_list(value, old_value, (path, key), ignore_keys, diff)
+            elif diff_list_callback:
+                if d := diff_list_callback(value, old_value, _path_to_list((path, key)), list(ignore_keys)):
                     diff.extend(d)
 
-        elif value != json2.get(key):
-            diff.append(Node(old_value=json2.get(key),
+        elif value != old_value:
+            diff.append(Node(old_value=old_value,
                              new_value=value,
-                             path=path + [key]))
+                             path=_path_to_list((path, key))))
 
     for key in json2.keys() - json1.keys():
         diff.append(Node(old_value=json2.get(key),
                          new_value=None,
-                         path=path + [key]))
-
-    return diff
+                         path=_path_to_list((path, key))))
 
 
-def diff_list(json1,  # pylint: disable=too-many-branches; linter balking on := walrus
+def diff_list(json1,
               json2,
               path: List[str] = None,
               ignore_keys: List[str] = None) \
@@ -93,42 +117,51 @@ def diff_list(json1,  # pylint: disable=too-many-branches; linter balking on :=
     if not (isinstance(json1, MutableSequence) or isinstance(json2, MutableSequence)):
         return None
 
+    diff = []
+    _diff_list(json1, json2, _path_from_list(path), frozenset(ignore_keys or ()), diff)
+    return diff
+
+
+def _diff_list(json1, json2, path: _Path, ignore_keys: FrozenSet[str], diff: List[Node]):
+    """Append the diff nodes of the lists json1 & json2 to diff.
+
+    The rows of json2 are indexed by id, so each list is walked once.
+    """
+    # the additions and deletions are all recorded against the path of the list, built on first use
+    list_path = None
+
     # if not json2
     if not json2:
-        return [Node(
+        diff.append(Node(
             old_value=None,
             new_value=json1,
-            path=[''] if not path else path
-        )]
+            path=_path_to_list(path) or ['']
+        ))
+        return
 
-    diff = []
-    memoize = []
+    rows2 = {}
+    for row2 in json2:
+        rows2.setdefault(row2.get('id'), row2)
+
+    matched_ids = set()
     for row1 in json1:
-        add_row = True
-        if row1_id := row1.get('id'):
-            for row2 in json2:
-                if row1_id == row2.get('id'):
-                    if d := diff_dict(row1, row2, path + [str(row1_id)], ignore_keys, diff_list_callback=diff_list):
-                        diff.extend(d)
-                    memoize.append(row1_id)
-                    add_row = False
-                    break
-        if add_row:
+        if (row1_id := row1.get('id')) and row1_id in rows2:
+            _diff_dict(row1, rows2[row1_id], (path, str(row1_id)), ignore_keys, diff_list, diff)
+            matched_ids.add(row1_id)
+        else:
+            list_path = list_path or _path_to_list(path) or ['']
             diff.append(Node(
                 old_value=None,
                 new_value=row1,
-                path=[''] if not path else path
+                path=list_path
             ))
 
-    json2_rows = [x.get('id') for x in json2]
-
-    if deleted_rows := set(json2_rows).difference(memoize):
+    if deleted_rows := rows2.keys() - matched_ids:
         for row in json2:
             if row.get('id', '') in deleted_rows:
+                list_path = list_path or _path_to_list(path) or ['']
                 diff.append(Node(
                     old_value=row,
                     new_value=None,
-                    path=[''] if not path else path
+                    path=list_path
                 ))
-
-    return diff
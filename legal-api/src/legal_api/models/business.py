@@ -27,6 +27,7 @@ from legal_api.exceptions import BusinessException
 from legal_api.utils.datetime import datetime, timezone
 from legal_api.utils.legislation_datetime import LegislationDatetime
 
+from . import identity_map
 from .db import db  # noqa: I001
 from .address import Address  # noqa: F401 pylint: disable=unused-import; needed by the SQLAlchemy relationship
 from .alias import Alias  # noqa: F401 pylint: disable=unused-import; needed by the SQLAlchemy relationship
@@ -128,7 +129,8 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes
     __tablename__ = 'businesses'
 
     id = db.Column(db.Integer, primary_key=True)
-    last_modified = db.Column('last_modified', db.DateTime(timezone=True), default=datetime.utcnow)
+    last_modified = db.Column('last_modified', db.DateTime(timezone=True), default=datetime.utcnow,
+                              onupdate=datetime.utcnow)
     last_ledger_id = db.Column('last_ledger_id', db.Integer)
     last_remote_ledger_id = db.Column('last_remote_ledger_id', db.Integer, default=0)
     last_ledger_timestamp = db.Column('last_ledger_timestamp', db.DateTime(timezone=True), default=datetime.utcnow)
@@ -306,7 +308,9 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes
         """Return a Business by the id assigned by the Registrar."""
         business = None
         if identifier:
-            business = cls.query.filter_by(identifier=identifier).one_or_none()
+            if not (business := identity_map.get(cls, 'identifier', identifier)):
+                business = cls.query.filter_by(identifier=identifier).one_or_none()
+                identity_map.add(business, identifier=identifier, id=business.id if business else None)
         return business
 
     @classmethod
@@ -314,7 +318,9 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes
         """Return a Business by the internal id."""
         business = None
         if internal_id:
-            business = cls.query.filter_by(id=internal_id).one_or_none()
+            if not (business := identity_map.get(cls, 'id', internal_id)):
+                business = cls.query.filter_by(id=internal_id).one_or_none()
+                identity_map.add(business, identifier=business.identifier if business else None, id=internal_id)
         return business
 
     @classmethod
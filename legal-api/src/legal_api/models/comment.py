@@ -17,6 +17,7 @@ The Comments class and Schema are held in this module.
 """
 from datetime import datetime
 from http import HTTPStatus
+from typing import Optional
 
 from sqlalchemy import event
 from sqlalchemy.orm import backref
@@ -52,7 +53,10 @@ class Comment(db.Model):
     @property
     def json(self):
         """Return the json repressentation of a comment."""
-        user = User.find_by_id(self.staff_id)
+        return self.json_with_staff(User.find_by_id(self.staff_id))
+
+    def json_with_staff(self, user: Optional[User]) -> dict:
+        """Return the json representation of a comment using an already loaded staff user."""
         return {
             'comment': {
                 'id': self.id,
@@ -13,23 +13,25 @@
 # limitations under the License
 """Filings are legal documents that alter the state of a business."""
 import copy
+from collections import defaultdict
 from datetime import date, datetime
 from enum import Enum
 from http import HTTPStatus
-from typing import List
+from typing import List, Optional, Tuple
 
 from flask import current_app
-from sqlalchemy import desc, event, inspect, or_
+from sqlalchemy import desc, event, func, inspect, or_, tuple_
 from sqlalchemy.dialects.postgresql import JSONB, dialect
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import backref
+from sqlalchemy.orm import aliased, backref
 
 from legal_api.exceptions import BusinessException
 from legal_api.models.colin_event_id import ColinEventId
 from legal_api.schemas import rsbc_schemas
 
 from .db import db  # noqa: I001
-from .comment import Comment  # noqa: I001,F401 pylint: disable=unused-import; needed by the SQLAlchemy relationship
+from .comment import Comment  # noqa: I001; also needed by the SQLAlchemy relationship
+from .user import User  # noqa: I001
 
 
 class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many-public-methods
@@ -169,6 +171,7 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
             'colin_only',
             'parent_filing_id',
             'payment_account',
+            'revision_json',
             'submitter_id',
             'tech_correction_json',
             'temp_reg',
@@ -183,6 +186,7 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
     _filing_type = db.Column('filing_type', db.String(30))
     _filing_json = db.Column('filing_json', JSONB)
     tech_correction_json = db.Column('tech_correction_json', JSONB)
+    revision_json = db.Column('revision_json', JSONB)
     effective_date = db.Column('effective_date', db.DateTime(timezone=True), default=datetime.utcnow)
     _payment_status_code = db.Column('payment_status_code', db.String(50))
     _payment_token = db.Column('payment_id', db.String(4096))
@@ -393,6 +397,19 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
     @property
     def json(self):
         """Return a json representation of this object."""
+        parent = (self.parent_filing.filing_type, self.parent_filing.status) if self.parent_filing else None
+        return self._json(colin_ids=ColinEventId.get_by_filing_id(self.id),
+                          comments=[comment.json for comment in self.comments],
+                          affected_filings=[filing.id for filing in self.children],
+                          parent=parent,
+                          submitter=self.filing_submitter.username if self.submitter_id else None)
+
+    def _json(self, colin_ids: List[int], comments: Optional[List[dict]], affected_filings: List[int],
+              parent: Optional[Tuple[str, str]], submitter: Optional[str]) -> dict:
+        """Return a json representation of this object, using the related records supplied by the caller.
+
+        The comments are left out of the header when they are None.
+        """
         try:
             json_submission = copy.deepcopy(self.filing_json)
             json_submission['filing']['header']['date'] = self._filing_date.isoformat()
@@ -409,27 +426,80 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
             if self._payment_token:
                 json_submission['filing']['header']['paymentToken'] = self.payment_token
             if self.submitter_id:
-                json_submission['filing']['header']['submitter'] = self.filing_submitter.username
+                json_submission['filing']['header']['submitter'] = submitter
             if self.payment_account:
                 json_submission['filing']['header']['paymentAccount'] = self.payment_account
 
             # add colin_event_ids
-            json_submission['filing']['header']['colinIds'] = ColinEventId.get_by_filing_id(self.id)
+            json_submission['filing']['header']['colinIds'] = colin_ids
 
             # add comments
-            json_submission['filing']['header']['comments'] = [comment.json for comment in self.comments]
+            if comments is not None:
+                json_submission['filing']['header']['comments'] = comments
 
             # add affected filings list
-            json_submission['filing']['header']['affectedFilings'] = [filing.id for filing in self.children]
+            json_submission['filing']['header']['affectedFilings'] = affected_filings
 
             # add corrected flags
-            json_submission['filing']['header']['isCorrected'] = self.is_corrected
-            json_submission['filing']['header']['isCorrectionPending'] = self.is_correction_pending
+            is_correction_parent = parent is not None and parent[0] == Filing.FILINGS['correction'].get('name')
+            json_submission['filing']['header']['isCorrected'] = \
+                is_correction_parent and parent[1] == Filing.Status.COMPLETED.value
+            json_submission['filing']['header']['isCorrectionPending'] = \
+                is_correction_parent and parent[1] == Filing.Status.PENDING_CORRECTION.value
 
             return json_submission
         except Exception as err:  # noqa: B901, E722
             raise KeyError from err
 
+    @staticmethod
+    def get_ledger_json(filings: List['Filing'], with_comments: bool = True) -> List[dict]:
+        """Return the json representation of a set of filings.
+
+        The colin ids, comments, affected filings, parent filings and submitters of the whole set
+        are loaded with one query each, instead of once per filing as the json property does.
+        The comments are neither loaded nor returned when with_comments is False.
+        """
+        if not filings:
+            return []
+
+        filing_ids = [filing.id for filing in filings]
+
+        colin_ids = defaultdict(list)
+        for filing_id, colin_event_id in db.session.query(ColinEventId.filing_id, ColinEventId.colin_event_id). \
+                filter(ColinEventId.filing_id.in_(filing_ids)):
+            colin_ids[filing_id].append(colin_event_id)
+
+        comments = defaultdict(list)
+        if with_comments:
+            for comment, user in db.session.query(Comment, User). \
+                    outerjoin(User, Comment.staff_id == User.id). \
+                    filter(Comment.filing_id.in_(filing_ids)). \
+                    order_by(Comment.id):
+                comments[comment.filing_id].append(comment.json_with_staff(user))
+
+        affected_filings = defaultdict(list)
+        for parent_filing_id, child_id in db.session.query(Filing.parent_filing_id, Filing.id). \
+                filter(Filing.parent_filing_id.in_(filing_ids)). \
+                order_by(Filing.id):
+            affected_filings[parent_filing_id].append(child_id)
+
+        parents = {}
+        if parent_ids := {filing.parent_filing_id for filing in filings if filing.parent_filing_id}:
+            for parent_id, filing_type, status in db.session.query(Filing.id, Filing._filing_type, Filing._status). \
+                    filter(Filing.id.in_(parent_ids)):
+                parents[parent_id] = (filing_type, status)
+
+        submitters = {}
+        if submitter_ids := {filing.submitter_id for filing in filings if filing.submitter_id}:
+            submitters = dict(db.session.query(User.id, User.username).filter(User.id.in_(submitter_ids)))
+
+        return [filing._json(colin_ids=colin_ids[filing.id],  # pylint: disable=protected-access
+                             comments=comments[filing.id] if with_comments else None,
+                             affected_filings=affected_filings[filing.id],
+                             parent=parents.get(filing.parent_filing_id),
+                             submitter=submitters.get(filing.submitter_id))
+                for filing in filings]
+
     @classmethod
     def find_by_id(cls, filing_id: str = None):
         """Return a Filing by the id."""
@@ -471,6 +541,47 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
 
         return query.all()
 
+    @staticmethod
+    def get_ledger_filings(business_id: int, status: [], limit: int = None, before_id: int = None):
+        """Return a page of the filings with statuses in the status array input, newest first.
+
+        The filings are ordered by (filing date, id), so that a page can start right after the
+        filing before_id without counting the filings that came before it.
+        """
+        query = db.session.query(Filing). \
+            filter(Filing.business_id == business_id). \
+            filter(Filing._status.in_(status))
+
+        if before_id:
+            before = aliased(Filing)
+            before_date = db.session.query(before._filing_date).filter(before.id == before_id).as_scalar()
+            query = query.filter(tuple_(Filing._filing_date, Filing.id) < tuple_(before_date, before_id))
+
+        query = query.order_by(Filing._filing_date.desc(), Filing.id.desc())
+        if limit:
+            query = query.limit(limit)
+
+        return query.all()
+
+    @staticmethod
+    def get_filings_version(business_id: int) -> str:
+        """Return a value that changes whenever a filing of the business, its comments or colin ids change.
+
+        Only the few columns that version a filing are read, the filing json is not loaded.
+        """
+        filings = db.session.query(Filing.id, Filing._status, Filing.transaction_id, Filing.parent_filing_id). \
+            filter(Filing.business_id == business_id). \
+            order_by(Filing.id). \
+            all()
+        filing_ids = db.session.query(Filing.id).filter(Filing.business_id == business_id)
+        last_comment_id = db.session.query(func.max(Comment.id)). \
+            filter(Comment.filing_id.in_(filing_ids)). \
+            scalar()
+        colin_ids = db.session.query(func.count(ColinEventId.colin_event_id), func.max(ColinEventId.colin_event_id)). \
+            filter(ColinEventId.filing_id.in_(filing_ids)). \
+            one()
+        return str((filings, last_comment_id, tuple(colin_ids)))
+
     @staticmethod
     def get_filings_by_type(business_id: int, filing_type: str):
         """Return the filings of a particular type."""
@@ -0,0 +1,45 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Request scoped identity map of the entities that are looked up by a key.
+
+The session only avoids a query for lookups by primary key, so every find_by_identifier used to
+hit the database. Within a request the entities found are remembered under each key they were
+looked up by, and handed back for as long as they are still in the session.
+Missing entities are not remembered, as they may be created later in the request.
+"""
+from typing import Optional
+
+from flask import has_request_context, request
+
+from .db import db
+
+
+def get(model, key: str, value) -> Optional[db.Model]:
+    """Return the entity of the model found earlier in this request by key == value, if any."""
+    if not has_request_context():
+        return None
+    entity = getattr(request, 'identity_map', {}).get((model, key, value))
+    if entity is not None and entity in db.session:
+        return entity
+    return None
+
+
+def add(entity: Optional[db.Model], **keys):
+    """Remember the entity by each of the key values, for the rest of this request."""
+    if entity is None or not has_request_context():
+        return
+    if not hasattr(request, 'identity_map'):
+        request.identity_map = {}
+    for key, value in keys.items():
+        request.identity_map[(type(entity), key, value)] = entity
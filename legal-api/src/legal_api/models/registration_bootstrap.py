@@ -21,6 +21,7 @@ from sqlalchemy.ext.hybrid import hybrid_property
 
 from legal_api.exceptions import BusinessException
 
+from . import identity_map
 from .db import db
 from .filing import Filing  # noqa: F401,I003 pylint: disable=unused-import; needed by the SQLAlchemy backref
 from .user import User  # noqa: F401 pylint: disable=unused-import; needed by the SQLAlchemy backref
@@ -63,7 +64,9 @@ class RegistrationBootstrap(db.Model):  # pylint: disable=too-many-instance-attr
         """Return a Business by the id assigned by the Registrar."""
         business = None
         if identifier:
-            business = cls.query.filter_by(identifier=identifier).one_or_none()
+            if not (business := identity_map.get(cls, 'identifier', identifier)):
+                business = cls.query.filter_by(identifier=identifier).one_or_none()
+                identity_map.add(business, identifier=identifier)
         return business
 
     def save(self):
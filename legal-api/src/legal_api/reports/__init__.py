@@ -9,18 +9,94 @@
 # an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 # specific language governing permissions and limitations under the License.
 """Module to manage the calls and content to the reporting service."""
+import io
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
+from typing import Dict, Iterable, Optional
 
-from flask import jsonify
+from flask import Flask, Response, current_app, jsonify
 from flask_babel import _
 
 from .report import Report
 
 
+_executor: Optional[ThreadPoolExecutor] = None  # pylint: disable=invalid-name
+_executor_lock = threading.Lock()  # pylint: disable=invalid-name
+
+
 def get_pdf(filing, report_type=None):
     """Render a PDF for the supplied filing."""
     try:
         return Report(filing).get_pdf(report_type)
     except FileNotFoundError:
         # We don't have a template for it, so it must only be available on paper.
-        return jsonify({'message': _('Available on paper only.')}), HTTPStatus.NOT_FOUND
+        return _paper_only()
+
+
+def get_pdfs(filing, report_types: Iterable[Optional[str]]) -> Dict[Optional[str], tuple]:
+    """Render the PDFs of several report types of the supplied filing, by report type.
+
+    The business is loaded once for all the reports, and the reports are rendered concurrently.
+    """
+    business = Report.load_business(filing) if filing.business_id else None
+    pdfs = {}
+    reports = {}
+    for report_type in dict.fromkeys(report_types):
+        report = Report(filing, business)
+        try:
+            if (pdf := report.prepare(report_type)) is not None:
+                pdfs[report_type] = pdf, HTTPStatus.OK
+            else:
+                reports[report_type] = report
+        except FileNotFoundError:
+            pdfs[report_type] = _paper_only()
+
+    app = current_app._get_current_object()  # pylint: disable=protected-access; for the pool threads
+    futures = {report_type: _get_executor().submit(_render, app, report) for report_type, report in reports.items()}
+    for report_type, future in futures.items():
+        pdfs[report_type] = future.result()
+    return pdfs
+
+
+def get_pdfs_zip(filing, report_types: Iterable[Optional[str]]):
+    """Render the PDFs of several report types of the supplied filing, as a zip of <report type>.pdf files.
+
+    The reports that failed to render are left out of the zip.
+    """
+    rendered = {}
+    for report_type, (pdf, status) in get_pdfs(filing, report_types).items():
+        if status == HTTPStatus.OK:
+            rendered[report_type or filing.filing_type] = pdf
+        else:
+            current_app.logger.warning(f'The {report_type} report of filing {filing.id} failed to render: {status}')
+    if not rendered:
+        return jsonify({'message': _('None of the reports could be rendered.')}), HTTPStatus.NOT_FOUND
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zip_file:
+        for report_type, pdf in rendered.items():
+            zip_file.writestr(f'{report_type}.pdf', pdf)
+    return Response(buffer.getvalue(), mimetype='application/zip'), HTTPStatus.OK
+
+
+def _render(app: Flask, report: Report) -> tuple:
+    """Render a prepared report in a pool thread."""
+    with app.app_context():
+        return report.render()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the pool rendering the reports, sized by REPORT_MAX_WORKERS."""
+    global _executor  # pylint: disable=global-statement,invalid-name
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=int(current_app.config.get('REPORT_MAX_WORKERS', 4)),
+                                               thread_name_prefix='report')
+    return _executor
+
+
+def _paper_only():
+    return jsonify({'message': _('Available on paper only.')}), HTTPStatus.NOT_FOUND
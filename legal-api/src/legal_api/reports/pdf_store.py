@@ -0,0 +1,60 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+"""Store of the rendered PDFs of the completed filings.
+
+The PDF of a completed filing only changes with its template and its template data, some of which, such as the
+business number, is read from the business as it is now. So once rendered it is kept in the Minio bucket under
+the filing id, the report type and a hash of the whole report request, and served from there.
+The store is turned on by REPORT_PDF_STORE_ENABLED, and a store failure only means the PDF is rendered again.
+"""
+import hashlib
+from typing import Optional
+
+from flask import current_app
+
+from legal_api.services import MinioService
+
+
+FOLDER_NAME = 'rendered-pdfs'
+
+
+def is_enabled() -> bool:
+    """Return True if the rendered PDFs are stored."""
+    return bool(current_app.config.get('REPORT_PDF_STORE_ENABLED'))
+
+
+def get_key(filing_id: int, report_type: str, report_request: str) -> str:
+    """Return the key of the PDF rendered for a report request, the template and the template data."""
+    version = hashlib.sha256(report_request.encode('utf-8')).hexdigest()[:16]
+    return f'{FOLDER_NAME}/{filing_id}/{report_type}/{version}.pdf'
+
+
+def get_pdf(key: str) -> Optional[bytes]:
+    """Return the stored PDF, or None if it isn't stored."""
+    response = None
+    try:
+        response = MinioService.get_file(key)
+        return response.read()
+    except Exception as err:  # pylint: disable=broad-except; a store failure is only a miss
+        current_app.logger.debug(f'Rendered PDF {key} not read from the store: {err}')
+        return None
+    finally:
+        if response:
+            response.close()
+            response.release_conn()
+
+
+def save_pdf(key: str, pdf: bytes):
+    """Store a rendered PDF."""
+    try:
+        MinioService.put_file(key, pdf, content_type='application/pdf')
+    except Exception as err:  # pylint: disable=broad-except; the PDF is rendered again next time
+        current_app.logger.warning(f'Unable to store the rendered PDF {key}: {err}')
@@ -9,7 +9,6 @@
 # an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 # specific language governing permissions and limitations under the License.
 """Produces a PDF output based on templates and JSON messages."""
-import base64
 import copy
 import json
 import os
@@ -17,16 +16,16 @@ import re
 from contextlib import suppress
 from datetime import datetime
 from http import HTTPStatus
-from pathlib import Path
 
 import pycountry
-import requests
 from flask import current_app, jsonify
 
 from legal_api.models import Business, CorpType, Filing
 from legal_api.models.business import ASSOCIATION_TYPE_DESC
+from legal_api.reports import pdf_store
 from legal_api.reports.registrar_meta import RegistrarInfo
-from legal_api.services import VersionedBusinessDetailsService
+from legal_api.reports.template_registry import template_registry
+from legal_api.services import Upstream, VersionedBusinessDetailsService, http_client
 from legal_api.utils.auth import jwt
 from legal_api.utils.legislation_datetime import LegislationDatetime
 
@@ -35,35 +34,70 @@ class Report:  # pylint: disable=too-few-public-methods
     # TODO review pylint warning and alter as required
     """Service to create report outputs."""
 
-    def __init__(self, filing):
-        """Create the Report instance."""
+    def __init__(self, filing, business=None):
+        """Create the Report instance, for the business of the filing when it is already loaded."""
         self._filing = filing
-        self._business = None
+        self._business = business
         self._report_key = None
+        self._store_key = None
+        self._request = None
 
     def get_pdf(self, report_type=None):
         """Render a pdf for the report."""
+        if self._filing.business_id and not self._business:
+            self._business = Report.load_business(self._filing)
+        if (pdf := self.prepare(report_type)) is not None:
+            return pdf, HTTPStatus.OK
+        return self.render()
+
+    @staticmethod
+    def load_business(filing) -> Business:
+        """Load the business of the filing, and set it in the filing as it was at the time of the filing."""
+        business = Business.find_by_internal_id(filing.business_id)
+        Report._populate_business_info_to_filing(filing, business)
+        return business
+
+    def prepare(self, report_type=None):
+        """Build the report service request, or return the stored pdf of the report.
+
+        Everything that reads the database or the request is done here, so the render can be run in another thread.
+        """
         self._report_key = report_type if report_type else self._filing.filing_type
         if self._report_key == 'correction':
             self._report_key = self._filing.filing_json['filing']['correction']['correctedFilingType']
         elif self._report_key == 'alteration':
             self._report_key = 'alterationNotice'
-        if self._filing.business_id:
-            self._business = Business.find_by_internal_id(self._filing.business_id)
-            Report._populate_business_info_to_filing(self._filing, self._business)
+
+        template = template_registry.get_template(self._get_template_filename())
         headers = {
             'Authorization': 'Bearer {}'.format(jwt.get_token_auth_header()),
             'Content-Type': 'application/json'
         }
-        data = {
+        data = json.dumps({
             'reportName': self._get_report_filename(),
-            'template': "'" + base64.b64encode(bytes(self._get_template(), 'utf-8')).decode() + "'",
+            'template': template.encoded,
             'templateVars': self._get_template_data()
-        }
-        response = requests.post(url=current_app.config.get('REPORT_SVC_URL'), headers=headers, data=json.dumps(data))
+        })
+
+        # a completed filing renders the same pdf for as long as its template and template data are the same
+        if self._filing.status == Filing.Status.COMPLETED.value and pdf_store.is_enabled():
+            self._store_key = pdf_store.get_key(self._filing.id, self._report_key, data)
+            if (pdf := pdf_store.get_pdf(self._store_key)) is not None:
+                return pdf
+
+        self._request = {'headers': headers, 'data': data}
+        return None
+
+    def render(self):
+        """Render the prepared report with the report service."""
+        response = http_client.post(Upstream.REPORT,
+                                    url=current_app.config.get('REPORT_SVC_URL'),
+                                    **self._request)
 
         if response.status_code != HTTPStatus.OK:
             return jsonify(message=str(response.content)), response.status_code
+        if self._store_key:
+            pdf_store.save_pdf(self._store_key, response.content)
         return response.content, response.status_code
 
     def _get_report_filename(self):
@@ -75,10 +109,7 @@ class Report:  # pylint: disable=too-few-public-methods
 
     def _get_template(self):
         try:
-            template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
-            template_code = Path(f'{template_path}/{self._get_template_filename()}').read_text()
-            # substitute template parts
-            template_code = self._substitute_template_parts(template_code)
+            template_code = template_registry.get_template(self._get_template_filename()).code
         except Exception as err:
             current_app.logger.error(err)
             raise err
@@ -88,66 +119,12 @@ class Report:  # pylint: disable=too-few-public-methods
     def _substitute_template_parts(template_code):
         """Substitute template parts in main template.
 
-        Template parts are marked by [[partname.html]] in templates.
-
-        This functionality is restricted by:
-        - markup must be exactly [[partname.html]] and have no extra spaces around file name
-        - template parts can only be one level deep, ie: this rudimentary framework does not handle nested template
-        parts. There is no recursive search and replace.
+        Template parts are marked by [[partname.html]] in templates, and can themselves have template parts.
 
         :param template_code: string
         :return: template_code string, modified.
         """
-        template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
-        template_parts = [
-            'bc-annual-report/legalObligations',
-            'bc-address-change/addresses',
-            'bc-director-change/directors',
-            'certificate-of-name-change/style',
-            'common/certificateLogo',
-            'common/certificateRegistrarSignature',
-            'common/certificateSeal',
-            'common/certificateStyle',
-            'common/addresses',
-            'common/shareStructure',
-            'common/correctedOnCertificate',
-            'common/style',
-            'common/businessDetails',
-            'common/directors',
-            'incorporation-application/benefitCompanyStmt',
-            'incorporation-application/completingParty',
-            'incorporation-application/effectiveDate',
-            'incorporation-application/incorporator',
-            'incorporation-application/nameRequest',
-            'incorporation-application/cooperativeAssociationType',
-            'common/statement',
-            'common/benefitCompanyStmt',
-            'notice-of-articles/directors',
-            'notice-of-articles/restrictions',
-            'common/resolutionDates',
-            'alteration-notice/businessTypeChange',
-            'common/effectiveDate',
-            'common/legalNameChange',
-            'common/nameTranslation',
-            'alteration-notice/companyProvisions',
-            'addresses',
-            'certification',
-            'directors',
-            'dissolution',
-            'footer',
-            'legalNameChange',
-            'logo',
-            'macros',
-            'resolution',
-            'style'
-        ]
-
-        # substitute template parts - marked up by [[filename]]
-        for template_part in template_parts:
-            template_part_code = Path(f'{template_path}/template-parts/{template_part}.html').read_text()
-            template_code = template_code.replace('[[{}.html]]'.format(template_part), template_part_code)
-
-        return template_code
+        return template_registry.substitute_template_parts(template_code)
 
     def _get_template_filename(self):
         if ReportMeta.reports[self._report_key].get('hasDifferentTemplates', False):
@@ -0,0 +1,103 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+"""Registry of the assembled report templates.
+
+A report template is read and has its template parts substituted the first time it is used. The assembled
+template, its base64 payload for the report service and its version are then kept for the life of the process.
+With REPORT_TEMPLATE_RELOAD set, e.g. in development, a template is assembled again when any of its files
+has changed on disk.
+"""
+import base64
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Tuple
+
+from flask import current_app
+
+
+TEMPLATE_PART = re.compile(r'\[\[([\w\-/]+)\.html\]\]')
+
+
+@dataclass(frozen=True)
+class Template:
+    """An assembled report template."""
+
+    code: str
+    encoded: str
+    version: str
+    files: Tuple[Tuple[Path, float], ...]
+
+    def is_stale(self) -> bool:
+        """Return True if any of the files of the template has changed since it was assembled."""
+        try:
+            return any(path.stat().st_mtime != mtime for path, mtime in self.files)
+        except FileNotFoundError:
+            return True
+
+
+class TemplateRegistry():
+    """The assembled report templates, by template path and file name."""
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._templates: Dict[Tuple[str, str], Template] = {}
+        self._lock = threading.Lock()
+
+    def get_template(self, file_name: str) -> Template:
+        """Return the assembled template of a file in REPORT_TEMPLATE_PATH."""
+        template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
+        key = (template_path, file_name)
+        template = self._templates.get(key)
+        if template is None or (current_app.config.get('REPORT_TEMPLATE_RELOAD') and template.is_stale()):
+            with self._lock:
+                template = self._load(template_path, file_name)
+                self._templates[key] = template
+        return template
+
+    def substitute_template_parts(self, template_code: str) -> str:
+        """Return the template code with its template parts substituted."""
+        return self._substitute(Path(current_app.config.get('REPORT_TEMPLATE_PATH')), template_code, {}, ())
+
+    def clear(self):
+        """Drop all the assembled templates."""
+        with self._lock:
+            self._templates.clear()
+
+    def _load(self, template_path: str, file_name: str) -> Template:
+        """Read and assemble a template."""
+        path = Path(f'{template_path}/{file_name}')
+        files = {path: path.stat().st_mtime}
+        code = self._substitute(Path(template_path), path.read_text(), files, ())
+        return Template(code=code,
+                        encoded="'" + base64.b64encode(bytes(code, 'utf-8')).decode() + "'",
+                        version=hashlib.sha256(code.encode('utf-8')).hexdigest()[:16],
+                        files=tuple(files.items()))
+
+    def _substitute(self, template_path: Path, template_code: str, files: Dict[Path, float], parents: tuple) -> str:
+        """Substitute the template parts, marked by [[partname.html]], including the parts within parts.
+
+        A part that doesn't exist, or that would include itself, is left as is.
+        """
+        def substitute_part(match) -> str:
+            part_name = match.group(1)
+            path = template_path / 'template-parts' / f'{part_name}.html'
+            if part_name in parents or not path.is_file():
+                return match.group(0)
+            files[path] = path.stat().st_mtime
+            return self._substitute(template_path, path.read_text(), files, parents + (part_name,))
+
+        return TEMPLATE_PART.sub(substitute_part, template_code)
+
+
+template_registry = TemplateRegistry()  # pylint: disable=invalid-name; shared variables are lower case by convention.
@@ -16,6 +16,7 @@
 Provides all the search and retrieval from the business entity datastore.
 """
 from contextlib import suppress
+from datetime import datetime, timezone
 from http import HTTPStatus
 
 from flask import jsonify, request
@@ -26,6 +27,7 @@ from legal_api.models import Business, Filing, RegistrationBootstrap
 from legal_api.resources.business.business_filings import ListFilingResource
 from legal_api.services import RegistrationBootstrapService
 from legal_api.utils.auth import jwt
+from legal_api.utils.etag import add_validators, get_etag, not_modified_response
 from legal_api.utils.util import cors_preflight
 
 from .api_namespace import API
@@ -56,7 +58,14 @@ class BusinessResource(Resource):
         if not business:
             return jsonify({'message': f'{identifier} not found'}), HTTPStatus.NOT_FOUND
 
-        return jsonify(business=business.json())
+        # the good standing and the AR dates are worked out as of today
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        etag = get_etag(business.id, business.last_modified, business.last_ledger_timestamp, today)
+        last_modified = max(business.last_modified, today) if business.last_modified else None
+        if response := not_modified_response(etag, last_modified):
+            return response
+
+        return add_validators(jsonify(business=business.json()), etag, last_modified)
 
     @staticmethod
     @cors.crossdomain(origin='*')
@@ -18,9 +18,8 @@ Provides all the search and retrieval from the business entity datastore.
 from http import HTTPStatus
 from typing import Tuple, Union
 
-import requests  # noqa: I001; grouping out of order to make both pylint & isort happy
 from requests import exceptions  # noqa: I001; grouping out of order to make both pylint & isort happy
-from flask import current_app, g, jsonify, request
+from flask import Response, current_app, g, json, jsonify, request, stream_with_context
 from flask_babel import _
 from flask_jwt_oidc import JwtManager
 from flask_restx import Resource, cors
@@ -40,14 +39,19 @@ from legal_api.services import (
     DocumentMetaService,
     MinioService,
     RegistrationBootstrapService,
+    Upstream,
     authorized,
+    http_client,
     namex,
+    payment,
     queue,
+    response_cache,
 )
 from legal_api.services.filings import validate
 from legal_api.services.utils import get_str
 from legal_api.utils import datetime
 from legal_api.utils.auth import jwt
+from legal_api.utils.etag import add_validators, get_etag, not_modified_response
 from legal_api.utils.legislation_datetime import LegislationDatetime
 from legal_api.utils.util import cors_preflight
 
@@ -55,6 +59,10 @@ from .api_namespace import API
 # noqa: I003; the multiple route decorators cause an erroneous error in line space counting
 
 
+LEDGER_BATCH_SIZE = 100
+LEDGER_FIELDS = {'body', 'comments', 'documents'}
+
+
 @cors_preflight('GET, POST, PUT, DELETE, PATCH')
 @API.route('/<string:identifier>/filings', methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
 @API.route('/<string:identifier>/filings/<int:filing_id>', methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS', 'PATCH'])
@@ -84,25 +92,9 @@ class ListFilingResource(Resource):
                 filing_json['filing']['documents'] = DocumentMetaService().get_documents(filing_json)
 
             if filing_json['filing']['header']['status'] == Filing.Status.PENDING.value:
-                try:
-                    headers = {
-                        'Authorization': f'Bearer {jwt.get_token_auth_header()}',
-                        'Content-Type': 'application/json'
-                    }
-                    payment_svc_url = current_app.config.get('PAYMENT_SVC_URL')
-                    pay_response = requests.get(
-                        url=f'{payment_svc_url}/{filing_json["filing"]["header"]["paymentToken"]}',
-                        headers=headers
-                    )
-                    pay_details = {
-                        'isPaymentActionRequired': pay_response.json().get('isPaymentActionRequired', False),
-                        'paymentMethod': pay_response.json().get('paymentMethod', '')
-                    }
-                    filing_json['filing']['header'].update(pay_details)
-
-                except (exceptions.ConnectionError, exceptions.Timeout) as err:
-                    current_app.logger.error(
-                        f'Payment connection failure for getting {identifier} filing payment details. ', err)
+                pay_details = payment.get_payment_details([rv.storage], jwt.get_token_auth_header())
+                if details := pay_details.get(str(rv.storage.payment_token)):
+                    filing_json['filing']['header'].update(details)
 
             return jsonify(filing_json)
 
@@ -116,30 +108,153 @@ class ListFilingResource(Resource):
             if not rv:
                 return jsonify({'message': f'{identifier} no filings found'}), HTTPStatus.NOT_FOUND
 
-            if str(request.accept_mimetypes) == 'application/pdf':
-                report_type = request.args.get('type', None)
-
-                if rv.filing_type == CoreFiling.FilingTypes.CORRECTION.value:
-                    # This is required until #5302 ticket implements
-                    rv.storage._filing_json['filing']['correction']['diff'] = rv.json['filing']['correction']['diff']  # pylint: disable=protected-access; # noqa: E501;
+            # drafts can be edited in place, so only paid and completed filings are versioned
+            etag = None
+            if rv.status in [Filing.Status.COMPLETED.value, Filing.Status.PAID.value]:
+                etag = ListFilingResource._get_etag(business, filing_id)
+                if response := not_modified_response(etag):
+                    return response
+
+            if str(request.accept_mimetypes) == 'application/zip':
+                ListFilingResource._set_correction_diff(rv)
+                # the documents of the filing, all of them unless they are listed
+                if report_types := request.args.get('types', None):
+                    report_types = report_types.split(',')
+                else:
+                    report_types = [document.get('reportType')
+                                    for document in DocumentMetaService().get_documents(rv.json)]
+                # the ETag is of the zip, as it is made from the Accept header and the types asked for
+                zip_response = legal_api.reports.get_pdfs_zip(rv.storage, report_types)
+                return add_validators(zip_response, etag) if etag else zip_response
+
+            is_pdf = str(request.accept_mimetypes) == 'application/pdf'
+            report_type = request.args.get('type', None) if is_pdf else None
+            representation = 'pdf' if is_pdf else 'original' if original_filing else 'json'
+            # completed filings do not change, other than what their ETag already versions
+            is_cacheable = rv.status == Filing.Status.COMPLETED.value
+            if is_cacheable and \
+                    (cached := response_cache.get_filing_response(filing_id, rv.status, representation, report_type,
+                                                                  etag)):
+                return add_validators(cached, etag)
+
+            if is_pdf:
+                ListFilingResource._set_correction_diff(rv)
+                filing_response = legal_api.reports.get_pdf(rv.storage, report_type)
+            else:
+                filing_response = jsonify(rv.raw if original_filing else rv.json)
 
-                return legal_api.reports.get_pdf(rv.storage, report_type)
-            return jsonify(rv.raw if original_filing else rv.json)
+            if is_cacheable:
+                filing_response = response_cache.set_filing_response(filing_id, rv.status, representation,
+                                                                     report_type, etag, filing_response)
+            return add_validators(filing_response, etag) if etag else filing_response
 
         # Does it make sense to get a PDF of all filings?
         if str(request.accept_mimetypes) == 'application/pdf':
             return jsonify({'message': _('Cannot return a single PDF of multiple filing submissions.')}),\
                 HTTPStatus.NOT_ACCEPTABLE
 
-        rv = []
-        filings = CoreFiling.get_filings_by_status(business.id,
-                                                   [Filing.Status.COMPLETED.value, Filing.Status.PAID.value])
-        for filing in filings:
-            filing_json = filing.raw
-            filing_json['filing']['documents'] = DocumentMetaService().get_documents(filing_json)
-            rv.append(filing_json)
+        etag = ListFilingResource._get_etag(business)
+        if response := not_modified_response(etag):
+            return response
+
+        limit = request.args.get('limit', None, type=int)
+        if limit is not None and limit < 1:
+            return jsonify({'message': _('The limit must be a positive number.')}), HTTPStatus.BAD_REQUEST
+        before_id = request.args.get('before', None, type=int)
+        fields = set(request.args.get('fields').split(',')) if request.args.get('fields') else None
+        if fields and (unknown_fields := fields - LEDGER_FIELDS):
+            return jsonify({'message': _('Unknown fields: {}.').format(', '.join(sorted(unknown_fields)))}), \
+                HTTPStatus.BAD_REQUEST
+
+        # the first page is read before the response starts, so that a failure to read it is an error response
+        page_size = min(LEDGER_BATCH_SIZE, limit) if limit else LEDGER_BATCH_SIZE
+        page = ListFilingResource._get_ledger_page(business, page_size, before_id, fields)
+        return add_validators(
+            Response(stream_with_context(ListFilingResource._stream_ledger(business, page, limit, fields)),
+                     mimetype='application/json'),
+            etag)
+
+    @staticmethod
+    def _set_correction_diff(rv: CoreFiling):
+        """Set the diff of a correction in the filing json, for its reports."""
+        if rv.filing_type == CoreFiling.FilingTypes.CORRECTION.value:
+            # This is required until #5302 ticket implements
+            rv.storage._filing_json['filing']['correction']['diff'] = rv.json['filing']['correction']['diff']  # pylint: disable=protected-access; # noqa: E501;
+
+    @staticmethod
+    def _get_etag(business: Business, filing_id: int = None) -> str:
+        """Return the ETag of a filing or of the ledger of a business.
 
-        return jsonify(filings=rv)
+        Both only change with the business, its filings and their comments and colin ids.
+        """
+        return get_etag(business.id, business.last_modified, Filing.get_filings_version(business.id),
+                        filing_id, request.accept_mimetypes, request.query_string)
+
+    @staticmethod
+    def _stream_ledger(business: Business, page: Tuple[list, bool], limit: int = None, fields: set = None):
+        """Yield the filings ledger of a business as json, one page of filings at a time.
+
+        The ledger starts with the first page, read by the caller, and holds up to limit filings, when given.
+        When there are more filings, nextBefore is the filing id to ask for the next page with.
+        A failure once the response has started ends the ledger with an error, rather than with invalid json.
+        """
+        yield '{"filings": ['
+        count = 0
+        entries, has_more = page
+        try:
+            while True:
+                for entry in entries:
+                    yield (',' if count else '') + json.dumps(entry)
+                    count += 1
+                if not has_more or (limit and count >= limit):
+                    break
+                page_size = min(LEDGER_BATCH_SIZE, limit - count) if limit else LEDGER_BATCH_SIZE
+                entries, has_more = ListFilingResource._get_ledger_page(
+                    business, page_size, entries[-1]['filing']['header']['filingId'], fields)
+        except Exception as err:  # pylint: disable=broad-except; the response has started, the error is in the json
+            current_app.logger.error(f'Unable to read the ledger of business {business.identifier}: {err}')
+            yield '], "error": ' + json.dumps({'message': _('Unable to read the rest of the filings.')}) + '}'
+            return
+
+        yield ']'
+        if limit:
+            next_before = entries[-1]['filing']['header']['filingId'] if has_more else None
+            yield f', "nextBefore": {json.dumps(next_before)}'
+        yield '}'
+
+    @staticmethod
+    def _get_ledger_page(business: Business, page_size: int, before_id: int = None, fields: set = None) \
+            -> Tuple[list, bool]:
+        """Return up to page_size ledger entries after the filing before_id, and whether there are more.
+
+        One filing more than the page is read to tell whether there are more.
+        """
+        ledger = CoreFiling.get_ledger(business.id,
+                                       [Filing.Status.COMPLETED.value, Filing.Status.PAID.value],
+                                       limit=page_size + 1,
+                                       before_id=before_id,
+                                       with_comments=fields is None or 'comments' in fields)
+        has_more = len(ledger) > page_size
+        ledger = ledger[:page_size]
+        if fields is None or 'documents' in fields:
+            documents = DocumentMetaService().get_documents_for_filings(ledger, business)
+            for filing_json, filing_documents in zip(ledger, documents):
+                filing_json['filing']['documents'] = filing_documents
+        return [ListFilingResource._ledger_entry(filing_json, fields) for filing_json in ledger], has_more
+
+    @staticmethod
+    def _ledger_entry(filing_json: dict, fields: set = None) -> dict:
+        """Return the parts of a ledger entry that are listed in fields, or the whole entry."""
+        if fields is None:
+            return filing_json
+
+        filing = filing_json['filing']
+        entry = {'header': filing['header']}
+        if 'body' in fields:
+            entry.update({key: value for key, value in filing.items() if key not in ('header', 'documents')})
+        if 'documents' in fields:
+            entry['documents'] = filing['documents']
+        return {'filing': entry}
 
     @staticmethod
     @cors.crossdomain(origin='*')
@@ -314,8 +429,9 @@ class ListFilingResource(Resource):
             payment_svc_url = '{}/{}'.format(current_app.config.get('PAYMENT_SVC_URL'), filing.payment_token)
             token = jwt.get_token_auth_header()
             headers = {'Authorization': 'Bearer ' + token}
-            rv = requests.delete(url=payment_svc_url, headers=headers, timeout=20.0)
+            rv = http_client.delete(Upstream.PAY, url=payment_svc_url, headers=headers)
             if rv.status_code == HTTPStatus.OK or rv.status_code == HTTPStatus.ACCEPTED:
+                payment.invalidate(filing.payment_token)
                 filing.reset_filing_to_draft()
 
         except (exceptions.ConnectionError, exceptions.Timeout) as err:
@@ -706,10 +822,10 @@ class ListFilingResource(Resource):
             token = user_jwt.get_token_auth_header()
             headers = {'Authorization': 'Bearer ' + token,
                        'Content-Type': 'application/json'}
-            rv = requests.post(url=payment_svc_url,
-                               json=payload,
-                               headers=headers,
-                               timeout=20.0)
+            rv = http_client.post(Upstream.PAY,
+                                  url=payment_svc_url,
+                                  json=payload,
+                                  headers=headers)
         except (exceptions.ConnectionError, exceptions.Timeout) as err:
             current_app.logger.error(f'Payment connection failure for {business.identifier}: filing:{filing.id}', err)
             return {'message': 'unable to create invoice for payment.'}, HTTPStatus.PAYMENT_REQUIRED
@@ -828,6 +944,7 @@ class InternalFilings(Resource):
                     current_app.logger.Error(f'Error adding colin event id {colin_id} to filing with id {filing_id}')
                     return None, None, {'message': err.error}, err.status_code
 
+            response_cache.invalidate_filing(filing.id)
             return jsonify(filing.json), HTTPStatus.ACCEPTED
         except Exception as err:
             current_app.logger.Error(f'Error patching colin event id for filing with id {filing_id}')
@@ -19,13 +19,11 @@ Provides all the search and retrieval from the business filings datastore.
 from datetime import datetime
 from http import HTTPStatus
 
-import requests
-from requests import exceptions  # noqa I001
-from flask import current_app, jsonify
+from flask import jsonify
 from flask_restx import Resource, cors
 
 from legal_api.models import Business, Filing
-from legal_api.services import namex
+from legal_api.services import namex, payment
 from legal_api.utils.auth import jwt
 from legal_api.utils.util import cors_preflight
 
@@ -74,10 +72,6 @@ class TaskListResource(Resource):
                 # Append NR todo if there are no tasks and PAID or COMPLETED filings
                 if not paid_completed_filings:
                     rv.append(TaskListResource.create_incorporate_nr_todo(nr_response.json(), 1, True))
-            elif rv == 'pay_connection_error':
-                return {
-                    'message': 'Failed to get payment details for a filing. Please try again later.'
-                }, HTTPStatus.SERVICE_UNAVAILABLE
 
         return jsonify(tasks=rv)
 
@@ -105,30 +99,17 @@ class TaskListResource(Resource):
                                                                      Filing.Status.PENDING.value,
                                                                      Filing.Status.PENDING_CORRECTION.value,
                                                                      Filing.Status.ERROR.value])
+        # get current pay details from pay-api, a filing the pay-api doesn't answer for is listed without them
+        unpaid_filings = [filing for filing in pending_filings
+                          if filing.payment_status_code == 'CREATED' and filing.payment_token]
+        pay_details = payment.get_payment_details(unpaid_filings, jwt.get_token_auth_header()) \
+            if unpaid_filings else {}
+
         # Create a todo item for each pending filing
         for filing in pending_filings:
             filing_json = filing.json
-            if filing.payment_status_code == 'CREATED' and filing.payment_token:
-                # get current pay details from pay-api
-                try:
-                    headers = {
-                        'Authorization': f'Bearer {jwt.get_token_auth_header()}',
-                        'Content-Type': 'application/json'
-                    }
-                    pay_response = requests.get(
-                        url=f'{current_app.config.get("PAYMENT_SVC_URL")}/{filing.payment_token}',
-                        headers=headers
-                    )
-                    pay_details = {
-                        'isPaymentActionRequired': pay_response.json().get('isPaymentActionRequired', False),
-                        'paymentMethod': pay_response.json().get('paymentMethod', '')
-                    }
-                    filing_json['filing']['header'].update(pay_details)
-
-                except (exceptions.ConnectionError, exceptions.Timeout) as err:
-                    current_app.logger.error(
-                        f'Payment connection failure for {business.identifier} task list. ', err)
-                    return 'pay_connection_error'
+            if details := pay_details.get(str(filing.payment_token)):
+                filing_json['filing']['header'].update(details)
 
             task = {'task': filing_json, 'order': order, 'enabled': True}
             tasks.append(task)
@@ -16,6 +16,7 @@ from flask_restx import Namespace, Resource
 from sqlalchemy import exc, text
 
 from legal_api.models import db
+from legal_api.services import authz_cache, http_client
 
 
 API = Namespace('OPS', description='Service - OPS checks')
@@ -51,3 +52,13 @@ class Readyz(Resource):
         """Return a JSON object that identifies if the service is setupAnd ready to work."""
         # TODO: add a poll to the DB when called
         return {'message': 'api is ready'}, 200
+
+
+@API.route('metrics')
+class Metrics(Resource):
+    """Reports the latency of the calls to the upstream services and the caches of this process."""
+
+    @staticmethod
+    def get():
+        """Return a JSON object with the latency of each upstream and the authorization cache hits."""
+        return {'upstreams': http_client.metrics(), 'authz': authz_cache.metrics()}, 200
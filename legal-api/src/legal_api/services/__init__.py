@@ -13,13 +13,18 @@
 # limitations under the License.
 """This module wraps the calls to external services used by the API."""
 from .authz import BASIC_USER, COLIN_SVC_ROLE, STAFF_ROLE, SYSTEM_ROLE, authorized
+from .authz_cache import AuthzCache, authz_cache
 from .bootstrap import RegistrationBootstrapService
 from .business_details_version import VersionedBusinessDetailsService
 from .document_meta import DocumentMetaService
 from .flags import Flags
+from .http_client import HttpClient, Upstream, http_client
 from .minio import MinioService
 from .namex import NameXService
+from .payment import PaymentService
 from .queue import QueueService
+from .response_cache import ResponseCache
+from .token_cache import TokenCache, token_cache
 
 
 flags = Flags()  # pylint: disable=invalid-name; shared variables are lower case by Flask convention.
@@ -28,4 +33,8 @@ queue = QueueService()  # pylint: disable=invalid-name; shared variables are low
 
 namex = NameXService()  # pylint: disable=invalid-name; shared variables are lower case by Flask convention.
 
+payment = PaymentService()  # pylint: disable=invalid-name; shared variables are lower case by Flask convention.
+
+response_cache = ResponseCache()  # pylint: disable=invalid-name; shared variables are lower case by Flask convention.
+
 #  document_meta = DocumentMetaService()  # pylint: disable=invalid-name;
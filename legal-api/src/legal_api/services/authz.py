@@ -15,11 +15,12 @@
 from http import HTTPStatus
 from typing import List
 
-from flask import current_app
+from flask import current_app, g
 from flask_jwt_oidc import JwtManager
-from requests import Session, exceptions
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from requests import exceptions
+
+from .authz_cache import authz_cache
+from .http_client import Upstream, http_client
 
 
 SYSTEM_ROLE = 'system'
@@ -49,32 +50,42 @@ def authorized(  # pylint: disable=too-many-return-statements
         if any(elem in action for elem in staff_only_actions):
             return False
 
-        template_url = current_app.config.get('AUTH_SVC_URL')
-        auth_url = template_url.format(**vars())
-
-        token = jwt.get_token_auth_header()
-        headers = {'Authorization': 'Bearer ' + token}
-        try:
-            http = Session()
-            retries = Retry(total=5,
-                            backoff_factor=0.1,
-                            status_forcelist=[500, 502, 503, 504])
-            http.mount('http://', HTTPAdapter(max_retries=retries))
-            rv = http.get(url=auth_url, headers=headers)
-
-            if rv.status_code != HTTPStatus.OK \
-                    or not rv.json().get('roles'):
-                return False
-
-            if all(elem.lower() in rv.json().get('roles') for elem in action):
-                return True
-
-        except (exceptions.ConnectionError,  # pylint: disable=broad-except
-                exceptions.Timeout,
-                ValueError,
-                Exception) as err:
-            current_app.logger.error(f'template_url {template_url}, svc:{auth_url}')
-            current_app.logger.error(f'Authorization connection failure for {identifier}, using svc:{auth_url}', err)
-            return False
+        roles = _get_roles(identifier, jwt)
+        if roles and all(elem.lower() in roles for elem in action):
+            return True
 
     return False
+
+
+def _get_roles(identifier: str, jwt: JwtManager) -> List[str]:
+    """Return the roles the auth service grants the user on the business, which are cached for a short time."""
+    subject = (getattr(g, 'jwt_oidc_token_info', None) or {}).get('sub')
+    if subject and (roles := authz_cache.get_roles(subject, identifier)) is not None:
+        return roles
+
+    template_url = current_app.config.get('AUTH_SVC_URL')
+    auth_url = template_url.format(identifier=identifier)
+
+    token = jwt.get_token_auth_header()
+    headers = {'Authorization': 'Bearer ' + token}
+    try:
+        rv = http_client.get(Upstream.AUTH, auth_url, headers=headers)
+
+        if rv.status_code == HTTPStatus.OK:
+            roles = rv.json().get('roles') or []
+        elif rv.status_code in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN, HTTPStatus.NOT_FOUND):
+            roles = []
+        else:
+            return []
+
+    except (exceptions.ConnectionError,  # pylint: disable=broad-except
+            exceptions.Timeout,
+            ValueError,
+            Exception) as err:
+        current_app.logger.error(f'template_url {template_url}, svc:{auth_url}')
+        current_app.logger.error(f'Authorization connection failure for {identifier}, using svc:{auth_url}', err)
+        return []
+
+    if subject:
+        authz_cache.set_roles(subject, identifier, roles)
+    return roles
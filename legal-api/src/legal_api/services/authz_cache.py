@@ -0,0 +1,106 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This caches the roles the auth service grants a user on a business.
+
+The roles are kept for a short time per token subject and business identifier, so the repeated
+checks of a session are answered without a call to the auth service. A denial is kept for a
+shorter time than a grant, and errors are not kept at all.
+The settings are read from the app config the first time the cache is used:
+- AUTHZ_CACHE_TIMEOUT, the seconds a grant is kept, 0 turns the cache off.
+- AUTHZ_CACHE_NEGATIVE_TIMEOUT, the seconds a denial is kept.
+- AUTHZ_CACHE_SIZE, the most entries kept.
+"""
+import threading
+import uuid
+from typing import List, Optional
+
+from flask import current_app
+
+from legal_api.utils.cache import LRUCache
+
+
+class AuthzCache():
+    """Cache of the roles of a token subject on a business identifier."""
+
+    def __init__(self):
+        """Create the cache, configured on first use."""
+        self._cache: Optional[LRUCache] = None
+        self._timeout = 0
+        self._negative_timeout = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get_roles(self, subject: str, identifier: str) -> Optional[List[str]]:
+        """Return the cached roles of the subject on the business, or None on a miss."""
+        if not (cache := self._get_cache()):
+            return None
+        roles = cache.get(self._key(cache, subject, identifier))
+        with self._lock:
+            if roles is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return roles
+
+    def set_roles(self, subject: str, identifier: str, roles: List[str]):
+        """Cache the roles of the subject on the business, an empty list being a denial."""
+        if not (cache := self._get_cache()):
+            return
+        cache.set(self._key(cache, subject, identifier), list(roles),
+                  timeout=self._timeout if roles else self._negative_timeout)
+
+    def invalidate(self, identifier: str = None, subject: str = None):
+        """Drop the cached roles on a business, or of a subject, e.g. when an affiliation changes."""
+        if not (cache := self._get_cache()):
+            return
+        if identifier:
+            cache.set(self._generation_key('identifier', identifier), uuid.uuid4().hex, timeout=self._timeout)
+        if subject:
+            cache.set(self._generation_key('subject', subject), uuid.uuid4().hex, timeout=self._timeout)
+
+    def clear(self):
+        """Drop all the cached roles."""
+        if self._cache:
+            self._cache.clear()
+
+    def metrics(self) -> dict:
+        """Return the hit and miss counts of the cache."""
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses}
+
+    def _get_cache(self) -> Optional[LRUCache]:
+        """Return the cache, or None when it is turned off."""
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    config = current_app.config
+                    self._timeout = int(config.get('AUTHZ_CACHE_TIMEOUT', 60))
+                    self._negative_timeout = min(int(config.get('AUTHZ_CACHE_NEGATIVE_TIMEOUT', 15)), self._timeout)
+                    self._cache = LRUCache(threshold=int(config.get('AUTHZ_CACHE_SIZE', 2000)),
+                                           default_timeout=self._timeout)
+        return self._cache if self._timeout > 0 else None
+
+    def _key(self, cache: LRUCache, subject: str, identifier: str) -> str:
+        """Return the key of the roles, which includes the generations of the subject and the business."""
+        subject_generation = cache.get(self._generation_key('subject', subject)) or ''
+        identifier_generation = cache.get(self._generation_key('identifier', identifier)) or ''
+        return f'{subject}.{subject_generation}.{identifier}.{identifier_generation}'
+
+    @staticmethod
+    def _generation_key(kind: str, value: str) -> str:
+        return f'generation.{kind}.{value}'
+
+
+authz_cache = AuthzCache()  # pylint: disable=invalid-name; shared variables are lower case by Flask convention.
@@ -20,13 +20,16 @@ import string
 from http import HTTPStatus
 from typing import Dict, Union
 
-import requests
 from flask import current_app
 from flask_babel import _ as babel  # noqa: N813, I001, I003 casting _ to babel
 from sqlalchemy.orm.exc import FlushError  # noqa: I001
 
 from legal_api.models import RegistrationBootstrap  # noqa: D204, I003, I001;# due to babel cast above
 
+from .authz_cache import authz_cache
+from .http_client import Upstream, http_client
+from .token_cache import token_cache
+
 
 class RegistrationBootstrapService:
     """Provides services to bootstrap the IA registration and account affiliation."""
@@ -88,39 +91,17 @@ class RegistrationBootstrapService:
 
 
 class AccountService:
-    """Wrapper to call Authentication Services.
-
-    @TODO Cache and refresh / retry token as needed to reduce calls.
-    """
+    """Wrapper to call Authentication Services."""
 
     BEARER: str = 'Bearer '
     CONTENT_TYPE_JSON = {'Content-Type': 'application/json'}
 
-    try:
-        timeout = int(current_app.config.get('ACCOUNT_SVC_TIMEOUT', 20))
-    except Exception:
-        timeout = 20
-
     @classmethod
     def get_bearer_token(cls):
         """Get a valid Bearer token for the service to use."""
-        token_url = current_app.config.get('ACCOUNT_SVC_AUTH_URL')
-        client_id = current_app.config.get('ACCOUNT_SVC_CLIENT_ID')
-        client_secret = current_app.config.get('ACCOUNT_SVC_CLIENT_SECRET')
-
-        data = 'grant_type=client_credentials'
-
-        # get service account token
-        res = requests.post(url=token_url,
-                            data=data,
-                            headers={'content-type': 'application/x-www-form-urlencoded'},
-                            auth=(client_id, client_secret),
-                            timeout=cls.timeout)
-
-        try:
-            return res.json().get('access_token')
-        except Exception:
-            return None
+        return token_cache.get_token(current_app.config.get('ACCOUNT_SVC_AUTH_URL'),
+                                     current_app.config.get('ACCOUNT_SVC_CLIENT_ID'),
+                                     current_app.config.get('ACCOUNT_SVC_CLIENT_SECRET'))
 
     @classmethod
     def create_affiliation(cls, account: int,
@@ -142,12 +123,12 @@ class AccountService:
                                   'corpTypeCode': corp_type_code,
                                   'name': business_name or business_registration
                                   })
-        entity_record = requests.post(
+        entity_record = http_client.post(
+            Upstream.ACCOUNT,
             url=account_svc_entity_url,
             headers={**cls.CONTENT_TYPE_JSON,
                      'Authorization': cls.BEARER + token},
-            data=entity_data,
-            timeout=cls.timeout
+            data=entity_data
         )
 
         # Create an account:business affiliation
@@ -155,13 +136,14 @@ class AccountService:
             'businessIdentifier': business_registration,
             'passCode': ''
         })
-        affiliate = requests.post(
+        affiliate = http_client.post(
+            Upstream.ACCOUNT,
             url=account_svc_affiliate_url,
             headers={**cls.CONTENT_TYPE_JSON,
                      'Authorization': cls.BEARER + token},
-            data=affiliate_data,
-            timeout=cls.timeout
+            data=affiliate_data
         )
+        authz_cache.invalidate(identifier=business_registration)
 
         # @TODO delete affiliation and entity record next sprint when affiliation service is updated
         if affiliate.status_code != HTTPStatus.CREATED or entity_record.status_code != HTTPStatus.CREATED:
@@ -187,12 +169,12 @@ class AccountService:
             'corpTypeCode': corp_type_code,
             'name': business_name
         })
-        entity_record = requests.patch(
+        entity_record = http_client.patch(
+            Upstream.ACCOUNT,
             url=account_svc_entity_url + '/' + business_registration,
             headers={**cls.CONTENT_TYPE_JSON,
                      'Authorization': cls.BEARER + token},
-            data=entity_data,
-            timeout=cls.timeout
+            data=entity_data
         )
 
         if entity_record.status_code != HTTPStatus.OK:
@@ -212,19 +194,20 @@ class AccountService:
         token = cls.get_bearer_token()
 
         # Delete an account:business affiliation
-        affiliate = requests.delete(
+        affiliate = http_client.delete(
+            Upstream.ACCOUNT,
             url=account_svc_affiliate_url + '/' + business_registration,
             headers={**cls.CONTENT_TYPE_JSON,
-                     'Authorization': cls.BEARER + token},
-            timeout=cls.timeout
+                     'Authorization': cls.BEARER + token}
         )
         # Delete an entity record
-        entity_record = requests.delete(
+        entity_record = http_client.delete(
+            Upstream.ACCOUNT,
             url=account_svc_entity_url + '/' + business_registration,
             headers={**cls.CONTENT_TYPE_JSON,
-                     'Authorization': cls.BEARER + token},
-            timeout=cls.timeout
+                     'Authorization': cls.BEARER + token}
         )
+        authz_cache.invalidate(identifier=business_registration)
 
         if affiliate.status_code != HTTPStatus.OK \
                 or entity_record.status_code not in (HTTPStatus.OK, HTTPStatus.NO_CONTENT):
@@ -14,6 +14,8 @@
 
 """This provides the service for getting business details as of a filing."""
 # pylint: disable=singleton-comparison ; pylint does not recognize sqlalchemy ==
+import copy
+from collections import defaultdict
 from datetime import datetime
 
 import pycountry
@@ -40,10 +42,41 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
 
     @staticmethod
     def get_revision(filing_id, business_id):
-        """Consolidates based on filing type upto the given transaction id of a filing."""
-        business = Business.find_by_internal_id(business_id)
+        """Consolidates based on filing type upto the given transaction id of a filing.
+
+        Completed filings never change, so the snapshot stored with the filing is used when there is one.
+        """
         filing = Filing.find_by_id(filing_id)
+        if snapshot := (filing.revision_json or {}).get('filing'):
+            revision_json = {'filing': copy.deepcopy(snapshot)}
+            revision_json['filing']['header'] = VersionedBusinessDetailsService.get_header_revision(filing)
+            return revision_json
+
+        business = Business.find_by_internal_id(business_id)
+        revision_json = VersionedBusinessDetailsService._get_filing_revision(filing, business)
+        revision_json['filing']['header'] = VersionedBusinessDetailsService.get_header_revision(filing)
 
+        return revision_json
+
+    @staticmethod
+    def save_revision_snapshot(filing: Filing):
+        """Store the rendered revisions of a completed filing with the filing.
+
+        The header is not part of the snapshot, as the comments, colin ids and correction links can still change.
+        """
+        business = Business.find_by_internal_id(filing.business_id)
+        filing_revision = VersionedBusinessDetailsService._get_filing_revision(filing, business)['filing']
+        filing_revision.pop('header', None)
+        filing.revision_json = {
+            **(filing.revision_json or {}),
+            'filing': filing_revision,
+            'companyDetails': VersionedBusinessDetailsService._get_company_details_revision(filing, business)
+        }
+        filing.save()
+
+    @staticmethod
+    def _get_filing_revision(filing, business) -> dict:
+        """Consolidates the filing, less the header, upto the transaction id of the filing."""
         revision_json = {}
         revision_json['filing'] = {}
         if filing.filing_type == 'incorporationApplication':
@@ -71,8 +104,6 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         if not revision_json['filing']:
             revision_json = filing.json
 
-        revision_json['filing']['header'] = VersionedBusinessDetailsService.get_header_revision(filing)
-
         return revision_json
 
     @staticmethod
@@ -187,9 +218,18 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     @staticmethod
     def get_company_details_revision(filing_id, business_id) -> dict:
         """Consolidates company details upto the given transaction id of a filing."""
-        company_profile_json = {}
-        business = Business.find_by_internal_id(business_id)
         filing = Filing.find_by_id(filing_id)
+        if snapshot := (filing.revision_json or {}).get('companyDetails'):
+            return copy.deepcopy(snapshot)
+
+        business = Business.find_by_internal_id(business_id)
+        return VersionedBusinessDetailsService._get_company_details_revision(filing, business)
+
+    @staticmethod
+    def _get_company_details_revision(filing, business) -> dict:
+        """Consolidates company details upto the transaction id of the filing."""
+        business_id = business.id
+        company_profile_json = {}
         company_profile_json['business'] = \
             VersionedBusinessDetailsService.get_business_revision(filing.transaction_id, business)
         company_profile_json['parties'] = \
@@ -208,12 +248,8 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     def get_business_revision(transaction_id, business) -> dict:
         """Consolidates the business info as of a particular transaction."""
         business_version = version_class(Business)
-        business_revision = db.session.query(business_version) \
-            .filter(business_version.transaction_id <= transaction_id) \
-            .filter(business_version.operation_type != 2) \
+        business_revision = VersionedBusinessDetailsService._query_as_of(business_version, transaction_id) \
             .filter(business_version.id == business.id) \
-            .filter(or_(business_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        business_version.end_transaction_id > transaction_id)) \
             .order_by(business_version.transaction_id).one_or_none()
         return VersionedBusinessDetailsService.business_revision_json(business_revision, business.json())
 
@@ -250,24 +286,20 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         address_version = version_class(Address)
         offices_version = version_class(Office)
 
-        offices = db.session.query(offices_version) \
-            .filter(offices_version.transaction_id <= transaction_id) \
-            .filter(offices_version.operation_type != 2) \
+        offices = VersionedBusinessDetailsService._query_as_of(offices_version, transaction_id) \
             .filter(offices_version.business_id == business_id) \
-            .filter(or_(offices_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        offices_version.end_transaction_id > transaction_id)) \
             .order_by(offices_version.transaction_id).all()
 
+        addresses = defaultdict(list)
+        if offices:
+            for address in VersionedBusinessDetailsService._query_as_of(address_version, transaction_id) \
+                    .filter(address_version.office_id.in_([office.id for office in offices])) \
+                    .order_by(address_version.transaction_id).all():
+                addresses[address.office_id].append(address)
+
         for office in offices:
             offices_json[office.office_type] = {}
-            addresses_list = db.session.query(address_version) \
-                .filter(address_version.transaction_id <= transaction_id) \
-                .filter(address_version.operation_type != 2) \
-                .filter(address_version.office_id == office.id) \
-                .filter(or_(address_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                            address_version.end_transaction_id > transaction_id)) \
-                .order_by(address_version.transaction_id).all()
-            for address in addresses_list:
+            for address in addresses[office.id]:
                 offices_json[office.office_type][f'{address.address_type}Address'] = \
                     VersionedBusinessDetailsService.address_revision_json(address)
 
@@ -277,25 +309,30 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     def get_party_role_revision(transaction_id, business_id, is_ia_or_after=False, role=None) -> dict:
         """Consolidates all party changes upto the given transaction id."""
         party_role_version = version_class(PartyRole)
-        party_roles = db.session.query(party_role_version)\
-            .filter(party_role_version.transaction_id <= transaction_id) \
-            .filter(party_role_version.operation_type != 2) \
+        party_roles = VersionedBusinessDetailsService._query_as_of(party_role_version, transaction_id) \
             .filter(party_role_version.business_id == business_id) \
             .filter(or_(role == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
                         party_role_version.role == role)) \
-            .filter(or_(party_role_version.end_transaction_id == None,   # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        party_role_version.end_transaction_id > transaction_id)) \
             .order_by(party_role_version.transaction_id).all()
+        party_roles = [party_role for party_role in party_roles if party_role.cessation_date is None]
+
+        party_revisions = VersionedBusinessDetailsService._get_party_revisions(
+            transaction_id, {party_role.party_id for party_role in party_roles})
+        address_revisions = VersionedBusinessDetailsService._get_address_revisions(
+            transaction_id,
+            {address_id for party in party_revisions.values()
+             for address_id in (party.delivery_address_id, party.mailing_address_id) if address_id})
+
         parties = []
         for party_role in party_roles:
-            if party_role.cessation_date is None:
-                party_role_json = VersionedBusinessDetailsService.party_role_revision_json(transaction_id,
-                                                                                           party_role, is_ia_or_after)
-                if 'roles' in party_role_json and (party := next((x for x in parties if x['officer']['id']
-                                                                  == party_role_json['officer']['id']), None)):
-                    party['roles'].extend(party_role_json['roles'])
-                else:
-                    parties.append(party_role_json)
+            party_role_json = VersionedBusinessDetailsService.party_role_revision_json(
+                transaction_id, party_role, is_ia_or_after,
+                party_revision=party_revisions.get(party_role.party_id), address_revisions=address_revisions)
+            if 'roles' in party_role_json and (party := next((x for x in parties if x['officer']['id']
+                                                              == party_role_json['officer']['id']), None)):
+                party['roles'].extend(party_role_json['roles'])
+            else:
+                parties.append(party_role_json)
 
         return parties
 
@@ -303,18 +340,17 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     def get_share_class_revision(transaction_id, business_id) -> dict:
         """Consolidates all share classes upto the given transaction id."""
         share_class_version = version_class(ShareClass)
-        share_classes_list = db.session.query(share_class_version) \
-            .filter(share_class_version.transaction_id <= transaction_id) \
-            .filter(share_class_version.operation_type != 2) \
+        share_classes_list = VersionedBusinessDetailsService._query_as_of(share_class_version, transaction_id) \
             .filter(share_class_version.business_id == business_id) \
-            .filter(or_(share_class_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        share_class_version.end_transaction_id > transaction_id)) \
             .order_by(share_class_version.transaction_id).all()
+
+        share_series = VersionedBusinessDetailsService._get_share_series_revisions(
+            transaction_id, [share_class.id for share_class in share_classes_list])
+
         share_classes = []
         for share_class in share_classes_list:
             share_class_json = VersionedBusinessDetailsService.share_class_revision_json(share_class)
-            share_class_json['series'] = VersionedBusinessDetailsService.get_share_series_revision(transaction_id,
-                                                                                                   share_class.id)
+            share_class_json['series'] = share_series[share_class.id]
             share_class_json['type'] = 'Class'
             share_class_json['id'] = str(share_class_json['id'])
             share_classes.append(share_class_json)
@@ -323,33 +359,35 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     @staticmethod
     def get_share_series_revision(transaction_id, share_class_id) -> dict:
         """Consolidates all share series under the share class upto the given transaction id."""
+        return VersionedBusinessDetailsService._get_share_series_revisions(transaction_id, [share_class_id])[
+            share_class_id]
+
+    @staticmethod
+    def _get_share_series_revisions(transaction_id, share_class_ids) -> dict:
+        """Consolidates the share series of all the share classes upto the given transaction id, by share class."""
         share_series_version = version_class(ShareSeries)
-        share_series_list = db.session.query(share_series_version) \
-            .filter(share_series_version.transaction_id <= transaction_id) \
-            .filter(share_series_version.operation_type != 2) \
-            .filter(share_series_version.share_class_id == share_class_id) \
-            .filter(or_(share_series_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        share_series_version.end_transaction_id > transaction_id)) \
+        share_series_by_class = defaultdict(list)
+        if not share_class_ids:
+            return share_series_by_class
+
+        share_series_list = VersionedBusinessDetailsService._query_as_of(share_series_version, transaction_id) \
+            .filter(share_series_version.share_class_id.in_(share_class_ids)) \
             .order_by(share_series_version.transaction_id).all()
-        share_series_arr = []
         for share_series in share_series_list:
             share_series_json = VersionedBusinessDetailsService.share_series_revision_json(share_series)
             share_series_json['type'] = 'Series'
             share_series_json['id'] = str(share_series_json['id'])
-            share_series_arr.append(share_series_json)
-        return share_series_arr
+            share_series_by_class[share_series.share_class_id].append(share_series_json)
+        return share_series_by_class
 
     @staticmethod
     def get_name_translations_revision(transaction_id, business_id) -> dict:
         """Consolidates all name translations upto the given transaction id."""
         name_translations_version = version_class(Alias)
-        name_translations_list = db.session.query(name_translations_version) \
-            .filter(name_translations_version.transaction_id <= transaction_id) \
-            .filter(name_translations_version.operation_type != 2) \
+        name_translations_list = VersionedBusinessDetailsService \
+            ._query_as_of(name_translations_version, transaction_id) \
             .filter(name_translations_version.business_id == business_id) \
             .filter(name_translations_version.type == 'TRANSLATION') \
-            .filter(or_(name_translations_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        name_translations_version.end_transaction_id > transaction_id)) \
             .order_by(name_translations_version.transaction_id).all()
         name_translations_arr = []
         for name_translation in name_translations_list:
@@ -377,13 +415,9 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     def get_resolution_dates_revision(transaction_id, business_id) -> dict:
         """Consolidates all resolutions upto the given transaction id."""
         resolution_version = version_class(Resolution)
-        resolution_list = db.session.query(resolution_version) \
-            .filter(resolution_version.transaction_id <= transaction_id) \
-            .filter(resolution_version.operation_type != 2) \
+        resolution_list = VersionedBusinessDetailsService._query_as_of(resolution_version, transaction_id) \
             .filter(resolution_version.business_id == business_id) \
             .filter(resolution_version.resolution_type == 'SPECIAL') \
-            .filter(or_(resolution_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        resolution_version.end_transaction_id > transaction_id)) \
             .order_by(resolution_version.transaction_id).all()
         resolutions_arr = []
         for resolution in resolution_list:
@@ -392,12 +426,18 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         return resolutions_arr
 
     @staticmethod
-    def party_role_revision_json(transaction_id, party_role_revision, is_ia_or_after) -> dict:
-        """Return the party member as a json object."""
+    def party_role_revision_json(transaction_id, party_role_revision, is_ia_or_after,
+                                 party_revision=None, address_revisions=None) -> dict:
+        """Return the party member as a json object.
+
+        The party and address revisions are looked up when they haven't been loaded by the caller.
+        """
         cessation_date = datetime.date(party_role_revision.cessation_date).isoformat()\
             if party_role_revision.cessation_date else None
-        party_revision = VersionedBusinessDetailsService.get_party_revision(transaction_id, party_role_revision)
-        party = VersionedBusinessDetailsService.party_revision_json(transaction_id, party_revision, is_ia_or_after)
+        if not party_revision:
+            party_revision = VersionedBusinessDetailsService.get_party_revision(transaction_id, party_role_revision)
+        party = VersionedBusinessDetailsService.party_revision_json(transaction_id, party_revision, is_ia_or_after,
+                                                                    address_revisions)
 
         if is_ia_or_after:
             party['roles'] = [{
@@ -419,15 +459,21 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     def get_party_revision(transaction_id, party_role_revision) -> dict:
         """Consolidates all party changes upto the given transaction id."""
         party_version = version_class(Party)
-        party = db.session.query(party_version) \
-            .filter(party_version.transaction_id <= transaction_id) \
-            .filter(party_version.operation_type != 2) \
+        party = VersionedBusinessDetailsService._query_as_of(party_version, transaction_id) \
             .filter(party_version.id == party_role_revision.party_id) \
-            .filter(or_(party_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        party_version.end_transaction_id > transaction_id)) \
             .order_by(party_version.transaction_id).one_or_none()
         return party
 
+    @staticmethod
+    def _get_party_revisions(transaction_id, party_ids) -> dict:
+        """Return the party revisions as of the given transaction id, by party id."""
+        if not party_ids:
+            return {}
+        party_version = version_class(Party)
+        parties = VersionedBusinessDetailsService._query_as_of(party_version, transaction_id) \
+            .filter(party_version.id.in_(party_ids)).all()
+        return {party.id: party for party in parties}
+
     @staticmethod
     def party_revision_type_json(party_revision, is_ia_or_after) -> dict:
         """Return the party member by type as a json object."""
@@ -455,12 +501,16 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         return member
 
     @staticmethod
-    def party_revision_json(transaction_id, party_revision, is_ia_or_after) -> dict:
+    def party_revision_json(transaction_id, party_revision, is_ia_or_after, address_revisions=None) -> dict:
         """Return the party member as a json object."""
+        def get_address_revision(address_id):
+            if address_revisions is not None:
+                return address_revisions.get(address_id)
+            return VersionedBusinessDetailsService.get_address_revision(transaction_id, address_id)
+
         member = VersionedBusinessDetailsService.party_revision_type_json(party_revision, is_ia_or_after)
         if party_revision.delivery_address_id:
-            address_revision = VersionedBusinessDetailsService.get_address_revision(
-                transaction_id, party_revision.delivery_address_id)
+            address_revision = get_address_revision(party_revision.delivery_address_id)
             # This condition can be removed once we correct data in address and address_version table
             # by removing empty address entry.
             if address_revision and address_revision.postal_code:
@@ -471,13 +521,12 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         if party_revision.mailing_address_id:
             member_mailing_address = \
                 VersionedBusinessDetailsService.address_revision_json(
-                    VersionedBusinessDetailsService.get_address_revision
-                    (transaction_id, party_revision.mailing_address_id))
+                    get_address_revision(party_revision.mailing_address_id))
             if 'addressType' in member_mailing_address:
                 del member_mailing_address['addressType']
             member['mailingAddress'] = member_mailing_address
         else:
-            if party_revision.delivery_address:
+            if party_revision.delivery_address_id and 'deliveryAddress' in member:
                 member['mailingAddress'] = member['deliveryAddress']
 
         if is_ia_or_after:
@@ -491,15 +540,30 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     def get_address_revision(transaction_id, address_id) -> dict:
         """Consolidates all party changes upto the given transaction id."""
         address_version = version_class(Address)
-        address = db.session.query(address_version) \
-            .filter(address_version.transaction_id <= transaction_id) \
-            .filter(address_version.operation_type != 2) \
+        address = VersionedBusinessDetailsService._query_as_of(address_version, transaction_id) \
             .filter(address_version.id == address_id) \
-            .filter(or_(address_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        address_version.end_transaction_id > transaction_id)) \
             .order_by(address_version.transaction_id).one_or_none()
         return address
 
+    @staticmethod
+    def _get_address_revisions(transaction_id, address_ids) -> dict:
+        """Return the address revisions as of the given transaction id, by address id."""
+        if not address_ids:
+            return {}
+        address_version = version_class(Address)
+        addresses = VersionedBusinessDetailsService._query_as_of(address_version, transaction_id) \
+            .filter(address_version.id.in_(address_ids)).all()
+        return {address.id: address for address in addresses}
+
+    @staticmethod
+    def _query_as_of(version, transaction_id):
+        """Return a query of the rows of a version class as they were at the given transaction id."""
+        return db.session.query(version) \
+            .filter(version.transaction_id <= transaction_id) \
+            .filter(version.operation_type != 2) \
+            .filter(or_(version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
+                        version.end_transaction_id > transaction_id))
+
     @staticmethod
     def address_revision_json(address_revision):
         """Return a dict of this object, with keys in JSON format."""
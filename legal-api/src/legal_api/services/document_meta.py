@@ -14,6 +14,8 @@
 
 """This provides the service for filings documents meta data."""
 from enum import Enum
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from legal_api.models import Business, Filing
 from legal_api.utils.legislation_datetime import LegislationDatetime
@@ -63,6 +65,16 @@ class DocumentMetaService():
                 return []  # business not found
             self._legal_type = business.legal_type
 
+        return self._get_documents(filing)
+
+    def get_documents_for_filings(self, filings: List[dict], business: Business) -> List[List[dict]]:
+        """Return the arrays of document meta for the filings of a business, in the order of the filings."""
+        self._business_identifier = business.identifier
+        self._legal_type = business.legal_type
+        return [self._get_documents(filing) for filing in filings]
+
+    def _get_documents(self, filing: dict):
+        """Return an array of document meta for a filing of the current business."""
         self._filing_status = filing['filing']['header']['status']
         is_paper_only = filing['filing']['header'].get('availableOnPaperOnly', False)
         is_colin_only = filing['filing']['header'].get('inColinOnly', False)
@@ -105,104 +117,27 @@ class DocumentMetaService():
 
     def get_ar_reports(self):
         """Return annual report meta object(s)."""
-        # whether PAID or COMPLETED, whether BCOMP or COOP, return just AR object
-        return [
-            self.create_report_object(
-                'Annual Report',
-                self.get_general_filename('Annual Report')
-            )
-        ]
+        return self.get_template_reports('annualReport')
 
     def get_coa_reports(self):
         """Return change of address meta object(s)."""
-        reports = [
-            self.create_report_object(
-                'Address Change',
-                self.get_general_filename('Address Change')
-            )
-        ]
-
-        # when BCOMP filing is completed, also return NOA
-        if self.is_bcomp() and self.is_completed():
-            reports.append(
-                self.create_report_object(
-                    DocumentMetaService.NOTICE_OF_ARTICLES,
-                    self.get_general_filename(DocumentMetaService.NOTICE_OF_ARTICLES),
-                    DocumentMetaService.ReportType.NOTICE_OF_ARTICLES.value
-                )
-            )
-
-        return reports
+        return self.get_template_reports('changeOfAddress')
 
     def get_cod_reports(self):
         """Return change of director meta object(s)."""
-        reports = [
-            self.create_report_object(
-                'Director Change',
-                self.get_general_filename('Director Change')
-            )
-        ]
-
-        # when BCOMP filing is completed, also return NOA
-        if self.is_bcomp() and self.is_completed():
-            reports.append(
-                self.create_report_object(
-                    DocumentMetaService.NOTICE_OF_ARTICLES,
-                    self.get_general_filename(DocumentMetaService.NOTICE_OF_ARTICLES),
-                    DocumentMetaService.ReportType.NOTICE_OF_ARTICLES.value
-                )
-            )
-
-        return reports
+        return self.get_template_reports('changeOfDirectors')
 
     def get_con_reports(self):
         """Return change of name object(s)."""
-        reports = [
-            self.create_report_object(
-                'Legal Name Change',
-                self.get_general_filename('Legal Name Change')
-            )
-        ]
-
-        # when BCOMP filing is completed, also return NOA
-        if self.is_bcomp() and self.is_completed():
-            reports.append(
-                self.create_report_object(
-                    DocumentMetaService.NOTICE_OF_ARTICLES,
-                    self.get_general_filename(DocumentMetaService.NOTICE_OF_ARTICLES),
-                    DocumentMetaService.ReportType.NOTICE_OF_ARTICLES.value
-                )
-            )
-
-        return reports
+        return self.get_template_reports('changeOfName')
 
     def get_special_resolution_reports(self):
         """Return special resolution meta object(s)."""
-        reports = []
-
-        if self.is_completed():
-            reports.append(
-                self.create_report_object(
-                    'Special Resolution',
-                    self.get_general_filename('Special Resolution')
-                )
-            )
-
-        return reports
+        return self.get_template_reports('specialResolution')
 
     def get_voluntary_dissolution_reports(self):
         """Return voluntary dissolution meta object(s)."""
-        reports = []
-
-        if self.is_completed():
-            reports.append(
-                self.create_report_object(
-                    'Voluntary Dissolution',
-                    self.get_general_filename('Voluntary Dissolution')
-                )
-            )
-
-        return reports
+        return self.get_template_reports('voluntaryDissolution')
 
     def get_correction_reports(self, filing: dict):
         """Return correction meta object(s)."""
@@ -238,35 +173,59 @@ class DocumentMetaService():
 
         return reports
 
-    def get_transition_reports(self):  # pylint: disable=no-self-use
+    def get_transition_reports(self):
         """Return transition meta object(s)."""
-        reports = []
+        return self.get_template_reports('transition')
 
-        if self.is_paid():
-            reports.append(
-                self.create_report_object(
-                    'Transition Application - Pending',
-                    self.get_general_filename('Transition Application (Pending)')
-                )
-            )
-        else:
-            reports.append(
-                self.create_report_object(
-                    'Transition Application',
-                    self.get_general_filename('Transition Application')
-                )
-            )
-
-        if self.is_completed():
-            reports.append(
-                self.create_report_object(
-                    DocumentMetaService.NOTICE_OF_ARTICLES,
-                    self.get_general_filename(DocumentMetaService.NOTICE_OF_ARTICLES),
-                    DocumentMetaService.ReportType.NOTICE_OF_ARTICLES.value
-                )
-            )
+    def get_template_reports(self, filing_type: str):
+        """Return the meta objects of a filing whose reports only depend on its type, legal type and status."""
+        return [
+            self.create_report_object(title, self.get_general_filename(name), report_type)
+            for title, name, report_type in DocumentMetaService.get_report_templates(filing_type,
+                                                                                     self._legal_type,
+                                                                                     self._filing_status)
+        ]
 
-        return reports
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_report_templates(filing_type: str, legal_type: str, status: str) -> Tuple[Tuple[str, str, Optional[str]]]:
+        """Return the (title, file name, report type) of the reports of a filing type.
+
+        The templates of each (filing type, legal type, status) are built once per process.
+        """
+        is_bcomp = legal_type == Business.LegalTypes.BCOMP.value
+        is_completed = status == Filing.Status.COMPLETED.value
+        noa = (DocumentMetaService.NOTICE_OF_ARTICLES,
+               DocumentMetaService.NOTICE_OF_ARTICLES,
+               DocumentMetaService.ReportType.NOTICE_OF_ARTICLES.value)
+
+        templates = []
+        if filing_type == 'annualReport':
+            # whether PAID or COMPLETED, whether BCOMP or COOP, return just AR object
+            templates.append(('Annual Report', 'Annual Report', None))
+        elif filing_type in ('changeOfAddress', 'changeOfDirectors', 'changeOfName'):
+            title = {
+                'changeOfAddress': 'Address Change',
+                'changeOfDirectors': 'Director Change',
+                'changeOfName': 'Legal Name Change'
+            }[filing_type]
+            templates.append((title, title, None))
+            # when BCOMP filing is completed, also return NOA
+            if is_bcomp and is_completed:
+                templates.append(noa)
+        elif filing_type in ('specialResolution', 'voluntaryDissolution'):
+            if is_completed:
+                title = 'Special Resolution' if filing_type == 'specialResolution' else 'Voluntary Dissolution'
+                templates.append((title, title, None))
+        elif filing_type == 'transition':
+            if status == Filing.Status.PAID.value:
+                templates.append(('Transition Application - Pending', 'Transition Application (Pending)', None))
+            else:
+                templates.append(('Transition Application', 'Transition Application', None))
+            if is_completed:
+                templates.append(noa)
+
+        return tuple(templates)
 
     def get_alteration_reports(self, filing: dict):  # pylint: disable=no-self-use
         """Return alteration meta object(s)."""
@@ -0,0 +1,145 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This provides the pooled HTTP client used for all the calls to the upstream services.
+
+Each upstream gets its own requests Session, so that its connections are kept alive and reused,
+with a default timeout, a retry policy for the idempotent methods and latency metrics.
+The settings are read from the app config the first time an upstream is used:
+- HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT, HTTP_RETRIES and HTTP_BACKOFF_FACTOR for all upstreams.
+- <UPSTREAM>_SVC_TIMEOUT to override the read timeout of an upstream, e.g. ACCOUNT_SVC_TIMEOUT.
+"""
+import threading
+import time
+from enum import Enum
+from typing import Dict
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class Upstream(str, Enum):
+    """Render an Enum of the upstream services."""
+
+    ACCOUNT = 'account'
+    AUTH = 'auth'
+    COLIN = 'colin'
+    LEGAL = 'legal'
+    NAMEX = 'namex'
+    NOTIFY = 'notify'
+    PAY = 'pay'
+    REPORT = 'report'
+    SSO = 'sso'
+
+
+class HttpClient():
+    """Pooled, keep-alive HTTP sessions for the upstream services."""
+
+    RETRY_STATUSES = (500, 502, 503, 504)
+    IDEMPOTENT_METHODS = frozenset(['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT'])
+
+    def __init__(self):
+        """Create the client, the sessions are created on first use."""
+        self._sessions: Dict[Upstream, requests.Session] = {}
+        self._timeouts: Dict[Upstream, tuple] = {}
+        self._metrics: Dict[Upstream, dict] = {}
+        self._lock = threading.Lock()
+
+    def session(self, upstream: Upstream) -> requests.Session:
+        """Return the session of an upstream."""
+        if not (session := self._sessions.get(upstream)):
+            with self._lock:
+                if not (session := self._sessions.get(upstream)):
+                    session = self._create_session(upstream)
+                    self._sessions[upstream] = session
+        return session
+
+    def request(self, upstream: Upstream, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request to an upstream, with the upstream timeout unless one is given."""
+        session = self.session(upstream)
+        kwargs.setdefault('timeout', self._timeouts[upstream])
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = getattr(session, method.lower())(url, **kwargs)
+            failed = response.status_code >= 500
+            return response
+        finally:
+            self._record(upstream, time.perf_counter() - start, failed)
+
+    def get(self, upstream: Upstream, url: str, **kwargs) -> requests.Response:
+        """Send a GET request to an upstream."""
+        return self.request(upstream, 'GET', url, **kwargs)
+
+    def post(self, upstream: Upstream, url: str, **kwargs) -> requests.Response:
+        """Send a POST request to an upstream."""
+        return self.request(upstream, 'POST', url, **kwargs)
+
+    def put(self, upstream: Upstream, url: str, **kwargs) -> requests.Response:
+        """Send a PUT request to an upstream."""
+        return self.request(upstream, 'PUT', url, **kwargs)
+
+    def patch(self, upstream: Upstream, url: str, **kwargs) -> requests.Response:
+        """Send a PATCH request to an upstream."""
+        return self.request(upstream, 'PATCH', url, **kwargs)
+
+    def delete(self, upstream: Upstream, url: str, **kwargs) -> requests.Response:
+        """Send a DELETE request to an upstream."""
+        return self.request(upstream, 'DELETE', url, **kwargs)
+
+    def metrics(self) -> dict:
+        """Return the request count, failure count and latency of each upstream used so far."""
+        with self._lock:
+            return {
+                upstream.value: {
+                    'requests': metric['requests'],
+                    'failures': metric['failures'],
+                    'averageSeconds': round(metric['seconds'] / metric['requests'], 4),
+                    'maxSeconds': round(metric['maxSeconds'], 4)
+                }
+                for upstream, metric in self._metrics.items() if metric['requests']
+            }
+
+    def _create_session(self, upstream: Upstream) -> requests.Session:
+        """Create the session of an upstream from the app config."""
+        config = current_app.config
+        pool_size = int(config.get('HTTP_POOL_SIZE', 10))
+        retries = Retry(total=int(config.get('HTTP_RETRIES', 3)),
+                        backoff_factor=float(config.get('HTTP_BACKOFF_FACTOR', 0.1)),
+                        status_forcelist=HttpClient.RETRY_STATUSES,
+                        allowed_methods=HttpClient.IDEMPOTENT_METHODS,
+                        raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        read_timeout = config.get(f'{upstream.name}_SVC_TIMEOUT') or config.get('HTTP_TIMEOUT', 20)
+        self._timeouts[upstream] = (float(config.get('HTTP_CONNECT_TIMEOUT', 5)), float(read_timeout))
+        self._metrics[upstream] = {'requests': 0, 'failures': 0, 'seconds': 0.0, 'maxSeconds': 0.0}
+        return session
+
+    def _record(self, upstream: Upstream, seconds: float, failed: bool):
+        """Add a request to the metrics of an upstream."""
+        with self._lock:
+            metric = self._metrics[upstream]
+            metric['requests'] += 1
+            metric['failures'] += int(failed)
+            metric['seconds'] += seconds
+            metric['maxSeconds'] = max(metric['maxSeconds'], seconds)
+
+
+http_client = HttpClient()  # pylint: disable=invalid-name; shared variables are lower case by Flask convention.
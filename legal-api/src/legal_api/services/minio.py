@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """This module is a wrapper for Minio."""
+import io
 import uuid
 from datetime import timedelta
 
@@ -70,6 +71,13 @@ class MinioService:
         minio_client: Minio = MinioService._get_client()
         return minio_client.get_object(current_app.config['MINIO_BUCKET_LEAR'], key)
 
+    @staticmethod
+    def put_file(key: str, data: bytes, content_type: str = 'application/octet-stream'):
+        """Store a file in Minio."""
+        minio_client: Minio = MinioService._get_client()
+        minio_client.put_object(current_app.config['MINIO_BUCKET_LEAR'], key, io.BytesIO(data), len(data),
+                                content_type=content_type)
+
     @staticmethod
     def delete_file(key: str):
         """Delete file from Minio."""
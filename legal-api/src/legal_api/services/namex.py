@@ -12,9 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""This provides the service for namex-api calls."""
+"""This provides the service for namex-api calls.
+
+The name requests found are cached for a time that depends on their state, see NAMEX_CACHE_TIMEOUT and
+NAMEX_CACHE_FINAL_TIMEOUT, and are dropped when they are updated through this service. The cache keeps the
+status and json of a name request, and each caller gets a response of its own.
+"""
+import json
+import threading
 from datetime import datetime
 from enum import Enum
+from http import HTTPStatus
+from typing import Optional
 
 import datedelta
 import pytz
@@ -22,6 +31,9 @@ import requests
 from flask import current_app
 
 from ..models import Filing
+from ..utils.cache import LRUCache
+from .http_client import Upstream, http_client
+from .token_cache import token_cache
 from .utils import get_str
 
 
@@ -30,6 +42,9 @@ class NameXService():
 
     DATE_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
 
+    _cache: Optional[LRUCache] = None
+    _cache_lock = threading.Lock()
+
     class State(Enum):
         """Name request states."""
 
@@ -37,6 +52,7 @@ class NameXService():
         CANCELLED = 'CANCELLED'
         COMPLETED = 'COMPLETED'
         CONDITIONAL = 'CONDITIONAL'
+        CONSUMED = 'CONSUMED'
         DRAFT = 'DRAFT'
         EXPIRED = 'EXPIRED'
         HISTORICAL = 'HISTORICAL'
@@ -48,55 +64,112 @@ class NameXService():
     @staticmethod
     def query_nr_number(identifier: str):
         """Return a JSON object with name request information."""
-        auth_url = current_app.config.get('NAMEX_AUTH_SVC_URL')
-        username = current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME')
-        secret = current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET')
-        namex_url = current_app.config.get('NAMEX_SVC_URL')
+        if (cached := NameXService._get_cache().get(NameXService._cache_key(identifier))) is not None:
+            return NameXService._response(cached['status_code'], cached['json'])
 
-        # Get access token for namex-api in a different keycloak realm
-        auth = requests.post(auth_url, auth=(username, secret), headers={
-            'Content-Type': 'application/x-www-form-urlencoded'}, data={'grant_type': 'client_credentials'})
+        nr_response = NameXService._get_nr(identifier)
+        NameXService._cache_nr(identifier, nr_response)
+        return nr_response
 
-        # Return the auth response if an error occurs
-        if auth.status_code != 200:
-            return auth.json()
+    @staticmethod
+    def _get_nr(identifier: str):
+        """Return the name request response of namex-api."""
+        namex_url = current_app.config.get('NAMEX_SVC_URL')
 
-        token = dict(auth.json())['access_token']
+        # Get access token for namex-api in a different keycloak realm
+        if not (token := NameXService.get_bearer_token()):
+            return {'message': 'Unable to get a token for the NameX service.'}
 
         # Perform proxy call using the inputted identifier (e.g. NR 1234567)
-        nr_response = requests.get(namex_url + 'requests/' + identifier, headers={
+        nr_response = http_client.get(Upstream.NAMEX, namex_url + 'requests/' + identifier, headers={
             'Content-Type': 'application/json',
             'Authorization': 'Bearer ' + token
         })
+        NameXService._check_token(nr_response)
 
         return nr_response
 
     @staticmethod
     def update_nr(nr_json):
         """Update name request with nr_json."""
-        auth_url = current_app.config.get('NAMEX_AUTH_SVC_URL')
-        username = current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME')
-        secret = current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET')
         namex_url = current_app.config.get('NAMEX_SVC_URL')
 
         # Get access token for namex-api in a different keycloak realm
-        auth = requests.post(auth_url, auth=(username, secret), headers={
-            'Content-Type': 'application/x-www-form-urlencoded'}, data={'grant_type': 'client_credentials'})
-
-        # Return the auth response if an error occurs
-        if auth.status_code != 200:
-            return auth.json()
-
-        token = dict(auth.json())['access_token']
+        if not (token := NameXService.get_bearer_token()):
+            return {'message': 'Unable to get a token for the NameX service.'}
 
         # Perform update proxy call using nr number (e.g. NR 1234567)
-        nr_response = requests.put(namex_url + 'requests/' + nr_json['nrNum'], headers={
+        nr_response = http_client.put(Upstream.NAMEX, namex_url + 'requests/' + nr_json['nrNum'], headers={
             'Content-Type': 'application/json',
             'Authorization': 'Bearer ' + token
         }, json=nr_json)
+        NameXService._check_token(nr_response)
+        NameXService._get_cache().delete(NameXService._cache_key(nr_json['nrNum']))
+
+        return nr_response
 
+    @staticmethod
+    def get_bearer_token():
+        """Get a valid Bearer token for the namex-api, from the NameX keycloak realm."""
+        return token_cache.get_token(current_app.config.get('NAMEX_AUTH_SVC_URL'),
+                                     current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME'),
+                                     current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET'))
+
+    @staticmethod
+    def _get_cache() -> LRUCache:
+        """Return the cache of the name request responses, created from the app config."""
+        if NameXService._cache is None:
+            with NameXService._cache_lock:
+                if NameXService._cache is None:
+                    config = current_app.config
+                    NameXService._cache = LRUCache(threshold=int(config.get('NAMEX_CACHE_SIZE', 500)),
+                                                   default_timeout=int(config.get('NAMEX_CACHE_TIMEOUT', 60)))
+        return NameXService._cache
+
+    @staticmethod
+    def _cache_key(identifier: str) -> str:
+        return ' '.join(identifier.upper().split())
+
+    @staticmethod
+    def _cache_nr(identifier: str, nr_response):
+        """Cache a name request that namex-api found, the ones that can't change anymore for longer."""
+        if getattr(nr_response, 'status_code', None) != HTTPStatus.OK:
+            return
+        try:
+            nr_json = nr_response.json()
+        except ValueError:
+            return
+        final_states = (NameXService.State.CANCELLED.value,
+                        NameXService.State.CONSUMED.value,
+                        NameXService.State.EXPIRED.value,
+                        NameXService.State.HISTORICAL.value,
+                        NameXService.State.REJECTED.value)
+        is_consumed = any(name.get('consumptionDate') for name in nr_json.get('names') or [])
+        if is_consumed or nr_json.get('state') in final_states:
+            timeout = int(current_app.config.get('NAMEX_CACHE_FINAL_TIMEOUT', 3600))
+        else:
+            timeout = int(current_app.config.get('NAMEX_CACHE_TIMEOUT', 60))
+        if timeout > 0:
+            NameXService._get_cache().set(NameXService._cache_key(identifier),
+                                          {'status_code': nr_response.status_code, 'json': nr_json},
+                                          timeout=timeout)
+
+    @staticmethod
+    def _response(status_code: int, nr_json: dict) -> requests.Response:
+        """Return a response of a cached name request, a new one for each caller."""
+        nr_response = requests.Response()
+        nr_response.status_code = status_code
+        nr_response.headers['Content-Type'] = 'application/json'
+        nr_response._content = json.dumps(nr_json).encode('utf-8')  # pylint: disable=protected-access
         return nr_response
 
+    @staticmethod
+    def _check_token(nr_response):
+        """Drop the cached token when namex-api rejected it, so that the next call gets a new one."""
+        if nr_response.status_code == HTTPStatus.UNAUTHORIZED:
+            token_cache.invalidate(current_app.config.get('NAMEX_AUTH_SVC_URL'),
+                                   current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME'))
+
     @staticmethod
     def update_nr_as_future_effective(nr_json, future_effective_date: datetime):
         """Set expiration date of a name request to the future effective date and update the name request."""
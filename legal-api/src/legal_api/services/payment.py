@@ -0,0 +1,143 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This provides the payment details of the filings from the pay-api.
+
+The details of many filings are fetched at once, concurrently, by a bounded pool of threads. A payment
+token that is already being fetched, e.g. by another request, is not fetched a second time.
+The details are kept with the status and the payment completion date of the filing, which the payment
+queue sets once the payment is made, so they are fetched again when either changes. Nothing on the filing
+changes while a payment is in progress, so PAYMENT_DETAILS_CACHE_TIMEOUT is short. A token the pay-api
+fails to answer for is left out of the result, so the caller can carry on without it.
+The settings are read from the app config the first time the service is used:
+- PAYMENT_DETAILS_MAX_WORKERS, the most calls made to the pay-api at once.
+- PAYMENT_DETAILS_CACHE_TIMEOUT and PAYMENT_DETAILS_CACHE_SIZE, to keep the details.
+- PAY_SVC_TIMEOUT, the read timeout of each call.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from http import HTTPStatus
+from typing import Dict, Iterable, Optional
+
+from flask import Flask, current_app
+from requests import exceptions
+
+from legal_api.models import Filing
+from legal_api.utils.cache import LRUCache
+
+from .http_client import Upstream, http_client
+
+
+class PaymentService():
+    """Payment details of the filings, from the pay-api."""
+
+    def __init__(self):
+        """Create the service, configured on first use."""
+        self._cache: Optional[LRUCache] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.RLock()  # a done callback can run in the thread holding it
+
+    def get_payment_details(self, filings: Iterable[Filing], jwt_token: str) -> Dict[str, dict]:
+        """Return the isPaymentActionRequired and paymentMethod of the filings, by payment token.
+
+        Only the filings with a payment token are looked up, and the ones the pay-api didn't answer for are left out.
+        """
+        self._configure()
+        details = {}
+        futures = {}
+        states = {str(filing.payment_token): PaymentService._get_state(filing)
+                  for filing in filings if filing.payment_token}
+        for payment_token, state in states.items():
+            cached = self._cache.get(payment_token)
+            if cached is not None and cached['state'] == state:
+                details[payment_token] = cached['details']
+            else:
+                futures[self._submit(payment_token, state, jwt_token)] = payment_token
+
+        for future in as_completed(futures):
+            if (result := future.result()) is not None:
+                details[futures[future]] = result
+        return details
+
+    def invalidate(self, payment_token: str):
+        """Drop the cached payment details of a payment token."""
+        if self._cache:
+            self._cache.delete(str(payment_token))
+
+    def clear(self):
+        """Drop all the cached payment details."""
+        if self._cache:
+            self._cache.clear()
+
+    @staticmethod
+    def _get_state(filing: Filing) -> str:
+        """Return what the cached payment details of a filing are valid for."""
+        completion_date = filing.payment_completion_date.isoformat() if filing.payment_completion_date else None
+        return f'{filing.status}/{completion_date}'
+
+    def _submit(self, payment_token: str, state: str, jwt_token: str) -> Future:
+        """Return the future of the payment details, joining the fetch of the token that is in flight, if any."""
+        with self._lock:
+            if (future := self._in_flight.get(payment_token)) is None:
+                app = current_app._get_current_object()  # pylint: disable=protected-access; for the pool threads
+                future = self._executor.submit(self._load, app, payment_token, state, jwt_token)
+                self._in_flight[payment_token] = future
+                future.add_done_callback(lambda _: self._done(payment_token))
+            return future
+
+    def _load(self, app: Flask, payment_token: str, state: str, jwt_token: str) -> Optional[dict]:
+        """Fetch the payment details, and cache them before the callers waiting on them are released."""
+        if (details := PaymentService._fetch(app, payment_token, jwt_token)) is not None:
+            self._cache.set(payment_token, {'state': state, 'details': details})
+        return details
+
+    def _done(self, payment_token: str):
+        with self._lock:
+            self._in_flight.pop(payment_token, None)
+
+    def _configure(self):
+        """Create the cache and the thread pool from the app config."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    config = current_app.config
+                    self._cache = LRUCache(threshold=int(config.get('PAYMENT_DETAILS_CACHE_SIZE', 1000)),
+                                           default_timeout=int(config.get('PAYMENT_DETAILS_CACHE_TIMEOUT', 30)))
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=int(config.get('PAYMENT_DETAILS_MAX_WORKERS', 5)),
+                        thread_name_prefix='payment-details')
+
+    @staticmethod
+    def _fetch(app: Flask, payment_token: str, jwt_token: str) -> Optional[dict]:
+        """Get the payment details of a payment token, or None if the pay-api failed to give them."""
+        with app.app_context():
+            try:
+                pay_response = http_client.get(
+                    Upstream.PAY,
+                    url=f'{app.config.get("PAYMENT_SVC_URL")}/{payment_token}',
+                    headers={
+                        'Authorization': f'Bearer {jwt_token}',
+                        'Content-Type': 'application/json'
+                    }
+                )
+                if pay_response.status_code != HTTPStatus.OK:
+                    app.logger.warning(f'Payment details of {payment_token} not found: {pay_response.status_code}')
+                    return None
+                return {
+                    'isPaymentActionRequired': pay_response.json().get('isPaymentActionRequired', False),
+                    'paymentMethod': pay_response.json().get('paymentMethod', '')
+                }
+            except (exceptions.RequestException, ValueError) as err:
+                app.logger.error(f'Payment connection failure for the payment details of {payment_token}: {err}')
+                return None
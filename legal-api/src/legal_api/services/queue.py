@@ -12,15 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""This provides the service to publish to the queue."""
+"""This provides the service to publish to the queue.
+
+The NATS and STAN connections are shared by the whole process and kept open between requests. The Flask
+request threads hand their messages to an event loop running in a background thread, so publishing costs
+the round trip of the STAN acknowledgement rather than a connection handshake. The messages published at
+the same time are written to the connection together, and the acknowledgement of each one is returned as
+a future. A connection that was lost is opened again on the next publish.
+A message is only sent again when the connection was closed before it was sent, since a message the server
+may have taken, e.g. one whose acknowledgement timed out, would otherwise reach the filer twice.
+"""
 import asyncio
+import atexit
+import concurrent.futures
 import json
 import logging
 import random
 import string
+import threading
 
-from flask import _app_ctx_stack
 from nats.aio.client import Client as NATS, DEFAULT_CONNECT_TIMEOUT  # noqa N814; by convention the name is NATS
+from nats.aio.errors import ErrConnectionClosed
 from stan.aio.client import Client as STAN  # noqa N814; by convention the name is STAN
 
 
@@ -39,9 +51,15 @@ class QueueService():
         self.loop = loop
         self.nats_servers = None
         self.subject = None
+        self.publish_timeout = 10
 
         self.logger = logging.getLogger()
 
+        self._nats = None
+        self._stan = None
+        self._connect_lock = None
+        self._loop_lock = threading.Lock()
+
         if app is not None:
             self.init_app(app, self.loop)
 
@@ -53,13 +71,13 @@ class QueueService():
         :return: naked
         """
         self.name = app.config.get('NATS_CLIENT_NAME')
-        self.loop = loop or asyncio.get_event_loop()
+        self.loop = loop
         self.nats_servers = app.config.get('NATS_SERVERS').split(',')
         self.subject = app.config.get('NATS_FILER_SUBJECT')
+        self.publish_timeout = float(app.config.get('NATS_PUBLISH_TIMEOUT', 10))
 
         default_nats_options = {
             'name': self.name,
-            'io_loop': self.loop,
             'servers': self.nats_servers,
             'connect_timeout': app.config.get('NATS_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
 
@@ -88,28 +106,35 @@ class QueueService():
 
         self.stan_options = {**default_stan_options, **stan_options}
 
-        app.teardown_appcontext(self.teardown)
+        atexit.register(self.shutdown)
 
     def teardown(self, exception):  # pylint: disable=unused-argument; flask method signature
-        """Destroy all objects created by this extension."""
-        try:
-            this_loop = asyncio.get_event_loop()
-            this_loop.run_until_complete(self.close())
-        except RuntimeError as e:
-            self.logger.error(e)
+        """Leave the connections open, they are shared by the requests of the process."""
+
+    def shutdown(self):
+        """Close the connections and stop the publishing loop."""
+        if self.loop and self.loop.is_running() and self.loop is not asyncio.get_event_loop():
+            try:
+                asyncio.run_coroutine_threadsafe(self.close(), self.loop).result(self.publish_timeout)
+            except Exception as err:  # pylint: disable=broad-except; the process is ending
+                self.logger.warning('Error closing the queue connections: %s', err)
+            self.loop.call_soon_threadsafe(self.loop.stop)
 
     async def connect(self):
-        """Connect to the queueing service."""
-        ctx = _app_ctx_stack.top
-        if ctx:
-            if not hasattr(ctx, 'nats'):
-                ctx.nats = NATS()
-                ctx.stan = STAN()
-
-            if not ctx.nats.is_connected:
-                self.stan_options = {**self.stan_options, **{'nats': ctx.nats}}
-                await ctx.nats.connect(**self.nats_options)
-                await ctx.stan.connect(**self.stan_options)
+        """Connect to the queueing service, unless already connected."""
+        if not self.nats_servers or (self.is_connected and self._stan):
+            return
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.is_connected and self._stan:
+                return
+            await self._discard()
+            nats = NATS()
+            stan = STAN()
+            await nats.connect(**{**self.nats_options, 'io_loop': asyncio.get_event_loop()})
+            await stan.connect(**{**self.stan_options, 'nats': nats})
+            self._nats, self._stan = nats, stan
 
     async def close(self):
         """Close the connections to the queue."""
@@ -117,14 +142,24 @@ class QueueService():
             await self.stan.close()
             await self.nats.close()
 
-    def publish_json(self, payload=None):
-        """Publish the json payload to the Queue Service."""
+    def publish_json(self, payload=None, subject=None):
+        """Publish the json payload to the Queue Service, and wait for it to be acknowledged.
+
+        A publish that isn't acknowledged in time is cancelled, so that it isn't sent once the caller has failed.
+        """
+        future = self.publish_json_async(payload, subject)
         try:
-            self.loop.run_until_complete(self.async_publish_json(payload, self.subject))
+            future.result(self.publish_timeout)
         except Exception as err:
+            future.cancel()
             self.logger.error('Error: %s', err)
             raise err
 
+    def publish_json_async(self, payload=None, subject=None) -> concurrent.futures.Future:
+        """Publish the json payload to the Queue Service, returning the future of its acknowledgement."""
+        return asyncio.run_coroutine_threadsafe(self.async_publish_json(payload, subject or self.subject),
+                                                self._get_loop())
+
     async def publish_json_to_subject(self, payload=None, subject=None):
         """Publish the json payload to the specified subject."""
         try:
@@ -134,12 +169,20 @@ class QueueService():
             raise err
 
     async def async_publish_json(self, payload=None, subject=None):
-        """Publish the json payload to the Queue Service."""
-        if not self.is_connected:
-            await self.connect()
+        """Publish the json payload to the Queue Service, connecting again once if the connection was closed.
 
-        await self.stan.publish(subject=subject,
-                                payload=json.dumps(payload).encode('utf-8'))
+        Any other error, an acknowledgement timeout included, is raised, as the message may have been sent.
+        """
+        data = json.dumps(payload).encode('utf-8')
+        await self.connect()
+        try:
+            await self.stan.publish(subject=subject or self.subject, payload=data)
+        except ErrConnectionClosed as err:
+            # a closed connection refuses the message before sending it, so it can be sent on a new one
+            self.logger.warning('Publish refused by a closed connection, connecting again: %s', err)
+            await self._discard()
+            await self.connect()
+            await self.stan.publish(subject=subject or self.subject, payload=data)
 
     async def on_error(self, e):
         """Handle errors raised by the client library."""
@@ -174,19 +217,31 @@ class QueueService():
     @property
     def stan(self):
         """Return the STAN client for the Queue Service."""
-        ctx = _app_ctx_stack.top
-        if ctx:
-            if not hasattr(ctx, 'stan'):
-                return None
-            return ctx.stan
-        return None
+        return self._stan
 
     @property
     def nats(self):
         """Return the NATS client for the Queue Service."""
-        ctx = _app_ctx_stack.top
-        if ctx:
-            if not hasattr(ctx, 'nats'):
-                return None
-            return ctx.nats
-        return None
+        return self._nats
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the publishing loop, started in a background thread on first use."""
+        if not (self.loop and self.loop.is_running()):
+            with self._loop_lock:
+                if not (self.loop and self.loop.is_running()):
+                    self.loop = asyncio.new_event_loop()
+                    self._connect_lock = None
+                    started = threading.Event()
+                    self.loop.call_soon(started.set)
+                    threading.Thread(target=self.loop.run_forever, name='queue-publisher', daemon=True).start()
+                    started.wait()
+        return self.loop
+
+    async def _discard(self):
+        """Drop the clients of a lost connection."""
+        nats, self._nats, self._stan = self._nats, None, None
+        if nats and not nats.is_closed:
+            try:
+                await nats.close()
+            except Exception as err:  # pylint: disable=broad-except; the connection is already lost
+                self.logger.warning('Error closing NATS: %s', err)
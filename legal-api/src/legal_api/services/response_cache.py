@@ -0,0 +1,120 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This caches the rendered responses of completed filings.
+
+A completed filing is immutable, but its json and pdf are rebuilt from the versioned tables and the
+report service. The rendered responses are kept in a cachelib backend:
+- memory: an LRU cache in each process, the default. It is bounded in bytes, as it holds up to
+  RESPONSE_CACHE_SIZE responses of up to RESPONSE_CACHE_MAX_ITEM_SIZE bytes each, and it leaves out the PDFs,
+  which the rendered PDF store already keeps.
+- redis: a cache shared by all the processes, needs the redis package.
+- none: no caching.
+"""
+import uuid
+from typing import Optional
+
+from cachelib import BaseCache, NullCache
+from flask import Flask, Response, current_app, make_response
+
+from legal_api.utils.cache import LRUCache
+
+
+class ResponseCache():
+    """Cache of the rendered filing responses."""
+
+    def __init__(self, app: Flask = None):
+        """Create the cache, configured by init_app."""
+        self.cache: BaseCache = NullCache()
+        self.timeout = 0
+        self.max_item_size: Optional[int] = None
+        self.cache_pdfs = True
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        """Configure the cache backend from the app config."""
+        backend = app.config.get('RESPONSE_CACHE_TYPE', 'memory')
+        self.timeout = app.config.get('RESPONSE_CACHE_TIMEOUT', 0)
+        self.max_item_size = None
+        self.cache_pdfs = True
+        if backend == 'memory':
+            self.cache = LRUCache(threshold=app.config.get('RESPONSE_CACHE_SIZE', 500),
+                                  default_timeout=self.timeout)
+            self.max_item_size = app.config.get('RESPONSE_CACHE_MAX_ITEM_SIZE', 64 * 1024)
+            self.cache_pdfs = False
+        elif backend == 'redis':
+            from cachelib import RedisCache  # pylint: disable=import-outside-toplevel; only needed for redis
+            self.cache = RedisCache(host=app.config.get('RESPONSE_CACHE_REDIS_HOST'),
+                                    port=app.config.get('RESPONSE_CACHE_REDIS_PORT', 6379),
+                                    default_timeout=self.timeout,
+                                    key_prefix='legal_api.response.')
+        else:
+            self.cache = NullCache()
+
+    def get_filing_response(self,  # pylint: disable=too-many-arguments
+                            filing_id: int,
+                            status: str,
+                            representation: str,
+                            report_type: str = None,
+                            version: str = None) -> Optional[Response]:
+        """Return the cached response of a filing, if any.
+
+        The representation is json, original or pdf, and the version is anything else the
+        response depends on, such as its ETag.
+        """
+        try:
+            if cached := self.cache.get(self._key(filing_id, status, representation, report_type, version)):
+                return current_app.response_class(cached['data'], mimetype=cached['mimetype'])
+        except Exception as err:  # pylint: disable=broad-except; a cache failure is only a cache miss
+            current_app.logger.warning(f'Unable to read the cached response of filing {filing_id}: {err}')
+        return None
+
+    def set_filing_response(self,  # pylint: disable=too-many-arguments
+                            filing_id: int,
+                            status: str,
+                            representation: str,
+                            report_type: str,
+                            version: str,
+                            rv) -> Response:
+        """Cache a successful filing response, and return it as a response object.
+
+        The responses over the item size, and the PDFs when they are not cached, are returned as they are.
+        """
+        response = make_response(rv)
+        if response.status_code == 200 and not response.is_streamed and \
+                (self.cache_pdfs or representation != 'pdf') and \
+                (self.max_item_size is None or len(response.get_data()) <= self.max_item_size):
+            try:
+                self.cache.set(self._key(filing_id, status, representation, report_type, version),
+                               {'data': response.get_data(), 'mimetype': response.mimetype})
+            except Exception as err:  # pylint: disable=broad-except; the response is still good
+                current_app.logger.warning(f'Unable to cache the response of filing {filing_id}: {err}')
+        return response
+
+    def invalidate_filing(self, filing_id: int):
+        """Drop all the cached responses of a filing."""
+        try:
+            self.cache.set(self._generation_key(filing_id), uuid.uuid4().hex, timeout=self.timeout)
+        except Exception as err:  # pylint: disable=broad-except; nothing was cached then
+            current_app.logger.warning(f'Unable to invalidate the cached responses of filing {filing_id}: {err}')
+
+    def _key(self,  # pylint: disable=too-many-arguments
+             filing_id, status, representation, report_type, version) -> str:
+        """Return the key of a filing response, which includes the generation of the filing."""
+        generation = self.cache.get(self._generation_key(filing_id)) or ''
+        return f'filing.{filing_id}.{generation}.{status}.{representation}.{report_type}.{version}'
+
+    @staticmethod
+    def _generation_key(filing_id) -> str:
+        return f'filing.{filing_id}.generation'
@@ -0,0 +1,116 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This caches the service account tokens of the client credentials grants.
+
+A token is reused until it is close to its expires_in, and is then refreshed by a single caller,
+while the other callers keep using the current token. Only when there is no valid token do the
+callers wait for the refresh.
+The cache is per process, and is shared by everything in it that uses legal_api.services,
+such as the API, the queue services and the jobs.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from flask import current_app
+
+from .http_client import Upstream, http_client
+
+
+class TokenCache():
+    """Cache of the service account tokens, keyed by token url and client id."""
+
+    DEFAULT_EXPIRES_IN = 300
+    REFRESH_AHEAD_SECONDS = 60
+    REFRESH_AHEAD_RATIO = 0.1
+
+    def __init__(self):
+        """Create an empty cache."""
+        self._tokens: Dict[Tuple[str, str], dict] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, token_url: str, client_id: str, client_secret: str) -> Optional[str]:
+        """Return a valid token for the client, or None if one can't be had."""
+        key = (token_url, client_id)
+        entry = self._tokens.get(key)
+        if entry and time.monotonic() < entry['refreshAt']:
+            return entry['token']
+
+        lock = self._key_lock(key)
+        if entry and time.monotonic() < entry['expiresAt']:
+            # the token is still good, so don't queue up behind a refresh that is already running
+            if not lock.acquire(blocking=False):
+                return entry['token']
+        else:
+            lock.acquire()  # pylint: disable=consider-using-with; released below
+
+        try:
+            # another caller may have refreshed it while this one waited
+            entry = self._tokens.get(key)
+            if entry and time.monotonic() < entry['refreshAt']:
+                return entry['token']
+
+            if refreshed := self._fetch(token_url, client_id, client_secret):
+                self._tokens[key] = refreshed
+                return refreshed['token']
+
+            if entry and time.monotonic() < entry['expiresAt']:
+                return entry['token']
+            return None
+        finally:
+            lock.release()
+
+    def invalidate(self, token_url: str, client_id: str):
+        """Drop the token of the client, e.g. after it was rejected."""
+        self._tokens.pop((token_url, client_id), None)
+
+    def clear(self):
+        """Drop all the tokens."""
+        self._tokens.clear()
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _fetch(token_url: str, client_id: str, client_secret: str) -> Optional[dict]:
+        """Get a new token with the client credentials grant."""
+        try:
+            res = http_client.post(Upstream.SSO,
+                                   url=token_url,
+                                   data='grant_type=client_credentials',
+                                   headers={'content-type': 'application/x-www-form-urlencoded'},
+                                   auth=(client_id, client_secret))
+            if res.status_code != 200:
+                current_app.logger.warning(f'Unable to get a token for {client_id}: {res.status_code}')
+                return None
+            body = res.json()
+            token = body['access_token']
+            expires_in = int(body.get('expires_in') or TokenCache.DEFAULT_EXPIRES_IN)
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as err:
+            current_app.logger.warning(f'Unable to get a token for {client_id}: {err}')
+            return None
+
+        fetched_at = time.monotonic()
+        refresh_ahead = min(TokenCache.REFRESH_AHEAD_SECONDS, expires_in * TokenCache.REFRESH_AHEAD_RATIO)
+        return {
+            'token': token,
+            'expiresAt': fetched_at + expires_in,
+            'refreshAt': fetched_at + expires_in - refresh_ahead
+        }
+
+
+token_cache = TokenCache()  # pylint: disable=invalid-name; shared variables are lower case by Flask convention.
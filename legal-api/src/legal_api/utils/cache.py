@@ -0,0 +1,84 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In-process caches.
+
+LRUCache follows the cachelib BaseCache interface, so it can stand in for a shared cachelib backend.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from cachelib import BaseCache
+
+
+class LRUCache(BaseCache):
+    """A thread safe, size bounded cache that evicts the least recently used entries first.
+
+    A timeout of 0 keeps the entry until it is evicted.
+    """
+
+    def __init__(self, threshold: int = 500, default_timeout: int = 300):
+        """Create a cache that holds up to threshold entries."""
+        super().__init__(default_timeout)
+        self._threshold = threshold
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expires(self, timeout: int = None) -> float:
+        if timeout is None:
+            timeout = self.default_timeout
+        return time.monotonic() + timeout if timeout > 0 else 0
+
+    def get(self, key):
+        """Return the value of key, or None when it is missing or expired."""
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            expires, value = entry
+            if expires and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """Store the value of key, evicting the least recently used entry when the cache is full."""
+        with self._lock:
+            self._entries[key] = (self._expires(timeout), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._threshold:
+                self._entries.popitem(last=False)
+        return True
+
+    def add(self, key, value, timeout=None):
+        """Store the value of key unless the key is already cached."""
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None and not (entry[0] and entry[0] <= time.monotonic()):
+                return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        """Remove key from the cache."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def has(self, key):
+        """Return True if key is cached and not expired."""
+        return self.get(key) is not None
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+        return True
@@ -0,0 +1,64 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Conditional GET helpers.
+
+The resources derive a strong ETag from the fields that version what they return, so that a client
+that already has the current representation gets a 304 before the representation is built.
+"""
+import hashlib
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Optional
+
+from flask import Response, current_app, make_response, request
+
+
+def get_etag(*version_parts) -> str:
+    """Return a strong ETag for a resource version made of the version parts."""
+    return hashlib.sha256('|'.join(str(part) for part in version_parts).encode('utf-8')).hexdigest()
+
+
+def not_modified_response(etag: str, last_modified: datetime = None) -> Optional[Response]:
+    """Return a 304 response when the client's copy is current, otherwise None.
+
+    If-None-Match takes precedence over If-Modified-Since, as per RFC 7232.
+    """
+    if request.if_none_match:
+        is_current = request.if_none_match.contains(etag)
+    elif request.if_modified_since and last_modified:
+        # HTTP dates have no fraction of a second
+        is_current = _as_utc(last_modified).replace(microsecond=0) <= _as_utc(request.if_modified_since)
+    else:
+        is_current = False
+
+    if not is_current:
+        return None
+    return add_validators(current_app.response_class(status=HTTPStatus.NOT_MODIFIED), etag, last_modified)
+
+
+def add_validators(rv, etag: str, last_modified: datetime = None) -> Response:
+    """Return the response with its ETag and Last-Modified headers, when it is a successful one."""
+    response = make_response(rv)
+    if response.status_code in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED):
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+    return response
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Return the datetime as an aware UTC datetime, naive ones being UTC already."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -182,6 +182,25 @@ def session(app, db):  # pylint: disable=redefined-outer-name, invalid-name
         conn.close()
 
 
+@pytest.fixture(scope='function')
+def count_queries(db):  # pylint: disable=redefined-outer-name, invalid-name
+    """Return a context manager that collects the statements sent to the database within it."""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    return counter
+
+
 @pytest.fixture(scope='session')
 def stan_server(docker_services):
     """Create the nats / stan services that the integration tests will use."""
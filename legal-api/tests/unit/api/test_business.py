@@ -166,6 +166,38 @@ def test_get_business_info(session, client, jwt):
     assert registry_schemas.validate(rv.json, 'business')
 
 
+def test_get_business_info_conditional(session, client, jwt):
+    """Assert that the business info is not sent again while the client's copy is current."""
+    identifier = 'CP7654321'
+    business = factory_business_model(legal_name=identifier + ' legal name',
+                                      identifier=identifier,
+                                      founding_date=datetime.utcfromtimestamp(0),
+                                      last_ledger_timestamp=datetime.utcfromtimestamp(0),
+                                      last_modified=datetime.utcfromtimestamp(0))
+    headers = create_header(jwt, [STAFF_ROLE], identifier)
+
+    rv = client.get(f'/api/v1/businesses/{identifier}', headers=headers)
+    assert rv.status_code == HTTPStatus.OK
+    etag = rv.headers['ETag']
+    last_modified = rv.headers['Last-Modified']
+
+    rv = client.get(f'/api/v1/businesses/{identifier}', headers={**headers, 'If-None-Match': etag})
+    assert rv.status_code == HTTPStatus.NOT_MODIFIED
+    assert rv.headers['ETag'] == etag
+    assert not rv.data
+
+    rv = client.get(f'/api/v1/businesses/{identifier}', headers={**headers, 'If-Modified-Since': last_modified})
+    assert rv.status_code == HTTPStatus.NOT_MODIFIED
+
+    business.legal_name = 'changed legal name'
+    business.save()
+
+    rv = client.get(f'/api/v1/businesses/{identifier}', headers={**headers, 'If-None-Match': etag})
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.headers['ETag'] != etag
+    assert rv.json['business']['legalName'] == 'changed legal name'
+
+
 def test_get_business_info_dissolution(session, client, jwt):
     """Assert that the business info cannot be received in a valid JSONSchema format."""
     identifier = 'CP1234567'
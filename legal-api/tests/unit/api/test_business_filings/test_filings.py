@@ -96,6 +96,132 @@ def test_get_all_business_filings_multi_in_ledger(session, client, jwt):
     assert len(rv.json.get('filings')) == 0
 
 
+def test_get_business_filings_ledger_pages(session, client, jwt):
+    """Assert that the ledger can be read a page at a time, newest first."""
+    identifier = 'CP7654321'
+    b = factory_business(identifier)
+    filing_ids = [factory_completed_filing(b, ANNUAL_REPORT, filing_date=datetime(2020, 1, day)).id
+                  for day in range(1, 6)]
+
+    ledger_ids = []
+    before = None
+    while True:
+        url = f'/api/v1/businesses/{identifier}/filings?limit=2'
+        if before:
+            url += f'&before={before}'
+        rv = client.get(url, headers=create_header(jwt, [STAFF_ROLE], identifier))
+        assert rv.status_code == HTTPStatus.OK
+        ledger_ids.extend([filing['filing']['header']['filingId'] for filing in rv.json['filings']])
+        if not (before := rv.json['nextBefore']):
+            break
+
+    assert ledger_ids == list(reversed(filing_ids))
+
+
+def test_get_business_filings_ledger_last_page_full(session, client, jwt):
+    """Assert that a last page that exactly fills the limit has no nextBefore."""
+    identifier = 'CP7654321'
+    b = factory_business(identifier)
+    for day in range(1, 5):
+        factory_completed_filing(b, ANNUAL_REPORT, filing_date=datetime(2020, 1, day))
+
+    rv = client.get(f'/api/v1/businesses/{identifier}/filings?limit=2',
+                    headers=create_header(jwt, [STAFF_ROLE], identifier))
+    assert rv.json['nextBefore'] == rv.json['filings'][-1]['filing']['header']['filingId']
+
+    rv = client.get(f'/api/v1/businesses/{identifier}/filings?limit=2&before={rv.json["nextBefore"]}',
+                    headers=create_header(jwt, [STAFF_ROLE], identifier))
+    assert len(rv.json['filings']) == 2
+    assert rv.json['nextBefore'] is None
+
+
+def test_get_business_filings_ledger_error(monkeypatch, session, client, jwt):
+    """Assert that a failure after the ledger has started ends it with an error, as valid json."""
+    identifier = 'CP7654321'
+    b = factory_business(identifier)
+    for day in range(1, 4):
+        factory_completed_filing(b, ANNUAL_REPORT, filing_date=datetime(2020, 1, day))
+    monkeypatch.setattr('legal_api.resources.business.business_filings.LEDGER_BATCH_SIZE', 1)
+    get_ledger_page = ListFilingResource._get_ledger_page  # pylint: disable=protected-access
+    calls = []
+
+    def failing_ledger_page(*args, **kwargs):
+        calls.append(args)
+        if len(calls) > 1:
+            raise ValueError('failed')
+        return get_ledger_page(*args, **kwargs)
+
+    monkeypatch.setattr(ListFilingResource, '_get_ledger_page', staticmethod(failing_ledger_page))
+    rv = client.get(f'/api/v1/businesses/{identifier}/filings',
+                    headers=create_header(jwt, [STAFF_ROLE], identifier))
+
+    assert rv.status_code == HTTPStatus.OK
+    assert len(rv.json['filings']) == 1
+    assert rv.json['error']['message']
+
+
+def test_get_business_filings_ledger_unknown_fields(session, client, jwt):
+    """Assert that unknown ledger fields are a bad request."""
+    identifier = 'CP7654321'
+    factory_business(identifier)
+
+    rv = client.get(f'/api/v1/businesses/{identifier}/filings?fields=documents,colour',
+                    headers=create_header(jwt, [STAFF_ROLE], identifier))
+
+    assert rv.status_code == HTTPStatus.BAD_REQUEST
+    assert 'colour' in rv.json['message']
+
+
+def test_get_business_filings_ledger_fields(session, client, jwt):
+    """Assert that the ledger entries only hold the header and the requested fields."""
+    identifier = 'CP7654321'
+    b = factory_business(identifier)
+    factory_completed_filing(b, ANNUAL_REPORT)
+
+    rv = client.get(f'/api/v1/businesses/{identifier}/filings?fields=documents',
+                    headers=create_header(jwt, [STAFF_ROLE], identifier))
+
+    assert rv.status_code == HTTPStatus.OK
+    assert 'nextBefore' not in rv.json
+    filing = rv.json['filings'][0]['filing']
+    assert set(filing.keys()) == {'header', 'documents'}
+    assert 'comments' not in filing['header']
+    assert filing['documents']
+
+    rv = client.get(f'/api/v1/businesses/{identifier}/filings?fields=body,comments',
+                    headers=create_header(jwt, [STAFF_ROLE], identifier))
+
+    filing = rv.json['filings'][0]['filing']
+    assert 'annualReport' in filing
+    assert 'documents' not in filing
+    assert filing['header']['comments'] == []
+
+
+def test_get_business_filings_conditional(session, client, jwt):
+    """Assert that a completed filing and the ledger are not sent again until a filing changes."""
+    identifier = 'CP7654321'
+    b = factory_business(identifier)
+    filing = factory_completed_filing(b, ANNUAL_REPORT)
+    headers = create_header(jwt, [STAFF_ROLE], identifier)
+
+    etags = {}
+    for url in (f'/api/v1/businesses/{identifier}/filings', f'/api/v1/businesses/{identifier}/filings/{filing.id}'):
+        rv = client.get(url, headers=headers)
+        assert rv.status_code == HTTPStatus.OK
+        etags[url] = rv.headers['ETag']
+
+        rv = client.get(url, headers={**headers, 'If-None-Match': etags[url]})
+        assert rv.status_code == HTTPStatus.NOT_MODIFIED
+
+    # a new filing changes the ledger
+    factory_completed_filing(b, ANNUAL_REPORT, colin_id=1234)
+    for url, etag in etags.items():
+        rv = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert rv.status_code == HTTPStatus.OK
+    rv = client.get(f'/api/v1/businesses/{identifier}/filings', headers=headers)
+    assert len(rv.json['filings']) == 2
+
+
 def test_get_one_business_filing_by_id(session, client, jwt):
     """Assert that the business info cannot be received in a valid JSONSchema format."""
     identifier = 'CP7654321'
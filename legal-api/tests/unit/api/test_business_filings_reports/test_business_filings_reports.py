@@ -17,6 +17,8 @@
 Test-Suite to ensure that the /businesses endpoint is working as expected.
 """
 import copy
+import io
+import zipfile
 from http import HTTPStatus
 
 import pytest
@@ -171,3 +173,36 @@ def test_get_incorporation_reports(requests_mock, session, client, jwt, role, re
 
     assert matches_sent_snapshot(INCORPORATION_APPLICATION, requests_mock.last_request.json(), report_name,
                                  **ignore_vars)
+
+
+@integration_reports
+def test_get_incorporation_reports_zip(requests_mock, session, client, jwt):
+    """Assert that the reports of a filing can be returned together, as a zip."""
+    from flask import current_app
+    identifier = 'CP7654321'
+    b = factory_business(identifier)
+
+    effective_date = INCORPORATION_APPLICATION['filing']['header']['effectiveDate']
+    filings = factory_incorporation_filing(b, INCORPORATION_APPLICATION, effective_date, effective_date)
+
+    requests_mock.post(current_app.config.get('REPORT_SVC_URL'), content=b'%PDF-1.4')
+
+    url = f'/api/v1/businesses/{identifier}/filings/{filings.id}?types=incorporationApplication,noa,certificate'
+    headers = create_header(jwt, [STAFF_ROLE], identifier, **{'accept': 'application/zip'})
+    rv = client.get(url, headers=headers)
+
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.content_type == 'application/zip'
+    assert requests_mock.call_count == 3
+    with zipfile.ZipFile(io.BytesIO(rv.data)) as zip_file:
+        assert sorted(zip_file.namelist()) == ['certificate.pdf', 'incorporationApplication.pdf', 'noa.pdf']
+        assert zip_file.read('noa.pdf') == b'%PDF-1.4'
+
+    # the zip has an ETag of its own, not the one of the json
+    etag = rv.headers['ETag'].strip('"')
+    json_rv = client.get(f'/api/v1/businesses/{identifier}/filings/{filings.id}',
+                         headers=create_header(jwt, [STAFF_ROLE], identifier))
+    assert json_rv.headers['ETag'].strip('"') != etag
+    assert client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == HTTPStatus.NOT_MODIFIED
+    assert client.get(url, headers={**headers, 'If-None-Match': json_rv.headers['ETag'].strip('"')}).status_code == \
+        HTTPStatus.OK
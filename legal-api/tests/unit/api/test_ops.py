@@ -42,3 +42,12 @@ def test_ops_readyz(client):
 
     assert rv.status_code == 200
     assert rv.json == {'message': 'api is ready'}
+
+
+def test_ops_metrics(client):
+    """Asserts that the upstream and authorization cache metrics are returned."""
+    rv = client.get('/ops/metrics')
+
+    assert rv.status_code == 200
+    assert 'upstreams' in rv.json
+    assert set(rv.json['authz']) == {'hits', 'misses'}
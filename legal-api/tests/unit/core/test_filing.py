@@ -110,6 +110,28 @@ def test_filing_json_completed(session):
     assert 'offices' in filing.json['filing']['annualReport']
 
 
+def test_filing_json_completed_from_snapshot(session):
+    """Assert that the completed filing json is served from the stored revision snapshot."""
+    from legal_api.services import VersionedBusinessDetailsService
+
+    identifier = 'CP7654321'
+    business = factory_business(identifier)
+    filing_storage = factory_completed_filing(business, ANNUAL_REPORT)
+    filing = Filing.find_by_id(filing_storage.id)
+    filing_json = filing.json
+
+    VersionedBusinessDetailsService.save_revision_snapshot(filing_storage)
+
+    assert filing_storage.revision_json
+    assert 'header' not in filing_storage.revision_json['filing']
+    assert filing_storage.revision_json['companyDetails']
+    assert filing.json == filing_json
+
+    # the versioned tables are no longer read once the snapshot is stored
+    filing_storage.revision_json['filing']['annualReport']['directors'] = []
+    assert filing.json['filing']['annualReport']['directors'] == []
+
+
 def test_filing_save(session):
     """Assert that the core filing is saved to the backing store."""
     filing = Filing()
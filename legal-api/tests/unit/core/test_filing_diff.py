@@ -121,3 +121,54 @@ def test_diff_of_stored_completed_filings(session):
             'oldValue': 'Be it resolved, that it is resolved to be resolved.',
             'path': RESOLUTION_PATH
         }]
+
+
+def test_diff_of_completed_correction_is_stored(session):
+    """Assert that the diff of a completed correction is stored by the filer, and that a read stores nothing."""
+    identifier = 'CP1234567'
+    business = factory_business(identifier,
+                                founding_date=(datetime.utcnow() - datedelta.YEAR)
+                                )
+    factory_business_mailing_address(business)
+    original_filing = factory_completed_filing(business, copy.deepcopy(MINIMAL_FILING_JSON))
+
+    json2 = copy.deepcopy(CORRECTION_FILING_JSON)
+    json2['filing']['correction']['correctedFilingId'] = str(original_filing.id)
+    correction_filing = factory_completed_filing(business, json2)
+
+    assert Filing.find_by_id(correction_filing.id).json['filing']['correction']['diff'][0]['path'] == RESOLUTION_PATH
+    assert 'correctionDiff' not in (correction_filing.revision_json or {})
+
+    Filing.find_by_id(correction_filing.id).save_correction_diff()
+    stored_diff = correction_filing.revision_json['correctionDiff']
+    assert stored_diff['correctedFilingId'] == original_filing.id
+    assert stored_diff['transactionId'] == correction_filing.transaction_id
+    assert stored_diff['diff'][0]['path'] == RESOLUTION_PATH
+
+    # a stored diff is served as is
+    stored_diff = {**stored_diff, 'diff': [{'path': '/stored'}]}
+    correction_filing.revision_json = {**correction_filing.revision_json, 'correctionDiff': stored_diff}
+    correction_filing.save()
+    assert Filing.find_by_id(correction_filing.id).json['filing']['correction']['diff'] == [{'path': '/stored'}]
+
+    # a diff stored for another transaction is computed again, and left as it is
+    correction_filing.revision_json = {'correctionDiff': {**stored_diff, 'transactionId': -1}}
+    correction_filing.save()
+    filing_json = Filing.find_by_id(correction_filing.id).json
+    assert filing_json['filing']['correction']['diff'][0]['path'] == RESOLUTION_PATH
+    assert correction_filing.revision_json['correctionDiff']['transactionId'] == -1
+
+
+def test_diff_of_invalid_corrected_filing_id(session):
+    """Assert that a correction of a filing id that is not a number has no diff, rather than failing."""
+    business = factory_business('CP1234567', founding_date=(datetime.utcnow() - datedelta.YEAR))
+    factory_business_mailing_address(business)
+
+    json2 = copy.deepcopy(CORRECTION_FILING_JSON)
+    json2['filing']['correction']['correctedFilingId'] = 'not a filing'
+    correction_filing = factory_completed_filing(business, json2)
+
+    filing = Filing.find_by_id(correction_filing.id)
+    assert 'diff' not in filing.json['filing']['correction']
+    filing.save_correction_diff()
+    assert 'correctionDiff' not in (correction_filing.revision_json or {})
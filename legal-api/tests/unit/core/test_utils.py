@@ -359,3 +359,58 @@ def test_diff_list_missing_lists(test_name, json1, json2, expected):
     ld = [d.json for d in diff] if diff else None
 
     assert expected == ld
+
+
+def _large_filing(parties: int, share_classes: int, series: int) -> dict:
+    """Return a synthetic incorporation application with many parties, share classes and series."""
+    return {'filing': {
+        'header': {'name': 'incorporationApplication'},
+        'incorporationApplication': {
+            'parties': [{'id': str(i),
+                         'officer': {'id': str(i), 'firstName': f'first {i}', 'lastName': 'last'},
+                         'roles': [{'id': 'Director', 'roleType': 'Director'}],
+                         'deliveryAddress': {'streetAddress': f'{i} street', 'addressCity': 'Victoria'}}
+                        for i in range(parties)],
+            'shareStructure': {'shareClasses': [{'id': str(c),
+                                                 'name': f'class {c}',
+                                                 'series': [{'id': f'{c}-{s}', 'name': f'series {s}'}
+                                                            for s in range(series)]}
+                                                for c in range(share_classes)]}
+        }}}
+
+
+@pytest.mark.parametrize('test_name, parties, share_classes, series', [
+    ('small', 10, 5, 5),
+    ('large', 500, 250, 10),
+])
+def test_diff_large_filing(test_name, parties, share_classes, series):
+    """Assert that large corrections are diffed correctly, and within a time bound."""
+    import copy
+    import timeit
+
+    from legal_api.core.utils import diff_dict, diff_list
+
+    json1 = _large_filing(parties, share_classes, series)
+    json2 = copy.deepcopy(json1)
+    json2['filing']['incorporationApplication']['parties'].reverse()
+    json2['filing']['incorporationApplication']['parties'][0]['officer']['firstName'] = 'changed'
+    added_series = json2['filing']['incorporationApplication']['shareStructure']['shareClasses'][0]['series'].pop()
+    json2['filing']['incorporationApplication']['shareStructure']['shareClasses'].reverse()
+
+    def diff():
+        return diff_dict(json1, json2, ignore_keys=['header'], diff_list_callback=diff_list)
+
+    ld = [d.json for d in diff()]
+
+    assert ld == [
+        {'oldValue': 'changed',
+         'newValue': f'first {parties - 1}',
+         'path': f'/filing/incorporationApplication/parties/{parties - 1}/officer/firstName'},
+        {'oldValue': None,
+         'newValue': added_series,
+         'path': '/filing/incorporationApplication/shareStructure/shareClasses/0/series'},
+    ]
+
+    # the large filing diffs in tens of milliseconds, the bound leaves room for a slow runner
+    seconds = min(timeit.repeat(diff, number=1, repeat=3))
+    assert seconds < 2, f'diff of {test_name} filing took {seconds:.1f}s'
@@ -187,6 +187,22 @@ def test_business_find_by_identifier(session):
     assert b is not None
 
 
+def test_business_lookups_are_remembered_for_the_request(session, app, count_queries):
+    """Assert that a business is only queried once per request, whichever way it is looked up."""
+    factory_business().save()
+
+    with app.test_request_context(), count_queries() as statements:
+        business = Business.find_by_identifier('CP1234567')
+        assert Business.find_by_identifier('CP1234567') is business
+        assert Business.find_by_internal_id(business.id) is business
+
+    assert len(statements) == 1
+
+    with app.test_request_context():
+        assert Business.find_by_identifier('CP1234567') is not None
+        assert Business.find_by_identifier('CP7654321') is None
+
+
 def test_business_find_by_identifier_no_identifier(session):
     """Assert that the business can be found by name."""
     designation = '001'
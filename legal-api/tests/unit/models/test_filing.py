@@ -45,6 +45,7 @@ from tests.conftest import not_raises
 from tests.unit.models import (
     factory_business,
     factory_business_mailing_address,
+    factory_comment,
     factory_completed_filing,
     factory_filing,
 )
@@ -696,6 +697,29 @@ def test_linked_not_correction(session):
     assert filing2.json['filing']['header']['affectedFilings'] is not None
 
 
+def test_get_ledger_json(session):
+    """Assert that the batch loaded ledger json matches the json of each filing."""
+    # setup
+    b = factory_business('CP1234567')
+    user = User(username='username', firstname='firstname', lastname='lastname', sub='sub', iss='iss')
+    user.save()
+    filing1 = factory_completed_filing(b, ANNUAL_REPORT, colin_id=1234)
+    filing1.submitter_id = user.id
+    filing1.save()
+    filing2 = factory_completed_filing(b, CORRECTION_AR)
+    filing1.parent_filing = filing2
+    filing1.save()
+    factory_comment(b, filing1, 'a comment', user)
+    factory_comment(b, filing1, 'another comment')
+
+    filings = Filing.get_filings_by_status(b.id, [Filing.Status.COMPLETED.value])
+
+    # test
+    ledger = Filing.get_ledger_json(filings)
+    assert ledger == [filing.json for filing in filings]
+    assert Filing.get_ledger_json([]) == []
+
+
 def test_alteration_filing_with_court_order(session):
     """Assert that an alteration filing with court order can be created."""
     identifier = 'BC1156638'
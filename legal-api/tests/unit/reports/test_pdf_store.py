@@ -0,0 +1,46 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the rendered PDF store.
+
+Test-Suite to ensure that the rendered PDFs are kept by filing, report type and report request.
+"""
+from unittest.mock import patch
+
+from legal_api.reports import pdf_store
+
+
+def test_get_key():
+    """Assert that the key changes with the filing, the report type and the report request, e.g. its tax id."""
+    key = pdf_store.get_key(1, 'certificate', '{"templateVars": {"taxId": null}}')
+    assert key.startswith('rendered-pdfs/1/certificate/') and key.endswith('.pdf')
+    assert pdf_store.get_key(1, 'certificate', '{"templateVars": {"taxId": null}}') == key
+    assert pdf_store.get_key(1, 'certificate', '{"templateVars": {"taxId": "123456789"}}') != key
+    assert pdf_store.get_key(2, 'certificate', '{"templateVars": {"taxId": null}}') != key
+    assert pdf_store.get_key(1, 'noa', '{"templateVars": {"taxId": null}}') != key
+
+
+def test_save_and_get_pdf(session, minio_server):  # pylint:disable=unused-argument
+    """Assert that a rendered PDF is read back from the store, and that an unknown key is a miss."""
+    key = pdf_store.get_key(1, 'certificate', 'abc')
+    pdf_store.save_pdf(key, b'%PDF-1.4')
+
+    assert pdf_store.get_pdf(key) == b'%PDF-1.4'
+    assert pdf_store.get_pdf(pdf_store.get_key(1, 'certificate', 'unknown')) is None
+
+
+def test_store_failure(app):
+    """Assert that a store failure is only a miss."""
+    with app.app_context(), patch('legal_api.services.MinioService._get_client', side_effect=Exception('down')):
+        pdf_store.save_pdf('rendered-pdfs/1/certificate/abc.pdf', b'%PDF-1.4')
+        assert pdf_store.get_pdf('rendered-pdfs/1/certificate/abc.pdf') is None
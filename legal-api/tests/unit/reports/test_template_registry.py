@@ -0,0 +1,69 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the report template registry.
+
+Test-Suite to ensure that the report templates are assembled once, with nested parts, and reloaded on change.
+"""
+import base64
+import os
+from unittest.mock import patch
+
+import pytest
+
+from legal_api.reports.template_registry import TemplateRegistry
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    """Return a template path with a template, nested template parts and a missing part."""
+    (tmp_path / 'template-parts' / 'common').mkdir(parents=True)
+    (tmp_path / 'report.html').write_text('<html>[[common/body.html]][[missing.html]]</html>')
+    (tmp_path / 'template-parts' / 'common' / 'body.html').write_text('<body>[[footer.html]]</body>')
+    (tmp_path / 'template-parts' / 'footer.html').write_text('<footer>[[footer.html]]</footer>')
+    return tmp_path
+
+
+def test_get_template(app, template_path):
+    """Assert that a template is assembled with its nested parts, once."""
+    registry = TemplateRegistry()
+    with app.app_context(), patch.dict(app.config, {'REPORT_TEMPLATE_PATH': str(template_path),
+                                                    'REPORT_TEMPLATE_RELOAD': False}):
+        template = registry.get_template('report.html')
+        assert template.code == '<html><body><footer>[[footer.html]]</footer></body>[[missing.html]]</html>'
+        assert base64.b64decode(template.encoded.strip("'")).decode() == template.code
+
+        (template_path / 'template-parts' / 'footer.html').write_text('<footer/>')
+        assert registry.get_template('report.html') is template
+
+
+def test_get_template_reload(app, template_path):
+    """Assert that a template is assembled again when one of its parts changes, if reload is on."""
+    registry = TemplateRegistry()
+    with app.app_context(), patch.dict(app.config, {'REPORT_TEMPLATE_PATH': str(template_path),
+                                                    'REPORT_TEMPLATE_RELOAD': True}):
+        template = registry.get_template('report.html')
+        assert registry.get_template('report.html') is template
+
+        footer = template_path / 'template-parts' / 'footer.html'
+        footer.write_text('<footer/>')
+        os.utime(footer, (footer.stat().st_atime, footer.stat().st_mtime + 10))
+        assert registry.get_template('report.html').code == '<html><body><footer/></body>[[missing.html]]</html>'
+
+
+def test_get_template_not_found(app, template_path):
+    """Assert that a missing template raises FileNotFoundError, which the reports answer as paper only."""
+    registry = TemplateRegistry()
+    with app.app_context(), patch.dict(app.config, {'REPORT_TEMPLATE_PATH': str(template_path)}):
+        with pytest.raises(FileNotFoundError):
+            registry.get_template('unknown.html')
@@ -236,3 +236,47 @@ def test_authorized_invalid_roles(monkeypatch, app, jwt):
         rv = authorized(identifier, jwt, ['view'])
 
     assert not rv
+
+
+def test_authorized_user_cached(monkeypatch, app_request, jwt):
+    """Assert that the roles are cached per subject and business, including a denial, until invalidated."""
+    from requests import Response
+
+    from legal_api.services import AuthzCache
+
+    calls = []
+    roles = {'CP1234567': ['view', 'edit'], 'CP7654321': []}
+
+    def mock_get(self, url, **kwargs):  # pylint: disable=unused-argument; mocks of library methods
+        calls.append(url)
+        resp = Response()
+        resp.status_code = 200
+        resp._content = jsonify(roles=roles[url.split('/')[-1]]).get_data()  # pylint: disable=protected-access
+        return resp
+
+    cache = AuthzCache()
+    monkeypatch.setattr('legal_api.services.authz.authz_cache', cache)
+    monkeypatch.setattr('requests.sessions.Session.get', mock_get)
+    app_request.config['AUTHZ_CACHE_TIMEOUT'] = 60
+    app_request.config['AUTH_SVC_URL'] = 'https://auth.example.com/entities/{identifier}'
+
+    @app_request.route('/fake_jwt_route/<string:identifier>')
+    @jwt.requires_auth
+    def get_fake(identifier: str):
+        if not authorized(identifier, jwt, ['edit']):
+            return jsonify(message='failed'), HTTPStatus.METHOD_NOT_ALLOWED
+        return jsonify(message='success'), HTTPStatus.OK
+
+    headers = {'Authorization': 'Bearer ' + helper_create_jwt(jwt, roles=[BASIC_USER], username='user')}
+    with app_request.test_client() as test_client:
+        for _ in range(2):
+            assert test_client.get('/fake_jwt_route/CP1234567', headers=headers).status_code == HTTPStatus.OK
+            assert test_client.get('/fake_jwt_route/CP7654321', headers=headers).status_code == \
+                HTTPStatus.METHOD_NOT_ALLOWED
+        assert len(calls) == 2
+        assert cache.metrics() == {'hits': 2, 'misses': 2}
+
+        with app_request.app_context():
+            cache.invalidate(identifier='CP1234567')
+        assert test_client.get('/fake_jwt_route/CP1234567', headers=headers).status_code == HTTPStatus.OK
+        assert len(calls) == 3
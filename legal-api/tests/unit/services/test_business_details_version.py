@@ -0,0 +1,102 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the Versioned Business Details Service.
+
+Test-Suite to ensure that the business details are rebuilt as of a filing with a fixed number of queries.
+"""
+import datetime
+
+import pytest
+from registry_schemas.example_data import ANNUAL_REPORT
+
+from legal_api.models import Address, Business, Office, PartyRole, ShareClass, ShareSeries
+from legal_api.services import VersionedBusinessDetailsService
+from tests.unit.models import factory_business, factory_completed_filing, factory_party_role
+
+
+OFFICE_TYPES = ['registeredOffice', 'recordsOffice']
+
+
+def create_business(identifier: str, size: int):
+    """Create a business with size directors and share classes, and up to two offices."""
+    business = factory_business(identifier, datetime.datetime.utcnow(), None, Business.LegalTypes.BCOMP.value)
+    for i in range(size):
+        party_role = factory_party_role(
+            Address(city=f'Delivery City {i}', postal_code='H0H0H0', country='CA', address_type=Address.DELIVERY),
+            Address(city=f'Mailing City {i}', postal_code='H0H0H0', country='CA', address_type=Address.MAILING),
+            {'firstName': f'first {i}', 'lastName': f'last {i}', 'middleInitial': None},
+            datetime.datetime(2017, 5, 17),
+            None,
+            PartyRole.RoleTypes.DIRECTOR
+        )
+        business.party_roles.append(party_role)
+
+        if i < len(OFFICE_TYPES):
+            office = Office(office_type=OFFICE_TYPES[i])
+            office.addresses.append(Address(city=f'Office City {i}', country='CA', address_type=Address.DELIVERY))
+            office.addresses.append(Address(city=f'Office City {i}', country='CA', address_type=Address.MAILING))
+            business.offices.append(office)
+
+        share_class = ShareClass(name=f'Share Class {i}', priority=i, max_share_flag=False,
+                                 par_value_flag=False, special_rights_flag=False)
+        share_class.series.append(ShareSeries(name=f'Share Series {i}', priority=i, max_share_flag=False,
+                                              special_rights_flag=False))
+        business.share_classes.append(share_class)
+    business.save()
+    return business, factory_completed_filing(business, ANNUAL_REPORT)
+
+
+@pytest.mark.parametrize('test_name, method, args', [
+    ('offices', VersionedBusinessDetailsService.get_office_revision, {}),
+    ('parties', VersionedBusinessDetailsService.get_party_role_revision, {'is_ia_or_after': True}),
+    ('directors', VersionedBusinessDetailsService.get_party_role_revision, {'role': 'director'}),
+    ('share classes', VersionedBusinessDetailsService.get_share_class_revision, {}),
+])
+def test_revision_query_count_is_constant(session, count_queries, test_name, method, args):
+    """Assert that the number of queries does not depend on the number of children of the business."""
+    query_counts = []
+    results = []
+    for identifier, size in (('BC1234567', 1), ('BC7654321', 4)):
+        business, filing = create_business(identifier, size)
+        with count_queries() as statements:
+            results.append(method(filing.transaction_id, business.id, **args))
+        query_counts.append(len(statements))
+
+    assert len(results[0]) == 1
+    assert len(results[1]) > 1
+    assert query_counts[0] == query_counts[1]
+
+
+def test_party_role_revision(session):
+    """Assert that the party revision includes the party addresses."""
+    business, filing = create_business('BC1234567', 2)
+
+    parties = VersionedBusinessDetailsService.get_party_role_revision(filing.transaction_id, business.id,
+                                                                      role='director')
+
+    assert [party['officer']['firstName'] for party in parties] == ['first 0', 'first 1']
+    assert parties[0]['deliveryAddress']['addressCity'] == 'Delivery City 0'
+    assert parties[1]['mailingAddress']['addressCity'] == 'Mailing City 1'
+    assert parties[0]['role'] == 'director'
+
+
+def test_share_class_revision(session):
+    """Assert that each share class has its own share series."""
+    business, filing = create_business('BC1234567', 2)
+
+    share_classes = VersionedBusinessDetailsService.get_share_class_revision(filing.transaction_id, business.id)
+
+    assert [share_class['series'][0]['name'] for share_class in share_classes] == \
+        ['Share Series 0', 'Share Series 1']
@@ -1156,3 +1156,47 @@ def test_ia_completed_coop(session, app):
             assert documents[3]['filingId'] == 12356
             assert documents[3]['title'] == 'Certified Memorandum'
             assert documents[3]['filename'] == 'BC1234567 - Certified Memorandum - 2020-07-14.pdf'
+
+
+def test_documents_for_filings(session, app):
+    """Assert that the documents of all the filings of a business are returned without looking up the business."""
+    document_meta = DocumentMetaService()
+    business = factory_business(identifier='BC1234567', entity_type=Business.LegalTypes.BCOMP.value)
+    with app.app_context():
+        filings = [
+            {
+                'filing': {
+                    'header': {
+                        'filingId': filing_id,
+                        'status': status,
+                        'name': name,
+                        'inColinOnly': False,
+                        'availableOnPaperOnly': paper_only,
+                        'date': FILING_DATE
+                    },
+                    'business': {
+                        'identifier': 'BC1234567'
+                    }
+                }
+            }
+            for filing_id, name, status, paper_only in [
+                (1, 'changeOfAddress', 'COMPLETED', False),
+                (2, 'changeOfDirectors', 'PAID', False),
+                (3, 'annualReport', 'COMPLETED', True),
+                (4, 'specialResolution', 'COMPLETED', False)
+            ]
+        ]
+
+        with patch.object(Business, 'find_by_identifier') as find_business:
+            documents = document_meta.get_documents_for_filings(filings, business)
+            find_business.assert_not_called()
+
+        assert [[document['title'] for document in filing_documents] for filing_documents in documents] == [
+            [COA_TITLE, NOA_TITLE],
+            [COD_TITLE],
+            [],
+            ['Special Resolution']
+        ]
+        assert documents[0][1]['filingId'] == 1
+        assert documents[0][1]['filename'] == NOA_FILENAME
+        assert documents[1][0]['filename'] == 'BC1234567 - Director Change - 2020-07-14.pdf'
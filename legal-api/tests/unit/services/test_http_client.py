@@ -0,0 +1,56 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the pooled HTTP client.
+
+Test-Suite to ensure that the upstream sessions are reused, time out and are measured.
+"""
+from unittest.mock import patch
+
+from legal_api.services import HttpClient, Upstream
+
+
+def test_session_per_upstream(app):
+    """Assert that each upstream has one session, with a pooled and retrying adapter."""
+    client = HttpClient()
+    with app.app_context():
+        session = client.session(Upstream.PAY)
+
+        assert client.session(Upstream.PAY) is session
+        assert client.session(Upstream.REPORT) is not session
+        adapter = session.get_adapter('https://pay.example.com')
+        assert adapter._pool_maxsize == app.config['HTTP_POOL_SIZE']  # pylint: disable=protected-access
+        assert adapter.max_retries.total == app.config['HTTP_RETRIES']
+        assert 'POST' not in adapter.max_retries.allowed_methods
+
+
+def test_request_timeout_and_metrics(app, requests_mock):
+    """Assert that the upstream timeout is used unless one is given, and that the requests are measured."""
+    client = HttpClient()
+    requests_mock.get('https://report.example.com/ok', status_code=200)
+    requests_mock.post('https://report.example.com/error', status_code=500)
+
+    with app.app_context(), patch.dict(app.config, {'REPORT_SVC_TIMEOUT': '60'}):
+        client.get(Upstream.REPORT, 'https://report.example.com/ok')
+        assert requests_mock.last_request.timeout == (app.config['HTTP_CONNECT_TIMEOUT'], 60.0)
+
+        client.post(Upstream.REPORT, 'https://report.example.com/error', timeout=1)
+        assert requests_mock.last_request.timeout == 1
+
+    metrics = client.metrics()
+    assert metrics == {'report': {
+        'requests': 2,
+        'failures': 1,
+        'averageSeconds': metrics['report']['averageSeconds'],
+        'maxSeconds': metrics['report']['maxSeconds']
+    }}
@@ -55,6 +55,16 @@ def test_get_file(session, minio_server, tmpdir):  # pylint:disable=unused-argum
     assert get_response
 
 
+def test_put_file(session, minio_server):  # pylint:disable=unused-argument
+    """Assert that a file can be stored and read back."""
+    key = 'Test/put-file-test.pdf'
+    MinioService.put_file(key, b'Test File', content_type='application/pdf')
+
+    get_response = MinioService.get_file(key)
+    assert get_response.read() == b'Test File'
+    assert MinioService.get_file_info(key).content_type == 'application/pdf'
+
+
 def test_delete_file(session, minio_server, tmpdir):  # pylint:disable=unused-argument
     """Assert that a file can be deleted."""
     key = _upload_file(tmpdir)
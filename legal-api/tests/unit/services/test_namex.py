@@ -0,0 +1,52 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the NameX service cache.
+
+Test-Suite to ensure that the name requests are cached by state and dropped when updated.
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from legal_api.services import NameXService
+
+
+@pytest.mark.parametrize('test_name,state,consumption_date,timeout', [
+    ('approved', 'APPROVED', None, 'NAMEX_CACHE_TIMEOUT'),
+    ('draft', 'DRAFT', None, 'NAMEX_CACHE_TIMEOUT'),
+    ('consumed', 'APPROVED', '2021-01-01T00:00:00+00:00', 'NAMEX_CACHE_FINAL_TIMEOUT'),
+    ('expired', 'EXPIRED', None, 'NAMEX_CACHE_FINAL_TIMEOUT'),
+])
+def test_query_nr_number_cached(monkeypatch, app, requests_mock, test_name, state, consumption_date, timeout):
+    """Assert that a name request is cached for the time of its state, and dropped when it is updated."""
+    monkeypatch.setattr(NameXService, '_cache', None)
+    nr_url = f'{app.config["NAMEX_SVC_URL"]}requests/NR 1234567'
+    requests_mock.get(nr_url, json={'nrNum': 'NR 1234567', 'state': state,
+                                    'names': [{'state': state, 'consumptionDate': consumption_date}]})
+    requests_mock.put(nr_url, json={})
+
+    with app.app_context(), patch.object(NameXService, 'get_bearer_token', return_value='token'):
+        assert NameXService.query_nr_number('NR 1234567').json()['state'] == state
+        expires, _ = NameXService._cache._entries['NR 1234567']  # pylint: disable=protected-access
+        assert app.config[timeout] - 5 < expires - time.monotonic() <= app.config[timeout]
+
+        cached_response = NameXService.query_nr_number('nr 1234567')
+        assert cached_response.json()['state'] == state
+        assert cached_response is not NameXService.query_nr_number('NR 1234567')
+        assert requests_mock.call_count == 1
+
+        NameXService.update_nr(NameXService.query_nr_number('NR 1234567').json())
+        NameXService.query_nr_number('NR 1234567')
+        assert requests_mock.call_count == 3
@@ -0,0 +1,95 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the payment details service.
+
+Test-Suite to ensure that the payment details are fetched, kept and left out on failure.
+"""
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+from requests import exceptions
+
+from legal_api.services import PaymentService
+
+
+def _filing(payment_token, status='PENDING', payment_completion_date=None):
+    return SimpleNamespace(payment_token=payment_token, status=status, payment_completion_date=payment_completion_date)
+
+
+def test_get_payment_details(app, requests_mock):
+    """Assert that the details of each token are fetched once, and that a failed token is left out."""
+    service = PaymentService()
+    payment_svc_url = app.config.get('PAYMENT_SVC_URL')
+    requests_mock.get(f'{payment_svc_url}/1', json={'isPaymentActionRequired': True, 'paymentMethod': 'ONLINE_BANKING'})
+    requests_mock.get(f'{payment_svc_url}/2', json={'paymentMethod': 'PAD'})
+    requests_mock.get(f'{payment_svc_url}/3', status_code=500)
+
+    with app.app_context():
+        details = service.get_payment_details([_filing(1), _filing('2'), _filing(3), _filing(1), _filing(None)],
+                                              'token')
+        assert details == {
+            '1': {'isPaymentActionRequired': True, 'paymentMethod': 'ONLINE_BANKING'},
+            '2': {'isPaymentActionRequired': False, 'paymentMethod': 'PAD'}
+        }
+        assert requests_mock.last_request.headers['Authorization'] == 'Bearer token'
+        call_count = requests_mock.call_count
+
+        # the details are kept, the failed token is asked for again
+        assert service.get_payment_details([_filing(1), _filing(2), _filing(3)], 'token') == details
+        assert requests_mock.call_count == call_count + 1
+
+        # until the filing is paid
+        service.get_payment_details([_filing(1, 'PAID', datetime(2021, 1, 1))], 'token')
+        assert requests_mock.call_count == call_count + 2
+
+
+def test_get_payment_details_in_flight(app, requests_mock):
+    """Assert that concurrent lookups of a payment token share a single call to the pay-api."""
+    service = PaymentService()
+    release = threading.Event()
+
+    def pay_details(request, context):  # pylint: disable=unused-argument; the requests_mock callback signature
+        release.wait(5)
+        return {'paymentMethod': 'DIRECT_PAY'}
+
+    requests_mock.get(f'{app.config.get("PAYMENT_SVC_URL")}/1', json=pay_details)
+    results = []
+
+    def lookup():
+        with app.app_context():
+            results.append(service.get_payment_details([_filing(1)], 'token'))
+
+    threads = [threading.Thread(target=lookup) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 3
+    assert all(result == {'1': {'isPaymentActionRequired': False, 'paymentMethod': 'DIRECT_PAY'}} for result in results)
+    assert requests_mock.call_count == 1
+
+
+def test_get_payment_details_request_error(app, requests_mock):
+    """Assert that a token the pay-api call fails for, in any way, is left out rather than failing the lookup."""
+    service = PaymentService()
+    payment_svc_url = app.config.get('PAYMENT_SVC_URL')
+    requests_mock.get(f'{payment_svc_url}/1', json={'paymentMethod': 'PAD'})
+    requests_mock.get(f'{payment_svc_url}/2', exc=exceptions.TooManyRedirects)
+
+    with app.app_context():
+        assert service.get_payment_details([_filing(1), _filing(2)], 'token') == \
+            {'1': {'isPaymentActionRequired': False, 'paymentMethod': 'PAD'}}
@@ -22,6 +22,7 @@ import logging
 
 import dpath.util
 import pytest
+from nats.aio.errors import ErrConnectionClosed
 
 from legal_api.services.queue import QueueService
 from tests import integration_nats
@@ -122,6 +123,79 @@ async def test_async_publish_colin_filing(app_ctx, stan_server):
                                           'colinFiling/id')
 
 
+@integration_nats
+def test_publish_json_keeps_connection(app, stan_server):
+    """Assert that the publishes from the request threads share one connection, on the background loop."""
+    queue = QueueService(app)
+
+    queue.publish_json({'colinFiling': {'id': 1234}})
+    nats = queue.nats
+    assert queue.is_connected
+    assert queue.loop.is_running()
+
+    futures = [queue.publish_json_async({'colinFiling': {'id': 1235 + i}}) for i in range(5)]
+    for future in futures:
+        future.result(5)
+    assert queue.nats is nats
+
+    queue.shutdown()
+    assert queue.is_closed
+
+
+class _FakeStan():
+    """A STAN client that fails its publishes with the given errors, in turn."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.published = []
+
+    async def publish(self, subject, payload):
+        self.published.append((subject, payload))
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+def _fake_queue(monkeypatch, *stans) -> QueueService:
+    """Return a queue that gets the next fake STAN client each time it connects."""
+    queue = QueueService()
+    clients = list(stans)
+
+    async def connect():
+        if not queue._stan:  # pylint: disable=protected-access
+            queue._stan = clients.pop(0)  # pylint: disable=protected-access
+
+    async def discard():
+        queue._stan = None  # pylint: disable=protected-access
+
+    monkeypatch.setattr(queue, 'connect', connect)
+    monkeypatch.setattr(queue, '_discard', discard)
+    return queue
+
+
+@pytest.mark.asyncio
+async def test_async_publish_json_closed_connection(monkeypatch):
+    """Assert that a message refused by a closed connection is sent once more, on a new connection."""
+    closed, reconnected = _FakeStan(ErrConnectionClosed()), _FakeStan()
+    queue = _fake_queue(monkeypatch, closed, reconnected)
+
+    await queue.async_publish_json({'filing': {'id': 1}}, 'filer')
+
+    assert len(closed.published) == 1
+    assert reconnected.published == [('filer', b'{"filing": {"id": 1}}')]
+
+
+@pytest.mark.asyncio
+async def test_async_publish_json_not_sent_twice(monkeypatch):
+    """Assert that a message that may have been sent, e.g. its acknowledgement timed out, is not sent again."""
+    timed_out, unused = _FakeStan(asyncio.TimeoutError()), _FakeStan()
+    queue = _fake_queue(monkeypatch, timed_out, unused)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await queue.async_publish_json({'filing': {'id': 1}}, 'filer')
+
+    assert len(timed_out.published) == 1
+    assert not unused.published
+
 # @integration_nats
 # @pytest.mark.asyncio
 # async def test_publish_colin_filing(app_ctx, stan_server, event_loop):
@@ -0,0 +1,88 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the Response Cache Service.
+
+Test-Suite to ensure that the rendered filing responses are cached and invalidated as expected.
+"""
+from http import HTTPStatus
+from unittest.mock import patch
+
+from flask import jsonify
+from registry_schemas.example_data import ANNUAL_REPORT
+
+from legal_api.services import STAFF_ROLE, ResponseCache, VersionedBusinessDetailsService, response_cache
+from tests.unit.models import factory_business, factory_completed_filing
+from tests.unit.services.utils import create_header
+
+
+def test_filing_response_cache(app):
+    """Assert that a filing response is cached by filing, status, representation, report type and version."""
+    cache = ResponseCache(app)
+    with app.test_request_context():
+        cache.set_filing_response(1, 'COMPLETED', 'json', None, 'v1', jsonify(filing=1))
+
+        assert cache.get_filing_response(1, 'COMPLETED', 'json', None, 'v1').get_json() == {'filing': 1}
+        assert cache.get_filing_response(1, 'COMPLETED', 'pdf', None, 'v1') is None
+        assert cache.get_filing_response(1, 'COMPLETED', 'json', None, 'v2') is None
+        assert cache.get_filing_response(1, 'PAID', 'json', None, 'v1') is None
+
+        # failed responses are not cached
+        cache.set_filing_response(2, 'COMPLETED', 'pdf', 'noa', 'v1', ({'message': 'error'}, HTTPStatus.BAD_GATEWAY))
+        assert cache.get_filing_response(2, 'COMPLETED', 'pdf', 'noa', 'v1') is None
+
+        cache.invalidate_filing(1)
+        assert cache.get_filing_response(1, 'COMPLETED', 'json', None, 'v1') is None
+
+
+def test_filing_response_cache_memory_bound(app):
+    """Assert that the memory cache leaves out the PDFs and the responses over the item size."""
+    with patch.dict(app.config, {'RESPONSE_CACHE_TYPE': 'memory', 'RESPONSE_CACHE_MAX_ITEM_SIZE': 100}):
+        cache = ResponseCache(app)
+    with app.test_request_context():
+        pdf = app.response_class(b'%PDF', mimetype='application/pdf')
+        cache.set_filing_response(1, 'COMPLETED', 'pdf', 'noa', 'v1', pdf)
+        assert cache.get_filing_response(1, 'COMPLETED', 'pdf', 'noa', 'v1') is None
+
+        cache.set_filing_response(1, 'COMPLETED', 'json', None, 'v1', jsonify(filing='x' * 100))
+        assert cache.get_filing_response(1, 'COMPLETED', 'json', None, 'v1') is None
+
+        cache.set_filing_response(1, 'COMPLETED', 'json', None, 'v1', jsonify(filing=1))
+        assert cache.get_filing_response(1, 'COMPLETED', 'json', None, 'v1').get_json() == {'filing': 1}
+
+
+def test_filing_response_cache_disabled(app):
+    """Assert that nothing is cached when the cache type is none."""
+    with patch.dict(app.config, {'RESPONSE_CACHE_TYPE': 'none'}):
+        cache = ResponseCache(app)
+    with app.test_request_context():
+        cache.set_filing_response(1, 'COMPLETED', 'json', None, 'v1', jsonify(filing=1))
+        assert cache.get_filing_response(1, 'COMPLETED', 'json', None, 'v1') is None
+
+
+def test_completed_filing_is_rendered_once(session, client, jwt):
+    """Assert that a completed filing is rendered once and then served from the cache."""
+    identifier = 'CP7654321'
+    business = factory_business(identifier)
+    filing = factory_completed_filing(business, ANNUAL_REPORT)
+    response_cache.cache.clear()
+
+    with patch.object(VersionedBusinessDetailsService, 'get_revision',
+                      wraps=VersionedBusinessDetailsService.get_revision) as get_revision:
+        for _ in range(2):
+            rv = client.get(f'/api/v1/businesses/{identifier}/filings/{filing.id}',
+                            headers=create_header(jwt, [STAFF_ROLE], identifier))
+            assert rv.status_code == HTTPStatus.OK
+            assert rv.json['filing']['header']['filingId'] == filing.id
+
+        assert get_revision.call_count == 1
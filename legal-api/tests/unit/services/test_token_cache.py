@@ -0,0 +1,70 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the service account token cache.
+
+Test-Suite to ensure that the tokens are reused until they are due for a refresh.
+"""
+from unittest.mock import patch
+
+from legal_api.services import TokenCache
+
+
+TOKEN_URL = 'https://sso.example.com/token'
+
+
+def test_token_is_reused_until_refresh(app, requests_mock):
+    """Assert that a token is reused, and refreshed ahead of its expiry."""
+    cache = TokenCache()
+    requests_mock.post(TOKEN_URL, [{'json': {'access_token': 'first', 'expires_in': 300}},
+                                   {'json': {'access_token': 'second', 'expires_in': 300}}])
+
+    with app.app_context(), patch('legal_api.services.token_cache.time.monotonic') as monotonic:
+        monotonic.return_value = 1000
+        assert cache.get_token(TOKEN_URL, 'client', 'secret') == 'first'
+        monotonic.return_value = 1200
+        assert cache.get_token(TOKEN_URL, 'client', 'secret') == 'first'
+        assert requests_mock.call_count == 1
+
+        # refreshed within a minute of its expiry
+        monotonic.return_value = 1250
+        assert cache.get_token(TOKEN_URL, 'client', 'secret') == 'second'
+        assert requests_mock.call_count == 2
+
+
+def test_token_kept_when_refresh_fails(app, requests_mock):
+    """Assert that a failed refresh falls back to the token while it is still valid."""
+    cache = TokenCache()
+    requests_mock.post(TOKEN_URL, [{'json': {'access_token': 'first', 'expires_in': 300}},
+                                   {'status_code': 503},
+                                   {'status_code': 503}])
+
+    with app.app_context(), patch('legal_api.services.token_cache.time.monotonic') as monotonic:
+        monotonic.return_value = 1000
+        assert cache.get_token(TOKEN_URL, 'client', 'secret') == 'first'
+        monotonic.return_value = 1250
+        assert cache.get_token(TOKEN_URL, 'client', 'secret') == 'first'
+        monotonic.return_value = 1300
+        assert cache.get_token(TOKEN_URL, 'client', 'secret') is None
+
+
+def test_invalidate(app, requests_mock):
+    """Assert that an invalidated token is not used again."""
+    cache = TokenCache()
+    requests_mock.post(TOKEN_URL, [{'json': {'access_token': 'first'}},
+                                   {'json': {'access_token': 'second'}}])
+
+    with app.app_context():
+        assert cache.get_token(TOKEN_URL, 'client', 'secret') == 'first'
+        cache.invalidate(TOKEN_URL, 'client')
+        assert cache.get_token(TOKEN_URL, 'client', 'secret') == 'second'
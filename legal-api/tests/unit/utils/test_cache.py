@@ -0,0 +1,52 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to ensure the in-process caches are working as expected."""
+from unittest.mock import patch
+
+from legal_api.utils.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Assert that the least recently used entry is evicted when the cache is full."""
+    cache = LRUCache(threshold=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_lru_cache_timeout():
+    """Assert that entries expire after their timeout, and that a timeout of 0 never expires."""
+    cache = LRUCache(default_timeout=10)
+    with patch('legal_api.utils.cache.time.monotonic', return_value=100):
+        cache.set('default', 1)
+        cache.set('short', 2, timeout=1)
+        cache.set('forever', 3, timeout=0)
+        assert not cache.add('default', 4)
+
+    with patch('legal_api.utils.cache.time.monotonic', return_value=105):
+        assert cache.get('default') == 1
+        assert cache.get('short') is None
+        assert cache.add('short', 5)
+
+    with patch('legal_api.utils.cache.time.monotonic', return_value=1000):
+        assert not cache.has('default')
+        assert cache.get('forever') == 3
+        assert cache.delete('forever')
+        assert cache.get('forever') is None
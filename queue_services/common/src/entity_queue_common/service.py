@@ -14,12 +14,18 @@
 """Service for listening and handling Queue Messages.
 
 This service registers interest in listening to a Queue and processing received messages.
+
+By default the messages are processed one at a time, in the order received, and each one is acknowledged
+once its handler returns. With max_in_flight above 1 the messages are acknowledged manually and up to
+max_in_flight handlers run at once, on the event loop. An ordering key, e.g. the business of the message,
+keeps the messages with the same key in order, while messages with different keys run concurrently.
+A handler that raises leaves its message unacknowledged, so it is delivered again after the ack wait.
 """
 import asyncio
 import functools
 import json
 import signal
-from typing import Dict
+from typing import Callable, Dict, Optional, Tuple
 
 
 from nats.aio.client import Client as NATS  # noqa N814; by convention the name is NATS
@@ -43,9 +49,19 @@ class ServiceWorker:
                  subscription_options=None,
                  config=None,
                  name=None,
-                 version=None
+                 version=None,
+                 max_in_flight=None,
+                 ordering_key: Optional[Callable[[object], Optional[str]]] = None,
+                 max_deliveries=None
                  ):
-        """Initialize the service to a working state."""
+        """Initialize the service to a working state.
+
+        max_in_flight defaults to the MAX_IN_FLIGHT of the config, or 1, and ordering_key returns the key of a
+        message, or None for a message that can run in any order.
+        max_deliveries, the MAX_DELIVERIES of the config or 10, is how many times a message with a key may fail
+        before it is acknowledged and dropped, so that it doesn't hold its key, and the in flight slots taken by
+        the messages held behind it, forever.
+        """
         self.sc = None
         self.nc = None
         self._start_seq = 0
@@ -57,6 +73,13 @@ class ServiceWorker:
         self.config = config
         self._name = name
         self._version = version
+        self.max_in_flight = max(int(max_in_flight or getattr(config, 'MAX_IN_FLIGHT', 1) or 1), 1)
+        self.ordering_key = ordering_key
+        self._slots = None
+        self._in_flight = set()
+        self._key_tails: Dict[str, asyncio.Task] = {}
+        self.max_deliveries = max(int(max_deliveries or getattr(config, 'MAX_DELIVERIES', 10) or 10), 1)
+        self._failed_keys: Dict[str, Tuple[int, int]] = {}
 
         async def conn_lost_cb(error):
             logger.info('Connection lost:%s', error)
@@ -148,17 +171,27 @@ class ServiceWorker:
             **{'cb': self.cb_handler},
             **self.subscription_options
         }
+        if self.max_in_flight > 1:
+            subscription_options = {
+                **subscription_options,
+                **{'cb': self._dispatch,
+                   'manual_acks': True,
+                   'max_inflight': self.max_in_flight}
+            }
 
         await self.nc.connect(**nats_connection_options)
         await self.sc.connect(**stan_connection_options)
         await self.sc.subscribe(**subscription_options)
 
-        logger.info('Subscribe the callback: %s to the queue: %s.',
-                    subscription_options.get('cb').__name__ if subscription_options.get('cb') else 'no_call_back',
-                    subscription_options.get('queue'))
+        logger.info('Subscribe the callback: %s to the queue: %s, max in flight: %s.',
+                    self.cb_handler.__name__ if self.cb_handler else 'no_call_back',
+                    subscription_options.get('queue'),
+                    self.max_in_flight)
 
     async def close(self):
-        """Close the stream and nats connections."""
+        """Close the stream and nats connections, once the messages in flight are processed."""
+        if self._in_flight:
+            await asyncio.wait(list(self._in_flight))
         try:
             await self.sc.close()
             await self.nc.close()
@@ -166,9 +199,79 @@ class ServiceWorker:
             logger.debug('error when closing the streams: %s', err, stack_info=True)
 
     async def publish(self, subject: str, msg: Dict):
-        """Publish the msg as a JSON struct to the subject, using the streaming NATS connection."""
-        await self.sc.publish(subject=subject,
-                              payload=json.dumps(msg).encode('utf-8'))
+        """Publish the msg as a JSON struct to the subject, using the streaming NATS connection.
+
+        The connection belongs to the loop of the service, so a publish from another loop, e.g. a worker thread,
+        is run on the loop of the service.
+        """
+        publish = self.sc.publish(subject=subject,
+                                  payload=json.dumps(msg).encode('utf-8'))
+        if self._loop and self._loop is not asyncio.get_event_loop():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(publish, self._loop))
+        else:
+            await publish
+
+    async def _dispatch(self, msg):
+        """Start the handler of a message, once a slot is free and after the messages with the same key."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        await self._slots.acquire()
+
+        key = self.ordering_key(msg) if self.ordering_key else None
+        previous = self._key_tails.get(key) if key is not None else None
+        task = asyncio.ensure_future(self._handle(msg, key, previous))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+        if key is not None:
+            self._key_tails[key] = task
+            task.add_done_callback(lambda done: self._key_tails.pop(key) if self._key_tails.get(key) is done else None)
+
+    async def _handle(self, msg, key: Optional[str], previous: Optional[asyncio.Task]):
+        """Handle a message after the previous one with the same key, and acknowledge it if it succeeds.
+
+        Once a message fails, the later messages with its key are left unacknowledged until the failed message
+        is delivered again, so that they are delivered again after it. A message that fails max_deliveries times
+        is dropped, see _hold.
+        """
+        sequence = getattr(msg, 'sequence', None)
+        try:
+            if previous:
+                await asyncio.wait([previous])
+            failed = self._failed_keys[key][0] if key in self._failed_keys else None
+            if failed is not None and failed != sequence:
+                logger.warning('Message seq:%s not handled, seq:%s with the same key failed', sequence, failed)
+                return
+            await self.cb_handler(msg)
+            await self.sc.ack(msg)
+            if key is not None:
+                self._failed_keys.pop(key, None)
+        except Exception as err:  # pylint: disable=broad-except; the message is delivered again
+            logger.error('Message seq:%s not acknowledged: %s', sequence, err, exc_info=True)
+            if key is not None:
+                await self._hold(msg, key, sequence)
+        finally:
+            self._slots.release()
+
+    async def _hold(self, msg, key: str, sequence: int):
+        """Hold the key on its failed message, or drop the message once it has failed max_deliveries times.
+
+        The messages held behind a failed message stay unacknowledged, and count against the max in flight of
+        the subscription, so a message that keeps failing is acknowledged and dropped to release its key.
+        """
+        failed, failures = self._failed_keys.get(key, (sequence, 0))
+        if failed != sequence:
+            return
+        failures += 1
+        if failures < self.max_deliveries:
+            self._failed_keys[key] = (sequence, failures)
+            return
+        self._failed_keys.pop(key, None)
+        logger.error('Message seq:%s dropped after %s failed deliveries, releasing the messages with its key',
+                     sequence, failures)
+        try:
+            await self.sc.ack(msg)
+        except Exception as err:  # pylint: disable=broad-except; the message is delivered again
+            logger.error('Message seq:%s not acknowledged: %s', sequence, err, exc_info=True)
 
 
 class QueueServiceManager:
@@ -187,12 +290,12 @@ class QueueServiceManager:
         await asyncio.sleep(0.1, loop=my_loop)
         my_loop.stop()
 
-    async def run(self, loop, config, callback):  # pylint: disable=too-many-locals
+    async def run(self, loop, config, callback, ordering_key=None):  # pylint: disable=too-many-locals
         """Run the main application loop for the service.
 
         This runs the main top level service functions for working with the Queue.
         """
-        self.service = ServiceWorker(loop=loop, cb_handler=callback, config=config)
+        self.service = ServiceWorker(loop=loop, cb_handler=callback, config=config, ordering_key=ordering_key)
         self.probe = Probes(components=[self.service], loop=loop)
 
         try:
@@ -16,7 +16,8 @@ from typing import Callable
 
 import stan
 
-from .exceptions import EmailException, FilingException, QueueException
+from .blocking import run_blocking
+from .exceptions import EmailException, FilingException, QueueException, UpstreamException
 from .handlers import error_cb, signal_handler
 from .run_version import get_run_version
 from .service_logger import logger
@@ -0,0 +1,51 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Run the blocking work of a handler in a thread, so the event loop keeps serving the queue connection.
+
+The handlers are async, but the database and HTTP calls they make block. Awaiting run_blocking hands the call
+to a shared pool of threads, sized by BLOCKING_MAX_WORKERS, and gives the loop back until it is done.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+_executor: Optional[ThreadPoolExecutor] = None  # pylint: disable=invalid-name
+_executor_lock = threading.Lock()  # pylint: disable=invalid-name
+
+
+async def run_blocking(func: Callable, *args, flask_app=None, **kwargs):
+    """Run the blocking function in the pool, in an app context of flask_app if one is given, and return its result."""
+    call = functools.partial(_call, func, flask_app, args, kwargs)
+    return await asyncio.get_event_loop().run_in_executor(_get_executor(), call)
+
+
+def _call(func: Callable, flask_app, args: tuple, kwargs: dict):
+    if flask_app is None:
+        return func(*args, **kwargs)
+    with flask_app.app_context():
+        return func(*args, **kwargs)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor  # pylint: disable=global-statement,invalid-name
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=int(os.getenv('BLOCKING_MAX_WORKERS', '4')),
+                                               thread_name_prefix='blocking')
+    return _executor
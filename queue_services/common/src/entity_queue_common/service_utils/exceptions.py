@@ -24,3 +24,7 @@ class FilingException(Exception):
 
 class EmailException(Exception):
     """No email processor to match queue payload."""
+
+
+class UpstreamException(Exception):
+    """An upstream service failed, so the message is put back on the queue to be processed again."""
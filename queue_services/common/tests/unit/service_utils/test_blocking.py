@@ -0,0 +1,40 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Unit Tests for running the blocking work of a handler off the event loop."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from entity_queue_common.service_utils import run_blocking
+
+
+@pytest.mark.asyncio
+async def test_run_blocking():
+    """Assert that blocking calls run in other threads, overlapping, and that their errors are raised."""
+    def wait(seconds):
+        time.sleep(seconds)
+        return threading.current_thread().name
+
+    start = time.monotonic()
+    names = await asyncio.gather(run_blocking(wait, 0.2), run_blocking(wait, seconds=0.2))
+    assert time.monotonic() - start < 0.35
+    assert threading.current_thread().name not in names
+
+    def fail():
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError):
+        await run_blocking(fail)
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Test Suite to ensure the ServiceWorker wrapper is working as expected."""
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 
 from entity_queue_common.service import ServiceWorker
@@ -84,3 +87,125 @@ async def test_service_connect(stan_server, event_loop):
 
     # teardown
     await service.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_messages_ordered_by_key():
+    """Assert that the messages run concurrently, in order by key, and that only the handled ones are acked."""
+    events = []
+    acked = []
+    release = asyncio.Event()
+
+    async def cb_handler(msg):
+        events.append(('start', msg.data))
+        if msg.data == 'a1':
+            await release.wait()
+        if msg.data == 'b2':
+            raise Exception('failed')
+        events.append(('end', msg.data))
+
+    class SC():
+        async def ack(self, msg):
+            acked.append(msg.data)
+
+    service = ServiceWorker(loop=None, cb_handler=cb_handler, config=config.get_named_config(),
+                            max_in_flight=4, ordering_key=lambda msg: msg.data[0])
+    service.sc = SC()
+
+    for data in ('a1', 'a2', 'b1', 'b2'):
+        await service._dispatch(SimpleNamespace(data=data, sequence=data))  # pylint: disable=protected-access
+    await asyncio.sleep(0.1)
+
+    # a2 waits on a1, while b carries on
+    assert ('start', 'a2') not in events
+    assert ('end', 'b1') in events
+
+    release.set()
+    await service.close()
+
+    assert events.index(('end', 'a1')) < events.index(('start', 'a2'))
+    assert sorted(acked) == ['a1', 'a2', 'b1']
+    assert not service._key_tails  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_failed_message_holds_its_key():
+    """Assert that the messages after a failed one with the same key wait for it to be delivered again."""
+    handled = []
+    acked = []
+    failures = {'a1': 1}
+
+    async def cb_handler(msg):
+        if failures.get(msg.data):
+            failures[msg.data] -= 1
+            raise Exception('failed')
+        handled.append(msg.data)
+
+    class SC():
+        async def ack(self, msg):
+            acked.append(msg.data)
+
+    service = ServiceWorker(loop=None, cb_handler=cb_handler, config=config.get_named_config(),
+                            max_in_flight=4, ordering_key=lambda msg: msg.data[0])
+    service.sc = SC()
+
+    def message(data):
+        return SimpleNamespace(data=data, sequence=data)
+
+    for data in ('a1', 'a2', 'b1', 'a3'):
+        await service._dispatch(message(data))  # pylint: disable=protected-access
+    await asyncio.sleep(0.1)
+
+    # the head of key a failed, so the rest of a is neither handled nor acked, while b carries on
+    assert handled == ['b1']
+    assert acked == ['b1']
+
+    # a new message with the key waits too, until the failed one is delivered again
+    await service._dispatch(message('a4'))  # pylint: disable=protected-access
+    await asyncio.sleep(0.1)
+    assert acked == ['b1']
+
+    for data in ('a1', 'a2', 'a3', 'a4'):
+        await service._dispatch(message(data))  # pylint: disable=protected-access
+    await service.close()
+
+    assert handled == ['b1', 'a1', 'a2', 'a3', 'a4']
+    assert acked == ['b1', 'a1', 'a2', 'a3', 'a4']
+    assert not service._failed_keys  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_failing_message_dropped_after_max_deliveries():
+    """Assert that a message that keeps failing is dropped after max_deliveries, releasing its key."""
+    handled = []
+    acked = []
+
+    async def cb_handler(msg):
+        if msg.data == 'a1':
+            raise Exception('failed')
+        handled.append(msg.data)
+
+    class SC():
+        async def ack(self, msg):
+            acked.append(msg.data)
+
+    service = ServiceWorker(loop=None, cb_handler=cb_handler, config=config.get_named_config(),
+                            max_in_flight=4, ordering_key=lambda msg: msg.data[0], max_deliveries=2)
+    service.sc = SC()
+
+    def message(data):
+        return SimpleNamespace(data=data, sequence=data)
+
+    for data in ('a1', 'a2', 'b1'):
+        await service._dispatch(message(data))  # pylint: disable=protected-access
+    await asyncio.sleep(0.1)
+    assert acked == ['b1']
+
+    # the second failure drops a1, so a2 carries on when it is delivered again
+    for data in ('a1', 'a2'):
+        await service._dispatch(message(data))  # pylint: disable=protected-access
+    await service.close()
+
+    assert handled == ['b1', 'a2']
+    assert acked == ['b1', 'a1', 'a2']
+    assert not service._failed_keys  # pylint: disable=protected-access
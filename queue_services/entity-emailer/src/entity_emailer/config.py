@@ -69,6 +69,13 @@ class _Config():  # pylint: disable=too-few-public-methods
     PAY_API_URL = os.getenv('PAY_API_URL', None)
     AUTH_URL = os.getenv('AUTH_URL', None)
     ACCOUNT_SVC_AUTH_URL = os.getenv('ACCOUNT_SVC_AUTH_URL', None)
+    # timeouts, <UPSTREAM>_SVC_TIMEOUT overrides HTTP_TIMEOUT, the reports are rendered on request
+    LEGAL_SVC_TIMEOUT = os.getenv('LEGAL_SVC_TIMEOUT', '60')
+    # attachments, fetched concurrently and kept a while for the emails sent again
+    EMAIL_ATTACHMENT_MAX_WORKERS = int(os.getenv('EMAIL_ATTACHMENT_MAX_WORKERS', '4'))
+    EMAIL_ATTACHMENT_TIMEOUT = int(os.getenv('EMAIL_ATTACHMENT_TIMEOUT', '120'))
+    EMAIL_ATTACHMENT_CACHE_SIZE = int(os.getenv('EMAIL_ATTACHMENT_CACHE_SIZE', '20'))
+    EMAIL_ATTACHMENT_CACHE_TIMEOUT = int(os.getenv('EMAIL_ATTACHMENT_CACHE_TIMEOUT', '600'))
     # secrets
     ACCOUNT_SVC_CLIENT_ID = os.getenv('ACCOUNT_SVC_CLIENT_ID', None)
     ACCOUNT_SVC_CLIENT_SECRET = os.getenv('ACCOUNT_SVC_CLIENT_SECRET', None)
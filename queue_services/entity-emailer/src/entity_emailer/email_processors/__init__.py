@@ -18,19 +18,71 @@ Processors hold the business logic for how an email is interpreted and sent.
 from __future__ import annotations
 
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
+from typing import Optional
 
-import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
 from legal_api.models import Business, Filing
+from legal_api.services import NameXService, Upstream, http_client
 from legal_api.utils.legislation_datetime import LegislationDatetime
 
 
-def get_filing_info(filing_id: str) -> (Filing, dict, dict, str, str):
+class EmailContext():
+    """The records an email is built from, each loaded once for the message.
+
+    The json of a filing is built anew, with its related records queried, every time the model is asked for it,
+    so the processors take it from here.
+    """
+
+    def __init__(self, email_info: dict):
+        """Create the context of the email part of a message."""
+        self.email_info = email_info
+
+    @cached_property
+    def filing(self) -> Optional[Filing]:
+        """Return the filing of the email."""
+        filing_id = self.email_info.get('filingId')
+        return Filing.find_by_id(filing_id) if filing_id else None
+
+    @cached_property
+    def business(self) -> Optional[Business]:
+        """Return the business of the email, by identifier, by id, or else of the filing."""
+        if identifier := self.email_info.get('identifier'):
+            return Business.find_by_identifier(identifier)
+        if business_id := self.email_info.get('businessId'):
+            return Business.find_by_internal_id(business_id)
+        if self.filing and self.filing.business_id:
+            return Business.find_by_internal_id(self.filing.business_id)
+        return None
+
+    @cached_property
+    def filing_json(self) -> dict:
+        """Return the json of the filing, as the legal-api renders it."""
+        return self.filing.json
+
+    @cached_property
+    def additional_info(self) -> dict:
+        """Return any additional info required for the filing type."""
+        additional_info = {}
+        filing = self.filing
+        if filing.filing_type == 'correction':
+            original_filing_type = filing.filing_json['filing']['correction']['correctedFilingType']
+            if original_filing_type == 'incorporationApplication':
+                additional_info['nameChange'] = NameXService.has_correction_changed_name(filing.filing_json)
+        elif filing.filing_type == 'alteration':
+            name_request = filing.filing_json.get('filing', {}).get('alteration', {}).get('nameRequest', None)
+            business = filing.filing_json.get('filing', {}).get('business', {})
+            additional_info['nameChange'] = name_request and 'legalName' in name_request and \
+                name_request['legalName'] != business.get('legalName', None)
+        return additional_info
+
+
+def get_filing_info(context: EmailContext) -> (Filing, dict, str, str):
     """Get filing info for the email."""
-    filing = Filing.find_by_id(filing_id)
-    business = (filing.json)['filing']['business']
+    filing = context.filing
+    business = context.filing_json['filing']['business']
 
     filing_date = datetime.fromisoformat(filing.filing_date.isoformat())
     leg_tmz_filing_date = LegislationDatetime.as_legislation_timezone(filing_date)
@@ -76,7 +128,8 @@ def get_recipient_from_auth(identifier: str, token: str) -> str:
         'Authorization': f'Bearer {token}'
     }
 
-    contact_info = requests.get(
+    contact_info = http_client.get(
+        Upstream.AUTH,
         f'{current_app.config.get("AUTH_URL")}/entities/{identifier}',
         headers=headers
     )
@@ -21,7 +21,7 @@ from entity_queue_common.service_utils import logger
 from flask import current_app
 from jinja2 import Template
 
-from entity_emailer.email_processors import get_filing_info, get_recipients, substitute_template_parts
+from entity_emailer.email_processors import EmailContext, get_filing_info, get_recipients, substitute_template_parts
 
 
 def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, , too-many-branches
@@ -29,8 +29,9 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     logger.debug('filing_notification: %s', email_info)
 
     # get template vars from filing
-    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = \
-        get_filing_info(email_info['data']['filing']['header']['filingId'])
+    context = EmailContext({'filingId': email_info['data']['filing']['header']['filingId']})
+    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(context)
+    filing_json = context.filing_json
     filing_type = filing.filing_type
     status = filing.status
     filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
@@ -39,15 +40,15 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     filled_template = substitute_template_parts(template)
     # render template with vars
     jnja_template = Template(filled_template, autoescape=True)
-    filing_data = (filing.json)['filing'][f'{filing_type}']
+    filing_data = filing_json['filing'][f'{filing_type}']
     html_out = jnja_template.render(
         business=business,
         filing=filing_data,
-        header=(filing.json)['filing']['header'],
+        header=filing_json['filing']['header'],
         filing_date_time=leg_tmz_filing_date,
         effective_date_time=leg_tmz_effective_date,
         entity_dashboard_url=current_app.config.get('DASHBOARD_URL') +
-        (filing.json)['filing']['business'].get('identifier', ''),
+        filing_json['filing']['business'].get('identifier', ''),
         email_header=filing_name.upper(),
         filing_type=filing_type
     )
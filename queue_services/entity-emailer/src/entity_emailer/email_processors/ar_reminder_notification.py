@@ -19,20 +19,21 @@ from pathlib import Path
 from entity_queue_common.service_utils import logger
 from flask import current_app
 from jinja2 import Template
-from legal_api.models import Business, CorpType
+from legal_api.models import CorpType
 
-from entity_emailer.email_processors import get_recipient_from_auth, substitute_template_parts
+from entity_emailer.email_processors import EmailContext, get_recipient_from_auth, substitute_template_parts
 
 
-def process(email_msg: dict, token: str) -> dict:
+def process(email_msg: dict, token: str, context: EmailContext = None) -> dict:
     """Build the email for annual report reminder notification."""
     logger.debug('ar_reminder_notification: %s', email_msg)
+    context = context or EmailContext(email_msg)
     ar_fee = email_msg['arFee']
     ar_year = email_msg['arYear']
     # get template and fill in parts
     template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/AR-REMINDER.html').read_text()
     filled_template = substitute_template_parts(template)
-    business = Business.find_by_internal_id(email_msg['businessId'])
+    business = context.business
     corp_type = CorpType.find_by_id(business.legal_type)
 
     # render template with vars
@@ -19,21 +19,22 @@ from pathlib import Path
 from entity_queue_common.service_utils import logger
 from flask import current_app
 from jinja2 import Template
-from legal_api.models import Business, Filing
+from legal_api.models import Filing
 
-from entity_emailer.email_processors import get_recipients, substitute_template_parts
+from entity_emailer.email_processors import EmailContext, get_recipients, substitute_template_parts
 
 
-def process(email_msg: dict) -> dict:
+def process(email_msg: dict, context: EmailContext = None) -> dict:
     """Build the email for Business Number notification."""
     logger.debug('bn notification: %s', email_msg)
+    context = context or EmailContext(email_msg)
 
     # get template and fill in parts
     template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/BC-BN.html').read_text()
     filled_template = substitute_template_parts(template)
 
     # get filing and business json
-    business = Business.find_by_identifier(email_msg['identifier'])
+    business = context.business
     filing = (Filing.get_a_businesses_most_recent_filing_of_a_type(business.id, 'incorporationApplication'))
 
     # render template with vars
@@ -15,19 +15,26 @@
 from __future__ import annotations
 
 import base64
+import contextlib
+import functools
+import io
 import re
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
 
-import requests
 from entity_queue_common.service_utils import logger
-from flask import current_app
+from flask import Flask, current_app
 from jinja2 import Template
-from legal_api.models import Business, Filing
-from legal_api.services import NameXService
+from legal_api.models import Filing
+from legal_api.services import Upstream, http_client
+from legal_api.utils.cache import LRUCache
 from sentry_sdk import capture_message
 
-from entity_emailer.email_processors import get_filing_info, get_recipients, substitute_template_parts
+from entity_emailer.email_processors import EmailContext, get_filing_info, get_recipients, substitute_template_parts
 
 
 FILING_TYPE_CONVERTER = {
@@ -39,6 +46,13 @@ FILING_TYPE_CONVERTER = {
     'correction': 'CRCTN'
 }
 
+# a multiple of 3, so the base64 of the chunks can be joined
+ENCODE_CHUNK_SIZE = 3 * 64 * 1024
+
+_cache: Optional[LRUCache] = None  # pylint: disable=invalid-name
+_executor: Optional[ThreadPoolExecutor] = None  # pylint: disable=invalid-name
+_lock = threading.Lock()  # pylint: disable=invalid-name
+
 
 def _get_pdfs(
         status: str,
@@ -46,7 +60,8 @@ def _get_pdfs(
         business: dict,
         filing: Filing,
         filing_date_time: str,
-        effective_date: str) -> list:
+        effective_date: str,
+        context: EmailContext) -> list:
     # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-arguments
     """Get the pdfs for the incorporation output."""
     pdfs = []
@@ -57,16 +72,45 @@ def _get_pdfs(
     if filing.filing_type == 'correction':
         original_filing_type = filing.filing_json['filing']['correction']['correctedFilingType']
     if status == Filing.Status.PAID.value:
+        # the filing pdf and the receipt are fetched at the same time
+        if filing.filing_type == 'incorporationApplication' or (filing.filing_type == 'correction' and
+                                                                original_filing_type == 'incorporationApplication'):
+            corp_name = filing.filing_json['filing']['incorporationApplication']['nameRequest'].get(
+                'legalName', 'Numbered Company')
+        else:
+            corp_name = business.get('legalName')
+
+        business_data = context.business
+        # the receipt is the same for every status of the filing
+        attachments = _get_attachments(filing.id, {
+            f'{status}/filing': (HTTPStatus.OK, functools.partial(
+                http_client.get,
+                Upstream.LEGAL,
+                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
+                headers=headers,
+                stream=True
+            )),
+            'receipt': (HTTPStatus.CREATED, functools.partial(
+                http_client.post,
+                Upstream.PAY,
+                f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
+                json={
+                    'corpName': corp_name,
+                    'filingDateTime': filing_date_time,
+                    'effectiveDateTime': effective_date,
+                    'filingIdentifier': str(filing.id),
+                    'businessNumber': business_data.tax_id if business_data and business_data.tax_id else ''
+                },
+                headers=headers,
+                stream=True
+            ))
+        })
+
         # add filing pdf
-        filing_pdf = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-            headers=headers
-        )
-        if filing_pdf.status_code != HTTPStatus.OK:
+        if (filing_pdf_encoded := attachments.get(f'{status}/filing')) is None:
             logger.error('Failed to get pdf for filing: %s', filing.id)
             capture_message(f'Email Queue: filing id={filing.id}, error=pdf generation', level='error')
         else:
-            filing_pdf_encoded = base64.b64encode(filing_pdf.content)
             if filing.filing_type == 'correction':
                 file_name = original_filing_type[0].upper() + \
                     ' '.join(re.findall('[a-zA-Z][^A-Z]*', original_filing_type[1:]))
@@ -80,123 +124,159 @@ def _get_pdfs(
             pdfs.append(
                 {
                     'fileName': f'{file_name}.pdf',
-                    'fileBytes': filing_pdf_encoded.decode('utf-8'),
+                    'fileBytes': filing_pdf_encoded,
                     'fileUrl': '',
                     'attachOrder': '1'
                 }
             )
         # add receipt pdf
-        if filing.filing_type == 'incorporationApplication' or (filing.filing_type == 'correction' and
-                                                                original_filing_type == 'incorporationApplication'):
-            corp_name = filing.filing_json['filing']['incorporationApplication']['nameRequest'].get(
-                'legalName', 'Numbered Company')
-        else:
-            corp_name = business.get('legalName')
-
-        business_data = Business.find_by_internal_id(filing.business_id)
-        receipt = requests.post(
-            f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
-            json={
-                'corpName': corp_name,
-                'filingDateTime': filing_date_time,
-                'effectiveDateTime': effective_date,
-                'filingIdentifier': str(filing.id),
-                'businessNumber': business_data.tax_id if business_data.tax_id else ''
-            },
-            headers=headers
-        )
-        if receipt.status_code != HTTPStatus.CREATED:
+        if (receipt_encoded := attachments.get('receipt')) is None:
             logger.error('Failed to get receipt pdf for filing: %s', filing.id)
             capture_message(f'Email Queue: filing id={filing.id}, error=receipt generation', level='error')
         else:
-            receipt_encoded = base64.b64encode(receipt.content)
             pdfs.append(
                 {
                     'fileName': 'Receipt.pdf',
-                    'fileBytes': receipt_encoded.decode('utf-8'),
+                    'fileBytes': receipt_encoded,
                     'fileUrl': '',
                     'attachOrder': '2'
                 }
             )
     if status == Filing.Status.COMPLETED.value:
-        # add notice of articles
-        noa = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-            '?type=noa',
-            headers=headers
-        )
-        if noa.status_code != HTTPStatus.OK:
-            logger.error('Failed to get noa pdf for filing: %s', filing.id)
-            capture_message(f'Email Queue: filing id={filing.id}, error=noa generation', level='error')
-        else:
-            noa_encoded = base64.b64encode(noa.content)
+        # the documents of the filing, rendered together by the legal-api
+        documents = [('noa', 'Notice of Articles.pdf', '1')]
+        if filing.filing_type == 'incorporationApplication' or (filing.filing_type == 'correction' and
+                                                                original_filing_type == 'incorporationApplication' and
+                                                                context.additional_info.get('nameChange', False)):
+            file_name = 'Incorporation Certificate (Corrected).pdf' if filing.filing_type == 'correction' \
+                else 'Incorporation Certificate.pdf'
+            documents.append(('certificate', file_name, '2'))
+        if filing.filing_type == 'alteration' and context.additional_info.get('nameChange', False):
+            documents.append(('certificateOfNameChange', 'Certificate of Name Change.pdf', '2'))
+
+        rendered = _get_documents(business['identifier'], filing.id, status, [document[0] for document in documents],
+                                  headers)
+        for report_type, file_name, attach_order in documents:
+            if (encoded := rendered.get(report_type)) is None:
+                logger.error('Failed to get %s pdf for filing: %s', report_type, filing.id)
+                capture_message(f'Email Queue: filing id={filing.id}, error={report_type} generation', level='error')
+                continue
             pdfs.append(
                 {
-                    'fileName': 'Notice of Articles.pdf',
-                    'fileBytes': noa_encoded.decode('utf-8'),
+                    'fileName': file_name,
+                    'fileBytes': encoded,
                     'fileUrl': '',
-                    'attachOrder': '1'
+                    'attachOrder': attach_order
                 }
             )
 
-        if filing.filing_type == 'incorporationApplication' or (filing.filing_type == 'correction' and
-                                                                original_filing_type == 'incorporationApplication' and
-                                                                get_additional_info(filing).get('nameChange', False)):
-            # add certificate
-            certificate = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                '?type=certificate',
-                headers=headers
-            )
-            if certificate.status_code != HTTPStatus.OK:
-                logger.error('Failed to get certificate pdf for filing: %s', filing.id)
-                capture_message(f'Email Queue: filing id={filing.id}, error=certificate generation', level='error')
-            else:
-                certificate_encoded = base64.b64encode(certificate.content)
-                file_name = 'Incorporation Certificate (Corrected).pdf' if filing.filing_type == 'correction' \
-                    else 'Incorporation Certificate.pdf'
-                pdfs.append(
-                    {
-                        'fileName': file_name,
-                        'fileBytes': certificate_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': '2'
-                    }
-                )
-
-        if filing.filing_type == 'alteration' and get_additional_info(filing).get('nameChange', False):
-            # add certificate of name change
-            certificate = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                '?type=certificateOfNameChange',
-                headers=headers
-            )
-            if certificate.status_code != HTTPStatus.OK:
-                logger.error('Failed to get certificateOfNameChange pdf for filing: %s', filing.id)
-                capture_message(f'Email Queue: filing id={filing.id}, error=certificateOfNameChange generation',
-                                level='error')
-            else:
-                certificate_encoded = base64.b64encode(certificate.content)
-                file_name = 'Certificate of Name Change.pdf'
-                pdfs.append(
-                    {
-                        'fileName': file_name,
-                        'fileBytes': certificate_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': '2'
-                    }
-                )
-
     return pdfs
 
 
-def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, , too-many-branches
+def _get_attachments(filing_id: int, fetches: Dict[str, Tuple[HTTPStatus, Callable]]) -> dict:
+    """Return the attachments of a filing base64 encoded, by name, leaving out the ones that failed.
+
+    The attachments not already kept from an earlier email of the filing are fetched concurrently.
+    """
+    cache = _get_cache()
+    app = current_app._get_current_object()  # pylint: disable=protected-access; for the pool threads
+    attachments = {}
+    futures = {}
+    for name, (expected_status, fetch) in fetches.items():
+        if (cached := cache.get(f'{filing_id}/{name}')) is not None:
+            attachments[name] = cached
+        else:
+            futures[name] = _get_executor().submit(_fetch_attachment, app, expected_status, fetch)
+
+    timeout = float(current_app.config.get('EMAIL_ATTACHMENT_TIMEOUT', 120))
+    for name, future in futures.items():
+        try:
+            if (encoded := future.result(timeout)) is not None:
+                cache.set(f'{filing_id}/{name}', encoded)
+                attachments[name] = encoded
+        except Exception as err:  # noqa B902; pylint: disable=broad-except; the attachment is left out
+            logger.error('Failed to fetch the %s attachment of filing: %s, error: %s', name, filing_id, err)
+    return attachments
+
+
+def _fetch_attachment(app: Flask, expected_status: HTTPStatus, fetch: Callable) -> Optional[str]:
+    """Fetch an attachment in a pool thread, returning it base64 encoded, or None if it failed."""
+    with app.app_context():
+        with contextlib.closing(fetch()) as response:
+            if response.status_code != expected_status:
+                return None
+            return _encode(response)
+
+
+def _encode(response) -> str:
+    """Base64 encode a streamed response a chunk at a time, rather than holding a copy of the whole content."""
+    parts = []
+    rest = b''
+    for chunk in response.iter_content(chunk_size=ENCODE_CHUNK_SIZE):
+        chunk = rest + chunk
+        cut = len(chunk) - len(chunk) % 3
+        parts.append(base64.b64encode(chunk[:cut]).decode('utf-8'))
+        rest = chunk[cut:]
+    parts.append(base64.b64encode(rest).decode('utf-8'))
+    return ''.join(parts)
+
+
+def _get_documents(identifier: str, filing_id: int, status: str, report_types: list, headers: dict) -> dict:
+    """Get the documents of a filing from the legal-api in one request, base64 encoded by report type."""
+    cache = _get_cache()
+    documents = {report_type: cache.get(f'{filing_id}/{status}/{report_type}') for report_type in report_types}
+    if all(encoded is not None for encoded in documents.values()):
+        return documents
+
+    response = http_client.get(
+        Upstream.LEGAL,
+        f'{current_app.config.get("LEGAL_API_URL")}/businesses/{identifier}/filings/{filing_id}',
+        params={'types': ','.join(report_types)},
+        headers={**headers, 'Accept': 'application/zip'}
+    )
+    if response.status_code != HTTPStatus.OK:
+        return {}
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+        for report_type in report_types:
+            if f'{report_type}.pdf' in zip_file.namelist():
+                documents[report_type] = base64.b64encode(zip_file.read(f'{report_type}.pdf')).decode('utf-8')
+                cache.set(f'{filing_id}/{status}/{report_type}', documents[report_type])
+    return {report_type: encoded for report_type, encoded in documents.items() if encoded is not None}
+
+
+def _get_cache() -> LRUCache:
+    """Return the attachments kept for the emails of the same filing, e.g. when an email is sent again."""
+    global _cache  # pylint: disable=global-statement,invalid-name
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = LRUCache(threshold=int(current_app.config.get('EMAIL_ATTACHMENT_CACHE_SIZE', 20)),
+                                  default_timeout=int(current_app.config.get('EMAIL_ATTACHMENT_CACHE_TIMEOUT', 600)))
+    return _cache
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the pool fetching the attachments, sized by EMAIL_ATTACHMENT_MAX_WORKERS."""
+    global _executor  # pylint: disable=global-statement,invalid-name
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(current_app.config.get('EMAIL_ATTACHMENT_MAX_WORKERS', 4)),
+                    thread_name_prefix='attachments')
+    return _executor
+
+
+def process(email_info: dict, token: str, context: EmailContext = None) -> dict:
+    # pylint: disable=too-many-locals, too-many-branches
     """Build the email for Business Number notification."""
     logger.debug('filing_notification: %s', email_info)
+    context = context or EmailContext(email_info)
     # get template and fill in parts
     filing_type, status = email_info['type'], email_info['option']
     # get template vars from filing
-    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(email_info['filingId'])
+    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(context)
+    filing_json = context.filing_json
     if filing_type == 'correction':
         original_filing_type = filing.filing_json['filing']['correction']['correctedFilingType']
         if original_filing_type != 'incorporationApplication':
@@ -219,23 +299,23 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     filled_template = substitute_template_parts(template)
     # render template with vars
     jnja_template = Template(filled_template, autoescape=True)
-    filing_data = (filing.json)['filing'][f'{original_filing_type}'] if filing_type == 'correction' \
-        else (filing.json)['filing'][f'{filing_type}']
+    filing_data = filing_json['filing'][f'{original_filing_type}'] if filing_type == 'correction' \
+        else filing_json['filing'][f'{filing_type}']
     html_out = jnja_template.render(
         business=business,
         filing=filing_data,
-        header=(filing.json)['filing']['header'],
+        header=filing_json['filing']['header'],
         filing_date_time=leg_tmz_filing_date,
         effective_date_time=leg_tmz_effective_date,
         entity_dashboard_url=current_app.config.get('DASHBOARD_URL') +
-        (filing.json)['filing']['business'].get('identifier', ''),
+        filing_json['filing']['business'].get('identifier', ''),
         email_header=filing_name.upper(),
         filing_type=filing_type,
-        additional_info=get_additional_info(filing)
+        additional_info=context.additional_info
     )
 
     # get attachments
-    pdfs = _get_pdfs(status, token, business, filing, leg_tmz_filing_date, leg_tmz_effective_date)
+    pdfs = _get_pdfs(status, token, business, filing, leg_tmz_filing_date, leg_tmz_effective_date, context)
 
     # get recipients
     recipients = get_recipients(status, filing.filing_json, token)
@@ -284,19 +364,3 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
             'attachments': pdfs
         }
     }
-
-
-def get_additional_info(filing: Filing) -> dict:
-    """Populate any additional info required for a filing type."""
-    additional_info = {}
-    if filing.filing_type == 'correction':
-        original_filing_type = filing.filing_json['filing']['correction']['correctedFilingType']
-        if original_filing_type == 'incorporationApplication':
-            additional_info['nameChange'] = NameXService.has_correction_changed_name(filing.filing_json)
-    elif filing.filing_type == 'alteration':
-        name_request = filing.filing_json.get('filing', {}).get('alteration', {}).get('nameRequest', None)
-        business = filing.filing_json.get('filing', {}).get('business', {})
-        additional_info['nameChange'] = name_request and 'legalName' in name_request and \
-            name_request['legalName'] != business.get('legalName', None)
-
-    return additional_info
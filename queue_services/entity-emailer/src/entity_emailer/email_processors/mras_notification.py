@@ -20,25 +20,26 @@ from entity_queue_common.service_utils import logger
 from flask import current_app
 from jinja2 import Template
 
-from entity_emailer.email_processors import get_filing_info, get_recipients, substitute_template_parts
+from entity_emailer.email_processors import EmailContext, get_filing_info, get_recipients, substitute_template_parts
 
 
-def process(email_msg: dict) -> dict:
+def process(email_msg: dict, context: EmailContext = None) -> dict:
     """Build the email for mras notification."""
     logger.debug('mras_notification: %s', email_msg)
+    context = context or EmailContext(email_msg)
     filing_type = email_msg['type']
     # get template and fill in parts
     template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/BC-MRAS.html').read_text()
     filled_template = substitute_template_parts(template)
     # get template info from filing
-    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(email_msg['filingId'])
+    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(context)
 
     # render template with vars
     jnja_template = Template(filled_template, autoescape=True)
     html_out = jnja_template.render(
         business=business,
-        filing=(filing.json)['filing']['incorporationApplication'],
-        header=(filing.json)['filing']['header'],
+        filing=context.filing_json['filing']['incorporationApplication'],
+        header=context.filing_json['filing']['header'],
         filing_date_time=leg_tmz_filing_date,
         effective_date_time=leg_tmz_effective_date,
         filing_type=filing_type
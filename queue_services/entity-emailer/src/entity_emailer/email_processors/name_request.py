@@ -18,11 +18,10 @@ import base64
 from http import HTTPStatus
 from pathlib import Path
 
-import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
 from jinja2 import Template
-from legal_api.services import NameXService
+from legal_api.services import NameXService, Upstream, http_client
 from sentry_sdk import capture_message
 
 from entity_emailer.email_processors import substitute_template_parts
@@ -80,7 +79,8 @@ def _get_pdfs(nr_id: str, payment_token: str) -> list:
         return []
 
     # get nr payments
-    nr_payments = requests.get(
+    nr_payments = http_client.get(
+        Upstream.NAMEX,
         f'{current_app.config.get("NAMEX_SVC_URL")}payments/{nr_id}',
         json={},
         headers={
@@ -105,7 +105,8 @@ def _get_pdfs(nr_id: str, payment_token: str) -> list:
         return []
 
     # get receipt
-    receipt = requests.post(
+    receipt = http_client.post(
+        Upstream.NAMEX,
         f'{current_app.config.get("NAMEX_SVC_URL")}payments/{payment_id}/receipt',
         json={},
         headers={
@@ -133,19 +134,7 @@ def _get_pdfs(nr_id: str, payment_token: str) -> list:
 
 def get_nr_bearer_token():
     """Get a valid Bearer token for the Name Request Service."""
-    token_url = current_app.config.get('NAMEX_AUTH_SVC_URL')
-    client_id = current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME')
-    client_secret = current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET')
-
-    data = 'grant_type=client_credentials'
-    # get service account token
-    res = requests.post(url=token_url,
-                        data=data,
-                        headers={'content-type': 'application/x-www-form-urlencoded'},
-                        auth=(client_id, client_secret))
-    try:
-        return res.json().get('access_token')
-    except Exception:  # noqa B902; pylint: disable=W0703;
+    if not (token := NameXService.get_bearer_token()):
         logger.error('Failed to get nr token')
         capture_message('Failed to get nr token', level='error')
-        return None
+    return token
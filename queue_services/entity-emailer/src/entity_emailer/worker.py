@@ -24,24 +24,28 @@ If these constraints change, the use of Flask-SQLAlchemy would need to change.
 Flask-SQLAlchemy currently allows the base model to be changed, or reworking
 the model to a standalone SQLAlchemy usage with an async engine would need
 to be pursued.
+
+The email itself is built and sent in a worker thread, with its own app context,
+so the waits on the other services don't stall the loop and its STAN heartbeats.
 """
 import json
 import os
 from http import HTTPStatus
 
 import nats
-import requests
 from entity_queue_common.service import QueueServiceManager
-from entity_queue_common.service_utils import EmailException, QueueException, logger
+from entity_queue_common.service_utils import EmailException, QueueException, logger, run_blocking
 from flask import Flask
 from legal_api import db
 from legal_api.models import Filing
+from legal_api.services import Upstream, http_client
 from legal_api.services.bootstrap import AccountService
 from sentry_sdk import capture_message
 from sqlalchemy.exc import OperationalError
 
 from entity_emailer import config
 from entity_emailer.email_processors import (
+    EmailContext,
     affiliation_notification,
     ar_reminder_notification,
     bn_notification,
@@ -73,7 +77,8 @@ async def publish_event(payload: dict):
 
 def send_email(email: dict, token: str):
     """Send the email."""
-    resp = requests.post(
+    resp = http_client.post(
+        Upstream.NOTIFY,
         f'{APP_CONFIG.NOTIFY_API_URL}',
         json=email,
         headers={
@@ -113,20 +118,22 @@ def process_email(email_msg: dict, flask_app: Flask):  # pylint: disable=too-man
         else:
             etype = email_msg['email']['type']
             option = email_msg['email']['option']
+            # the filing and business of the email, loaded once whichever processor builds it
+            context = EmailContext(email_msg['email'])
             if etype == 'businessNumber':
-                email = bn_notification.process(email_msg['email'])
+                email = bn_notification.process(email_msg['email'], context)
                 send_email(email, token)
             elif etype == 'incorporationApplication' and option == 'mras':
-                email = mras_notification.process(email_msg['email'])
+                email = mras_notification.process(email_msg['email'], context)
                 send_email(email, token)
             elif etype == 'annualReport' and option == 'reminder':
-                email = ar_reminder_notification.process(email_msg['email'], token)
+                email = ar_reminder_notification.process(email_msg['email'], token, context)
                 send_email(email, token)
             elif etype in filing_notification.FILING_TYPE_CONVERTER.keys():
                 if etype == 'annualReport' and option == Filing.Status.COMPLETED.value:
                     logger.debug('No email to send for: %s', email_msg)
                 else:
-                    email = filing_notification.process(email_msg['email'], token)
+                    email = filing_notification.process(email_msg['email'], token, context)
                     if email:
                         send_email(email, token)
                     else:
@@ -148,7 +155,8 @@ async def cb_subscription_handler(msg: nats.aio.client.Msg):
             process_message, tracker_msg = tracker_util.is_processable_message(message_context_properties)
             if process_message:
                 tracker_msg = tracker_util.start_tracking_message(message_context_properties, email_msg, tracker_msg)
-                process_email(email_msg, FLASK_APP)
+                # the processors make blocking database and http calls, so keep them off the event loop
+                await run_blocking(process_email, email_msg, FLASK_APP)
                 tracker_util.complete_tracking_message(tracker_msg)
             else:
                 # Skip processing of message due to message state - previously processed or currently being
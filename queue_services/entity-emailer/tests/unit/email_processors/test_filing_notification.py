@@ -12,12 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """The Unit Tests for the Incorporation email processor."""
+import base64
+import io
+import zipfile
+from http import HTTPStatus
 from unittest.mock import patch
 
 import pytest
 from legal_api.models import Business
 
-from entity_emailer.email_processors import filing_notification
+from entity_emailer.email_processors import EmailContext, filing_notification
 from tests.unit import prep_incorp_filing, prep_incorporation_correction_filing, prep_maintenance_filing
 
 
@@ -49,6 +53,25 @@ def test_incorp_notification(app, session, status):
         assert mock_get_pdfs.call_args[0][3] == filing
 
 
+def test_filing_notification_queries(app, session, count_queries):
+    """Assert that the filing of an email is loaded and rendered once, not again by the processor."""
+    filing = prep_incorp_filing(session, 'BC1234567', '1', 'PAID')
+    email_info = {'filingId': filing.id, 'type': 'incorporationApplication', 'option': 'PAID'}
+
+    context = EmailContext(email_info)
+    with count_queries() as statements:
+        assert context.filing_json['filing']['header']['filingId'] == filing.id
+        assert context.business.identifier == 'BC1234567'
+        loaded = len(statements)
+        assert loaded
+
+        with patch.object(filing_notification, '_get_pdfs', return_value=[]) as mock_get_pdfs:
+            email = filing_notification.process(email_info, 'token', context)
+        assert email['content']['body']
+        assert mock_get_pdfs.call_args[0][6] is context
+        assert len(statements) == loaded
+
+
 @pytest.mark.parametrize(['status', 'has_name_change_with_new_nr'], [
     ('PAID', True),
     ('COMPLETED', True),
@@ -119,3 +142,92 @@ def test_maintenance_notification(app, session, status, filing_type):
             assert mock_get_recipients.call_args[0][0] == status
             assert mock_get_recipients.call_args[0][1] == filing.filing_json
             assert mock_get_recipients.call_args[0][2] == token
+
+
+class _FakeResponse:
+    """A streamed response of the given content."""
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.closed = False
+
+    def iter_content(self, chunk_size):  # pylint: disable=unused-argument; chunks of 7 bytes, not a multiple of 3
+        for start in range(0, len(self.content), 7):
+            yield self.content[start:start + 7]
+
+    def close(self):
+        self.closed = True
+
+
+def test_encode():
+    """Assert that a response streamed in chunks of any size is base64 encoded whole."""
+    content = bytes(range(256)) * 3
+    encoded = filing_notification._encode(_FakeResponse(200, content))  # pylint: disable=protected-access
+    assert encoded == base64.b64encode(content).decode('utf-8')
+
+
+def test_get_attachments_cached(app, monkeypatch):  # pylint: disable=protected-access
+    """Assert that the attachments are fetched once, kept for the next email, and left out when they fail."""
+    monkeypatch.setattr(filing_notification, '_cache', None)
+    responses = []
+
+    def fetch(status_code, content):
+        def fetch_response():
+            responses.append(_FakeResponse(status_code, content))
+            return responses[-1]
+        return fetch_response
+
+    fetches = {
+        'PAID/filing': (HTTPStatus.OK, fetch(HTTPStatus.OK, b'filing')),
+        'receipt': (HTTPStatus.CREATED, fetch(HTTPStatus.CREATED, b'receipt')),
+        'failed': (HTTPStatus.OK, fetch(HTTPStatus.INTERNAL_SERVER_ERROR, b''))
+    }
+    with app.app_context():
+        attachments = filing_notification._get_attachments(1, fetches)
+        assert attachments == {'PAID/filing': base64.b64encode(b'filing').decode('utf-8'),
+                               'receipt': base64.b64encode(b'receipt').decode('utf-8')}
+        assert len(responses) == 3
+        assert all(response.closed for response in responses)
+
+        assert filing_notification._get_attachments(1, fetches) == attachments
+        assert len(responses) == 4
+
+
+def _zip(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        for name, content in files.items():
+            zip_file.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_get_documents(app, monkeypatch, requests_mock):  # pylint: disable=protected-access
+    """Assert that the documents come from one zip request, with the ones missing from the zip left out."""
+    monkeypatch.setattr(filing_notification, '_cache', None)
+    monkeypatch.setitem(app.config, 'LEGAL_API_URL', 'https://legal-api.test/api/v1')
+    filings_url = 'https://legal-api.test/api/v1/businesses/BC1234567/filings'
+    requests_mock.get(f'{filings_url}/1', content=_zip({'noa.pdf': b'noa', 'certificate.pdf': b'certificate'}))
+    requests_mock.get(f'{filings_url}/2', content=_zip({'noa.pdf': b'noa'}))
+    requests_mock.get(f'{filings_url}/3', status_code=HTTPStatus.INTERNAL_SERVER_ERROR)
+    headers = {'Accept': 'application/pdf', 'Authorization': 'Bearer token'}
+
+    with app.app_context():
+        documents = filing_notification._get_documents('BC1234567', 1, 'COMPLETED', ['noa', 'certificate'], headers)
+        assert documents == {'noa': base64.b64encode(b'noa').decode('utf-8'),
+                             'certificate': base64.b64encode(b'certificate').decode('utf-8')}
+        assert requests_mock.call_count == 1
+        assert requests_mock.last_request.headers['Accept'] == 'application/zip'
+        assert requests_mock.last_request.qs == {'types': ['noa,certificate']}
+
+        # kept for the next email of the filing
+        assert filing_notification._get_documents('BC1234567', 1, 'COMPLETED', ['noa', 'certificate'],
+                                                  headers) == documents
+        assert requests_mock.call_count == 1
+
+        # a partial zip
+        assert filing_notification._get_documents('BC1234567', 2, 'COMPLETED', ['noa', 'certificate'], headers) == \
+            {'noa': base64.b64encode(b'noa').decode('utf-8')}
+
+        # a failed request
+        assert filing_notification._get_documents('BC1234567', 3, 'COMPLETED', ['noa'], headers) == {}
@@ -17,14 +17,15 @@
 """s2i based launch script to run the service."""
 import asyncio
 
-from entity_filer.worker import APP_CONFIG, cb_subscription_handler, qsm
+from entity_filer.worker import APP_CONFIG, cb_subscription_handler, get_message_ordering_key, qsm
 
 if __name__ == '__main__':
 
     event_loop = asyncio.get_event_loop()
     event_loop.run_until_complete(qsm.run(loop=event_loop,
                                           config=APP_CONFIG,
-                                          callback=cb_subscription_handler))
+                                          callback=cb_subscription_handler,
+                                          ordering_key=get_message_ordering_key))
     try:
         event_loop.run_forever()
     finally:
@@ -106,7 +106,14 @@ class _Config():  # pylint: disable=too-few-public-methods
         'subject': os.getenv('NATS_EMAILER_SUBJECT', 'entity.email'),
     }
 
+    # the filings of unrelated businesses are processed concurrently in this many lanes
+    FILER_LANES = int(os.getenv('FILER_LANES', '1'))
+    MAX_IN_FLIGHT = int(os.getenv('MAX_IN_FLIGHT', str(FILER_LANES)))
+    # a filing that fails this many deliveries is dropped, so it doesn't hold the later filings of its business
+    MAX_DELIVERIES = int(os.getenv('MAX_DELIVERIES', '10'))
+
     COLIN_API = os.getenv('COLIN_API', '')
+    COLIN_SVC_TIMEOUT = os.getenv('COLIN_SVC_TIMEOUT')
 
     # service accounts
     ACCOUNT_SVC_AUTH_URL = os.getenv('ACCOUNT_SVC_AUTH_URL')
@@ -118,8 +125,13 @@ class _Config():  # pylint: disable=too-few-public-methods
     ACCOUNT_SVC_ENTITY_URL = os.getenv('ACCOUNT_SVC_ENTITY_URL')
     ACCOUNT_SVC_AFFILIATE_URL = os.getenv('ACCOUNT_SVC_AFFILIATE_URL')
     LEGAL_API_URL = os.getenv('LEGAL_API_URL')
+    LEGAL_SVC_TIMEOUT = os.getenv('LEGAL_SVC_TIMEOUT', '60')
     NAMEX_API = os.getenv('NAMEX_API')
 
+    # ask the legal-api for the documents of a completed filing, so the rendered pdfs are stored,
+    # only of use with REPORT_PDF_STORE_ENABLED in the legal-api, otherwise the pdfs are rendered for nothing
+    PRERENDER_DOCUMENTS = os.getenv('PRERENDER_DOCUMENTS', 'false').lower() == 'true'
+
     # legislative timezone for future effective dating
     LEGISLATIVE_TIMEZONE = os.getenv('LEGISLATIVE_TIMEZONE', 'America/Vancouver')
 
@@ -139,6 +151,7 @@ class TestConfig(_Config):  # pylint: disable=too-few-public-methods
 
     DEBUG = True
     TESTING = True
+    PRERENDER_DOCUMENTS = False
     # POSTGRESQL
     DB_USER = os.getenv('DATABASE_TEST_USERNAME', '')
     DB_PASSWORD = os.getenv('DATABASE_TEST_PASSWORD', '')
@@ -16,10 +16,10 @@ import json
 from http import HTTPStatus
 from typing import Dict
 
-import requests
 from flask import current_app
 from flask_babel import _ as babel  # noqa: N813
 from legal_api.models import Business
+from legal_api.services import Upstream, http_client
 from legal_api.services.bootstrap import AccountService
 
 
@@ -45,12 +45,12 @@ def update_business_profile(business: Business, profile_info: Dict) -> Dict:
              }
         )
         url = ''.join([account_svc_entity_url, '/', business.identifier, '/contacts'])
-        rv = requests.post(
+        rv = http_client.post(
+            Upstream.ACCOUNT,
             url=url,
             headers={**AccountService.CONTENT_TYPE_JSON,
                      'Authorization': AccountService.BEARER + token},
-            data=data,
-            timeout=AccountService.timeout
+            data=data
         )
         if rv.status_code == HTTPStatus.OK or \
                 rv.status_code == HTTPStatus.CREATED:
@@ -64,12 +64,12 @@ def update_business_profile(business: Business, profile_info: Dict) -> Dict:
 
         if rv.status_code == HTTPStatus.BAD_REQUEST and \
                 'DATA_ALREADY_EXISTS' in rv.text:
-            put = requests.put(
+            put = http_client.put(
+                Upstream.ACCOUNT,
                 url=''.join([account_svc_entity_url, '/', business.identifier]),
                 headers={**AccountService.CONTENT_TYPE_JSON,
                          'Authorization': AccountService.BEARER + token},
-                data=data,
-                timeout=AccountService.timeout
+                data=data
             )
             if put.status_code == HTTPStatus.OK or \
                     put.status_code == HTTPStatus.CREATED:
@@ -0,0 +1,68 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Manages the documents of a completed filing.
+
+The legal-api keeps the PDFs it renders for a completed filing, so asking for them once the filing is
+processed means the emailer and the users are served the stored PDFs.
+This is best effort, a document that isn't rendered here is rendered when it is first asked for.
+It is only of use when the legal-api stores the PDFs, so PRERENDER_DOCUMENTS is off by default.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import List, Optional
+
+from entity_queue_common.service_utils import logger
+from flask import Flask
+from legal_api.models import Business, Filing
+from legal_api.services import DocumentMetaService, Upstream, http_client
+from legal_api.services.bootstrap import AccountService
+
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='documents')  # pylint: disable=invalid-name
+
+
+def prerender_documents(flask_app: Flask, business: Business, filing: Filing):
+    """Ask the legal-api for the documents of a completed filing, in the background.
+
+    The documents show the tax id of the business, so those of an incorporation are left until the tax id is
+    set, as the stored PDFs are keyed on the data of the report and would be rendered again.
+    """
+    if not flask_app.config.get('PRERENDER_DOCUMENTS') or filing.status != Filing.Status.COMPLETED.value:
+        return
+    if filing.filing_type == 'incorporationApplication' and not business.tax_id:
+        return
+    report_types = [document.get('reportType') for document in DocumentMetaService().get_documents(filing.json)]
+    if report_types:
+        _executor.submit(_render, flask_app, business.identifier, filing.id, report_types)
+
+
+def _render(flask_app: Flask, identifier: str, filing_id: int, report_types: List[Optional[str]]):
+    """Get each document of the filing from the legal-api, which stores the rendered PDF."""
+    with flask_app.app_context():
+        try:
+            token = AccountService.get_bearer_token()
+            url = f'{flask_app.config["LEGAL_API_URL"]}/businesses/{identifier}/filings/{filing_id}'
+            for report_type in report_types:
+                rv = http_client.get(
+                    Upstream.LEGAL,
+                    url,
+                    params={'type': report_type} if report_type else None,
+                    headers={'Accept': 'application/pdf',
+                             'Authorization': AccountService.BEARER + token}
+                )
+                if rv.status_code != HTTPStatus.OK:
+                    logger.warning('Unable to render the %s document of filing:%s, status:%s',
+                                   report_type or 'filing', filing_id, rv.status_code)
+        except Exception:  # pylint: disable=broad-except; the documents are rendered on first use instead
+            logger.warning('Unable to render the documents of filing:%s', filing_id, exc_info=True)
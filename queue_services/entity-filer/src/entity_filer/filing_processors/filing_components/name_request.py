@@ -15,11 +15,11 @@
 import json
 from http import HTTPStatus
 
-import requests
 import sentry_sdk
 from entity_queue_common.service_utils import QueueException
 from flask import current_app
 from legal_api.models import Business, Filing, RegistrationBootstrap
+from legal_api.services import Upstream, http_client
 from legal_api.services.bootstrap import AccountService
 from legal_api.services.utils import get_str
 
@@ -35,12 +35,12 @@ def consume_nr(business: Business, filing: Filing, nr_num_path='/filing/incorpor
 
             # Create an entity record
             data = json.dumps({'consume': {'corpNum': business.identifier}})
-            rv = requests.patch(
+            rv = http_client.patch(
+                Upstream.NAMEX,
                 url=''.join([namex_svc_url, nr_num]),
                 headers={**AccountService.CONTENT_TYPE_JSON,
                          'Authorization': AccountService.BEARER + token},
-                data=data,
-                timeout=AccountService.timeout
+                data=data
             )
             if not rv.status_code == HTTPStatus.OK:
                 raise QueueException
@@ -19,10 +19,11 @@ from typing import Dict
 
 import requests
 import sentry_sdk
-from entity_queue_common.service_utils import QueueException
+from entity_queue_common.service_utils import QueueException, UpstreamException
 from flask import current_app
 from legal_api.models import Business, Document, Filing, RegistrationBootstrap
 from legal_api.models.document import DocumentType
+from legal_api.services import Upstream, http_client
 from legal_api.services.bootstrap import AccountService
 
 from entity_filer.filing_processors.filing_components import aliases, business_info, business_profile, shares
@@ -31,17 +32,20 @@ from entity_filer.filing_processors.filing_components.parties import update_part
 
 
 def get_next_corp_num(legal_type: str):
-    """Retrieve the next available sequential corp-num from COLIN."""
+    """Retrieve the next available sequential corp-num from COLIN.
+
+    A failed request, e.g. a timeout, raises UpstreamException, so the filing is put back on the queue.
+    """
     try:
         # TODO: update this to grab the legal 'class' after legal classes have been defined in lear
         if legal_type == Business.LegalTypes.BCOMP.value:
             business_type = 'BC'
         else:
             business_type = legal_type
-        resp = requests.post(f'{current_app.config["COLIN_API"]}/{business_type}')
-    except requests.exceptions.ConnectionError:
-        current_app.logger.error(f'Failed to connect to {current_app.config["COLIN_API"]}')
-        return None
+        resp = http_client.post(Upstream.COLIN, f'{current_app.config["COLIN_API"]}/{business_type}')
+    except requests.exceptions.RequestException as err:
+        current_app.logger.error(f'Failed to get a corp-num from {current_app.config["COLIN_API"]}: {err}')
+        raise UpstreamException(f'Failed to get a corp-num from COLIN: {err}') from err
 
     if resp.status_code == 200:
         new_corpnum = int(resp.json()['corpNum'])
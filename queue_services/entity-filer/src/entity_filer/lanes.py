@@ -0,0 +1,86 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Ordered lanes, to process the filings of unrelated businesses concurrently.
+
+A filing is processed in the lane its business hashes to. The filings of a business touch the same rows
+and versioning transactions, so they are processed one at a time, in the order they were received, while
+the filings of businesses in other lanes carry on.
+Each lane is a thread running its own event loop, so it has its own app context and database session.
+"""
+import asyncio
+import queue
+import threading
+import zlib
+from concurrent.futures import Future
+from typing import Awaitable, Callable, List
+
+
+class Lane:
+    """A thread processing its work in order, one item at a time."""
+
+    def __init__(self, name: str):
+        """Create the lane, its thread is started on first use."""
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._lock = threading.Lock()
+
+    def submit(self, coroutine_function: Callable[..., Awaitable], *args) -> Future:
+        """Queue the coroutine function to run in the lane, returning the future of its result."""
+        with self._lock:
+            if not self._thread.is_alive():
+                self._thread.start()
+        future = Future()
+        self._queue.put((future, coroutine_function, args))
+        return future
+
+    def stop(self):
+        """Stop the lane once the work queued is done."""
+        with self._lock:
+            if self._thread.is_alive():
+                self._queue.put(None)
+                self._thread.join()
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        while (item := self._queue.get()) is not None:
+            future, coroutine_function, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(loop.run_until_complete(coroutine_function(*args)))
+            except BaseException as err:  # pylint: disable=broad-except; the error is raised to the caller
+                future.set_exception(err)
+        loop.close()
+
+
+class LaneDispatcher:
+    """Dispatch the work by key to a fixed number of lanes."""
+
+    def __init__(self, lanes: int):
+        """Create the lanes."""
+        self._lanes: List[Lane] = [Lane(f'filer-lane-{i}') for i in range(max(lanes, 1))]
+
+    def lane_of(self, key: str) -> int:
+        """Return the index of the lane of a key, the same in every process."""
+        return zlib.crc32(str(key).encode('utf-8')) % len(self._lanes)
+
+    async def run(self, key: str, coroutine_function: Callable[..., Awaitable], *args):
+        """Run the coroutine function in the lane of the key, after the work queued before it in that lane."""
+        return await asyncio.wrap_future(self._lanes[self.lane_of(key)].submit(coroutine_function, *args))
+
+    def stop(self):
+        """Stop all the lanes once their work is done."""
+        for lane in self._lanes:
+            lane.stop()
@@ -24,20 +24,27 @@ If these constraints change, the use of Flask-SQLAlchemy would need to change.
 Flask-SQLAlchemy currently allows the base model to be changed, or reworking
 the model to a standalone SQLAlchemy usage with an async engine would need
 to be pursued.
+
+The filings are processed in lanes, one thread per lane with its own app context and session, so the
+blocking database and http calls don't stall the loop and its STAN heartbeats. With FILER_LANES above 1,
+and MAX_IN_FLIGHT messages taken from the queue at once, the filings of a business always go to the same
+lane, so they stay in order, and the filings of other businesses run alongside. The same key is given to the
+queue service, so a filing that fails holds the later filings of its business until it is delivered again.
 """
 import json
 import os
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 
 import nats
 from entity_queue_common.messages import publish_email_message
 from entity_queue_common.service import QueueServiceManager
-from entity_queue_common.service_utils import FilingException, QueueException, logger
+from entity_queue_common.service_utils import FilingException, QueueException, UpstreamException, logger
 from flask import Flask
 from legal_api import db
 from legal_api.core import Filing as FilingCore
 from legal_api.models import Business, Filing
+from legal_api.services import VersionedBusinessDetailsService
 from legal_api.services.bootstrap import AccountService
 from legal_api.utils.datetime import datetime
 from sentry_sdk import capture_message
@@ -45,6 +52,7 @@ from sqlalchemy.exc import OperationalError
 from sqlalchemy_continuum import versioning_manager
 
 from entity_filer import config
+from entity_filer.lanes import LaneDispatcher
 from entity_filer.filing_processors import (
     alteration,
     annual_report,
@@ -60,7 +68,7 @@ from entity_filer.filing_processors import (
     registrars_order,
     transition,
 )
-from entity_filer.filing_processors.filing_components import name_request
+from entity_filer.filing_processors.filing_components import documents, name_request
 
 
 qsm = QueueServiceManager()  # pylint: disable=invalid-name
@@ -68,6 +76,7 @@ APP_CONFIG = config.get_named_config(os.getenv('DEPLOYMENT_ENV', 'production'))
 FLASK_APP = Flask(__name__)
 FLASK_APP.config.from_object(APP_CONFIG)
 db.init_app(FLASK_APP)
+LANES = LaneDispatcher(APP_CONFIG.FILER_LANES)
 
 
 def get_filing_types(legal_filings: dict):
@@ -242,6 +251,21 @@ async def process_filing(filing_msg: Dict, flask_app: Flask):  # pylint: disable
                 db.session.commit()
                 conversion.post_process(business, filing_submission)
 
+            if filing_submission.status == Filing.Status.COMPLETED.value:
+                try:
+                    VersionedBusinessDetailsService.save_revision_snapshot(filing_submission)
+                    if is_correction:
+                        FilingCore.find_by_id(filing_submission.id).save_correction_diff()
+                except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
+                    # the revision and the correction diff are rebuilt on read until they are backfilled
+                    db.session.rollback()
+                    capture_message(
+                        f'Queue Error: Failed to save the revision snapshot for filing:{filing_submission.id}'
+                        f' with error:{err}',
+                        level='error'
+                    )
+                documents.prerender_documents(flask_app, business, filing_submission)
+
             try:
                 await publish_email_message(
                     qsm, APP_CONFIG.EMAIL_PUBLISH_OPTIONS['subject'], filing_submission, filing_submission.status)
@@ -265,13 +289,35 @@ async def process_filing(filing_msg: Dict, flask_app: Flask):  # pylint: disable
                 )
 
 
+def get_ordering_key(filing_msg: Dict, flask_app: Flask) -> str:
+    """Return the key the filing is kept in order by, its business or its temporary registration."""
+    with flask_app.app_context():
+        if not (filing := Filing.find_by_id(filing_msg['filing']['id'])):
+            return str(filing_msg['filing']['id'])
+        return str(filing.business_id or filing.temp_reg or filing.id)
+
+
+def get_message_ordering_key(msg: nats.aio.client.Msg) -> Optional[str]:
+    """Return the ordering key of a queue message, or None for a message the handler can't process."""
+    try:
+        return get_ordering_key(json.loads(msg.data.decode('utf-8')), FLASK_APP)
+    except Exception:  # pylint: disable=broad-except; the handler reports the message
+        return None
+
+
+async def dispatch_filing(filing_msg: Dict, flask_app: Flask):
+    """Process the filing in the lane of its business, off the event loop of the queue."""
+    key = get_ordering_key(filing_msg, flask_app) if APP_CONFIG.FILER_LANES > 1 else None
+    return await LANES.run(key, process_filing, filing_msg, flask_app)
+
+
 async def cb_subscription_handler(msg: nats.aio.client.Msg):
     """Use Callback to process Queue Msg objects."""
     try:
         logger.info('Received raw message seq:%s, data=  %s', msg.sequence, msg.data.decode())
         filing_msg = json.loads(msg.data.decode('utf-8'))
         logger.debug('Extracted filing msg: %s', filing_msg)
-        await process_filing(filing_msg, FLASK_APP)
+        await dispatch_filing(filing_msg, FLASK_APP)
     except OperationalError as err:
         logger.error('Queue Blocked - Database Issue: %s', json.dumps(filing_msg), exc_info=True)
         raise err  # We don't want to handle the error, as a DB down would drain the queue
@@ -280,6 +326,11 @@ async def cb_subscription_handler(msg: nats.aio.client.Msg):
                      '\n\nThis message has been put back on the queue for reprocessing.',
                      json.dumps(filing_msg), exc_info=True)
         raise err  # we don't want to handle the error, so that the message gets put back on the queue
+    except UpstreamException as err:
+        logger.error('Queue Error - upstream service failed: %s'
+                     '\n\nThis message has been put back on the queue for reprocessing.',
+                     json.dumps(filing_msg), exc_info=True)
+        raise err  # the upstream service may recover, so the message gets put back on the queue
     except (QueueException, Exception):  # pylint: disable=broad-except
         # Catch Exception so that any error is still caught and the message is removed from the queue
         capture_message('Queue Error:' + json.dumps(filing_msg), level='error')
@@ -0,0 +1,40 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Unit Tests for the documents filing component."""
+from types import SimpleNamespace
+
+import pytest
+from legal_api.models import Filing
+
+from entity_filer.filing_processors.filing_components import documents
+
+
+@pytest.mark.parametrize('test_name,enabled,filing_type,tax_id,expected', [
+    ('disabled', False, 'changeOfAddress', '123456789', False),
+    ('enabled', True, 'changeOfAddress', '123456789', True),
+    ('incorporation with tax id', True, 'incorporationApplication', '123456789', True),
+    ('incorporation without tax id', True, 'incorporationApplication', None, False),
+])
+def test_prerender_documents(app, mocker, test_name, enabled, filing_type, tax_id, expected):
+    """Assert that the documents are only rendered when enabled and once an incorporation has its tax id."""
+    mocker.patch.dict(app.config, {'PRERENDER_DOCUMENTS': enabled})
+    mocker.patch.object(documents, 'DocumentMetaService').return_value.get_documents.return_value = \
+        [{'reportType': 'noa'}, {'reportType': 'certificate'}]
+    executor = mocker.patch.object(documents, '_executor')
+    business = SimpleNamespace(identifier='BC1234567', tax_id=tax_id)
+    filing = SimpleNamespace(id=1, status=Filing.Status.COMPLETED.value, filing_type=filing_type, json={})
+
+    documents.prerender_documents(app, business, filing)
+
+    assert executor.submit.called == expected
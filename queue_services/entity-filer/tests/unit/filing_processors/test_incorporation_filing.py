@@ -151,6 +151,20 @@ def test_get_next_corp_num(requests_mock, app, test_name, response, expected):
     assert corp_num == expected
 
 
+def test_get_next_corp_num_request_error(requests_mock, app):
+    """Assert that a failed request for the corpnum, e.g. a read timeout, raises an UpstreamException."""
+    import requests
+    from entity_filer.filing_processors.incorporation_filing import get_next_corp_num
+    from entity_queue_common.service_utils import UpstreamException
+    from flask import current_app
+
+    with app.app_context():
+        requests_mock.post(f'{current_app.config["COLIN_API"]}/BC', exc=requests.exceptions.ReadTimeout)
+
+        with pytest.raises(UpstreamException):
+            get_next_corp_num('BEN')
+
+
 def test_incorporation_filing_coop_from_colin(app, session):
     """Assert that an existing coop incorporation is loaded corrrectly."""
     # setup
@@ -0,0 +1,67 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the filer lanes.
+
+Test-Suite to ensure that the filings of a business are kept in order, and that other businesses run alongside.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from entity_filer.lanes import LaneDispatcher
+
+
+@pytest.mark.asyncio
+async def test_lanes_ordered_by_key():
+    """Assert that the work of a key runs in order, in one thread, while another lane carries on."""
+    dispatcher = LaneDispatcher(4)
+    key_a = 'a'
+    key_b = next(key for key in map(str, range(100)) if dispatcher.lane_of(key) != dispatcher.lane_of(key_a))
+    release = threading.Event()
+    done = []
+
+    async def work(name, wait=False):
+        if wait:
+            release.wait(5)
+        done.append(name)
+        return threading.current_thread().name
+
+    first_a = asyncio.ensure_future(dispatcher.run(key_a, work, 'a1', True))
+    second_a = asyncio.ensure_future(dispatcher.run(key_a, work, 'a2'))
+    assert await dispatcher.run(key_b, work, 'b1') != threading.current_thread().name
+    assert done == ['b1']
+
+    release.set()
+    assert await first_a == await second_a
+    assert done == ['b1', 'a1', 'a2']
+    dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_lanes_raise_errors():
+    """Assert that an error in a lane is raised to the caller, and that the lane carries on."""
+    dispatcher = LaneDispatcher(2)
+
+    async def fail():
+        raise ValueError('failed')
+
+    async def succeed():
+        return True
+
+    with pytest.raises(ValueError):
+        await dispatcher.run('a', fail)
+    assert await dispatcher.run('a', succeed)
+    dispatcher.stop()
@@ -15,11 +15,13 @@
 import asyncio
 import copy
 import datetime
+import json
 import random
+from types import SimpleNamespace
 
 import pytest
 from entity_queue_common.messages import get_data_from_msg
-from entity_queue_common.service_utils import subscribe_to_queue
+from entity_queue_common.service_utils import UpstreamException, subscribe_to_queue
 from legal_api.models import Business, Filing, PartyRole
 from legal_api.services import RegistrationBootstrapService
 from registry_schemas.example_data import INCORPORATION_FILING_TEMPLATE
@@ -84,6 +86,49 @@ async def test_incorporation_filing(app, session, bootstrap):
     assert completing_party.appointment_date
 
 
+
+@pytest.mark.asyncio
+async def test_incorporation_filing_colin_error_redelivered(mocker):
+    """Assert that a failed corp-num request leaves the message unacknowledged, so it is delivered again."""
+    from entity_queue_common.service import ServiceWorker
+    from entity_filer import worker
+
+    attempts = []
+    acked = []
+
+    async def dispatch_filing(filing_msg, flask_app):
+        attempts.append(filing_msg['filing']['id'])
+        if len(attempts) == 1:
+            raise UpstreamException('Failed to get a corp-num from COLIN: read timed out')
+
+    class SC():
+        async def ack(self, msg):
+            acked.append(msg.sequence)
+
+    mocker.patch.object(worker, 'dispatch_filing', dispatch_filing)
+    mocker.patch.object(worker, 'capture_message')
+    msg = SimpleNamespace(sequence=1, data=json.dumps({'filing': {'id': 1}}).encode('utf-8'))
+
+    # one message at a time, the subscription acks the message only if the handler returns
+    with pytest.raises(UpstreamException):
+        await worker.cb_subscription_handler(msg)
+
+    # concurrently, the service acks it only once the message delivered again succeeds
+    attempts.clear()
+    service = ServiceWorker(loop=None, cb_handler=worker.cb_subscription_handler, config=worker.APP_CONFIG,
+                            max_in_flight=2)
+    service.sc = SC()
+    await service._dispatch(msg)  # pylint: disable=protected-access
+    await asyncio.sleep(0.1)
+    assert not acked
+
+    await service._dispatch(msg)  # pylint: disable=protected-access
+    await service.close()
+    assert attempts == [1, 1]
+    assert acked == [1]
+    worker.capture_message.assert_not_called()
+
+
 def test_update_affiliation_error(mocker):
     """Assert that a message is posted to sentry if an error occurs."""
     import sentry_sdk
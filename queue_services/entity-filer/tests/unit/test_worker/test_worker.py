@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """The Test Suites to ensure that the worker is operating correctly."""
+import asyncio
 import copy
 import datetime
+import json
 import random
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pycountry
@@ -526,3 +529,52 @@ async def test_publish_event():
         }
 
     mock_publish.publish.assert_called_with('entity.events', payload)
+
+
+@pytest.mark.asyncio
+async def test_failed_filing_holds_its_business(mocker):
+    """Assert that a filing put back on the queue holds the later filings of its business, but not the others."""
+    from entity_queue_common.service import ServiceWorker
+    from entity_queue_common.service_utils import FilingException
+    from entity_filer import worker
+
+    businesses = {1: 'a', 2: 'a', 3: 'b'}
+    processed = []
+    acked = []
+    failures = {1: 1}
+
+    async def dispatch_filing(filing_msg, flask_app):
+        filing_id = filing_msg['filing']['id']
+        if failures.get(filing_id):
+            failures[filing_id] -= 1
+            raise FilingException(f'filing:{filing_id} failed')
+        processed.append(filing_id)
+
+    class SC():
+        async def ack(self, msg):
+            acked.append(msg.sequence)
+
+    mocker.patch.object(worker, 'get_ordering_key', lambda filing_msg, _: businesses[filing_msg['filing']['id']])
+    mocker.patch.object(worker, 'dispatch_filing', dispatch_filing)
+    service = ServiceWorker(loop=None, cb_handler=worker.cb_subscription_handler, config=worker.APP_CONFIG,
+                            max_in_flight=4, ordering_key=worker.get_message_ordering_key)
+    service.sc = SC()
+
+    def message(filing_id):
+        return SimpleNamespace(sequence=filing_id, data=json.dumps({'filing': {'id': filing_id}}).encode('utf-8'))
+
+    for filing_id in (1, 2, 3):
+        await service._dispatch(message(filing_id))  # pylint: disable=protected-access
+    await asyncio.sleep(0.1)
+
+    # the failed filing holds the next filing of its business, while the other business carries on
+    assert processed == [3]
+    assert acked == [3]
+
+    # delivered again, the filings of the business are processed in the order they were submitted
+    for filing_id in (1, 2):
+        await service._dispatch(message(filing_id))  # pylint: disable=protected-access
+    await service.close()
+
+    assert processed == [3, 1, 2]
+    assert acked == [3, 1, 2]